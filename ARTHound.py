@@ -2,18 +2,42 @@
 
 import os
 import yaml
-import json
 import uuid
 import subprocess
 import shutil
 from datetime import datetime
-from BloodSOCer import OUTPUT_DIR
+from functools import partial
+from GraphWriter import add_output_arguments, graph_path, output_format, write_graph
+from Hound import Hound, hound_main, register_hound
+from HoundCache import (
+    cached_graph_valid,
+    file_sha256,
+    git_changed_files,
+    git_head_commit,
+    git_tree_hash,
+    load_previous_graph,
+    read_hound_state,
+    store_cache_record,
+    write_hound_state,
+)
+
+# Prefer the C LibYAML loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 ART_REPO_URL = "https://github.com/redcanaryco/atomic-red-team.git"
 ART_REPO_DIR = "atomic-red-team"
 ART_TESTS_DIR = os.path.join(ART_REPO_DIR, "atomics")
 OUTPUT_FILE = "arthound_graph.json"
 
+# Bump when the extraction logic changes so cached graphs are regenerated
+EXTRACTOR_VERSION = "2"
+
+# Namespace for the uuid5 ids of atomic tests that have no auto_generated_guid
+ART_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, ART_REPO_URL)
+
 
 def clone_or_update_art_repo():
     if shutil.which("git") is None:
@@ -37,82 +61,241 @@ def clone_or_update_art_repo():
         except subprocess.CalledProcessError as e:
             print(f"⚠️ Failed to update repo: {e}")
 
+    return git_head_commit(ART_REPO_DIR)
+
 
 def parse_yaml_file(filepath):
     with open(filepath, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def art_test_id(attack_technique, index, test):
+    """
+    Stable node id for an atomic test: its auto_generated_guid, or a uuid5 of technique + test index.
+    The same test gets the same id on every run, so graphs can be compared and patched.
+    """
+    guid = str(test.get("auto_generated_guid") or "").strip()
+    if guid:
+        return guid
+    return str(uuid.uuid5(ART_ID_NAMESPACE, f"{attack_technique}:{index}"))
 
 
 def parse_art_file(file_path):
     """Parse one ART YAML file into nodes + edges"""
-    try:
-        data = parse_yaml_file(file_path)
-        attack_technique = str(data.get("attack_technique", "")).strip()
-        atomic_tests = data.get("atomic_tests", [])
-
-        nodes = []
-        edges = []
-
-        for test in atomic_tests:
-            name = str(test.get("name", "Unknown Atomic Test"))
-            description = str(test.get("description", ""))
-
-            node_id = str(uuid.uuid4())
-
-            node = {
-                "id": node_id,
-                "kinds": ["ART", "Atomic"],
-                "properties": {
-                    "name": name,
-                    "description": description,
-                    "tid": attack_technique
-                }
+    data = parse_yaml_file(file_path)
+    attack_technique = str(data.get("attack_technique", "")).strip()
+    atomic_tests = data.get("atomic_tests", [])
+
+    nodes = []
+    edges = []
+
+    for index, test in enumerate(atomic_tests):
+        name = str(test.get("name", "Unknown Atomic Test"))
+        description = str(test.get("description", ""))
+
+        node_id = art_test_id(attack_technique, index, test)
+
+        node = {
+            "id": node_id,
+            "kinds": ["ART", "Atomic"],
+            "properties": {
+                "name": name,
+                "description": description,
+                "tid": attack_technique
             }
-            nodes.append(node)
+        }
+        nodes.append(node)
 
-            if attack_technique:
-                edge = {
-                    "kind": "TestedBy",
-                    "start": {"value": attack_technique, "match_by": "id"},
-                    "end": {"value": node_id, "match_by": "id"},
-                }
-                edges.append(edge)
+        if attack_technique:
+            edge = {
+                "kind": "TestedBy",
+                "start": {"value": attack_technique, "match_by": "id"},
+                "end": {"value": node_id, "match_by": "id"},
+            }
+            edges.append(edge)
 
-        return nodes, edges
+    return nodes, edges
 
-    except Exception as e:
-        print(f"⚠️ Failed to parse {file_path}: {e}")
-        return [], []
 
+def parse_art_job(file_path):
+    """Worker entry point: parse one file and return (nodes, edges, error) instead of raising."""
+    try:
+        nodes, edges = parse_art_file(file_path)
+        return nodes, edges, None
+    except Exception as e:
+        return [], [], str(e)
 
-def collect_art_tests():
-    nodes = []
-    edges = []
 
-    for root, _, files in os.walk(ART_TESTS_DIR):
+def list_art_files(tests_dir=ART_TESTS_DIR):
+    """Return every ART YAML file under tests_dir, sorted so output order is deterministic."""
+    paths = []
+    for root, _, files in os.walk(tests_dir):
         for file in files:
             if file.endswith((".yml", ".yaml")):
-                full_path = os.path.join(root, file)
-                new_nodes, new_edges = parse_art_file(full_path)
-                nodes.extend(new_nodes)
-                edges.extend(new_edges)
+                paths.append(os.path.join(root, file))
+    paths.sort()
+    return paths
 
-    return nodes, edges
 
+def parse_art_files(paths, workers=1, track=None):
+    """
+    Parse the given ART files, fanning them out over `workers` processes when workers > 1.
+    track(iterable, total), if given, wraps the per-file result iterator (Stage.track for --profile).
+    Returns one (path, nodes, edges, error) tuple per file, in the order of `paths`.
+    """
+    track = track or (lambda iterable, total: iterable)
+    if workers > 1 and len(paths) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(track(pool.map(parse_art_job, paths, chunksize=chunksize), len(paths)))
+    else:
+        results = list(track((parse_art_job(path) for path in paths), len(paths)))
+
+    return [(path, nodes, edges, error) for path, (nodes, edges, error) in zip(paths, results)]
+
+
+def merge_art_results(results, nodes=None, edges=None):
+    """
+    Merge per-file results into (nodes, edges, errors, file_ids), appending to nodes/edges if given.
+    file_ids maps each file path (relative to the ART repo) to the node ids it produced.
+    """
+    nodes = [] if nodes is None else nodes
+    edges = [] if edges is None else edges
+    errors = []
+    file_ids = {}
+
+    for path, new_nodes, new_edges, error in results:
+        if error:
+            errors.append((path, error))
+            continue
+        nodes.extend(new_nodes)
+        edges.extend(new_edges)
+        file_ids[os.path.relpath(path, ART_REPO_DIR)] = [node["id"] for node in new_nodes]
+
+    return nodes, edges, errors, file_ids
+
+
+def collect_art_tests(workers=1):
+    """
+    Parse every ART file, fanning the files out over `workers` processes when workers > 1.
+    Results are merged back in file order. Returns (nodes, edges, errors) where errors
+    is a list of (file_path, message).
+    """
+    nodes, edges, errors, _ = merge_art_results(parse_art_files(list_art_files(ART_TESTS_DIR), workers))
+    return nodes, edges, errors
+
+
+def refresh_art_tests(previous_graph, state, workers=1, track=None):
+    """
+    Patch previous_graph with the atomics changed since state["commit"]. Files that fail
+    to parse keep their previous nodes, edges and file_ids entry.
+    Returns (nodes, edges, errors, file_ids, changed_count), or None if git cannot compute the diff.
+    """
+    diff = git_changed_files(ART_REPO_DIR, state["commit"], "atomics")
+    if diff is None:
+        return None
+    changed, deleted = diff
+
+    paths = [
+        os.path.join(ART_REPO_DIR, rel_path)
+        for rel_path in changed
+        if rel_path.endswith((".yml", ".yaml")) and os.path.isfile(os.path.join(ART_REPO_DIR, rel_path))
+    ]
+    results = parse_art_files(paths, workers, track)
+
+    # a file that fails to parse keeps its previous tests until it parses again
+    failed = {os.path.relpath(path, ART_REPO_DIR) for path, _, _, error in results if error}
+    file_ids = dict(state.get("files", {}))
+    stale = set()
+    for rel_path in changed + deleted:
+        if rel_path not in failed:
+            stale.update(file_ids.pop(rel_path, []))
+
+    nodes = [node for node in previous_graph["graph"]["nodes"] if node["id"] not in stale]
+    edges = [edge for edge in previous_graph["graph"]["edges"] if edge["end"]["value"] not in stale]
+    nodes, edges, errors, new_file_ids = merge_art_results(results, nodes, edges)
+    file_ids.update(new_file_ids)
+
+    return nodes, edges, errors, file_ids, len(changed) + len(deleted)
+
+
+@register_hound
+class AtomicRedTeamHound(Hound):
+    name = "art"
+    graph_file = OUTPUT_FILE
+    description = "Extract Atomic Red Team tests to a BloodHound OpenGraph file."
+    kinds = (("ART", "Atomic"),)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-parse every atomic, ignoring the cached graph and the incremental state",
+        )
+        parser.add_argument(
+            "-w", "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes used to parse the atomics (default: number of CPUs, 1 disables the pool)",
+        )
+        add_output_arguments(parser)
+
+    def run(self, args):
+        profiler = args.profiler
+        with profiler.stage("git"):
+            commit = clone_or_update_art_repo()
+
+        out_path = graph_path(args.output_dir, OUTPUT_FILE, args.gzip_output)
+        cache_version = f"{EXTRACTOR_VERSION}/{output_format(args)}"
+        with profiler.stage("fingerprint"):
+            fingerprint = git_tree_hash(ART_REPO_DIR, "atomics")
+        if not args.force and cached_graph_valid(out_path, fingerprint, cache_version):
+            print(f"✅ Atomics unchanged, reusing {out_path}")
+            return
+
+        with profiler.stage("parse", unit="files") as stage:
+            track = partial(stage.track, progress=True)
+            refreshed = None
+            state = read_hound_state(out_path)
+            previous_graph = None if args.force else load_previous_graph(out_path, state, EXTRACTOR_VERSION)
+            if previous_graph is not None and state.get("commit"):
+                refreshed = refresh_art_tests(previous_graph, state, workers=args.workers, track=track)
+
+            if refreshed is not None:
+                nodes, edges, errors, file_ids, changed_count = refreshed
+                print(f"🔄 Re-parsed {changed_count} atomic file(s) changed since {state['commit'][:12]}")
+            else:
+                print(f"🕑 Please wait while the files are being processed, this can take a few minutes")
+                results = parse_art_files(list_art_files(ART_TESTS_DIR), workers=args.workers, track=track)
+                nodes, edges, errors, file_ids = merge_art_results(results)
 
-def main():
-    clone_or_update_art_repo()
-    print(f"🕑 Please wait while the files are being processed, this can take a few minutes")
-    nodes, edges = collect_art_tests()
+        if errors:
+            print(f"⚠️ Failed to parse {len(errors)} file(s):")
+            for path, error in errors:
+                print(f"   - {path}: {error}")
 
-    data = {"graph": {"nodes": nodes, "edges": edges}}
+        # with parse errors the atomics are not fully processed: keep the cache record and the
+        # state at the last clean commit so the failed files are parsed again on the next run
+        if errors:
+            commit = state.get("commit") if refreshed is not None else None
 
-    out_path = os.path.join(OUTPUT_DIR, "arthound_graph.json")
-    with open(out_path, "w", encoding="utf-8") as fh:
-        json.dump(data, fh, ensure_ascii=False, indent=2)
+        with profiler.stage("write", unit="items") as stage:
+            write_graph(out_path, nodes, edges, pretty=args.pretty, gzip_output=args.gzip_output)
+            stage.add(len(nodes) + len(edges))
+            if not errors:
+                store_cache_record(out_path, fingerprint, cache_version)
+            if commit:
+                write_hound_state(out_path, {
+                    "commit": commit,
+                    "extractor_version": EXTRACTOR_VERSION,
+                    "output_sha256": file_sha256(out_path),
+                    "files": file_ids,
+                })
 
-    print(f"✅ ARTHound data written to {out_path}")
+        print(f"✅ ARTHound data written to {out_path}")
 
 
 if __name__ == "__main__":
-    main()
+    hound_main("art")
@@ -3,28 +3,36 @@ import argparse
 import subprocess
 import sys
 import os
-from auth.hmac_authenticated_client import HMACAuthenticatedClient
+from Config import (
+    DEFAULT_INGEST_TIMEOUT,
+    DEFAULT_UPLOAD_CONCURRENCY,
+    DEFAULT_UPLOAD_RETRIES,
+    OUTPUT_DIR,
+    apiid,
+    apikey,
+    credentials_valid,
+    url,
+)
+from Hound import load_hounds, profile_path, run_hound, run_hound_worker
+from Profiler import StageProfiler
+
+# Credentials and the server URL are set in Config.py. Network libraries (httpx, the HMAC
+# client, UploadEngine) and asyncio are imported by the commands that need them, so --help
+# and the hound-only commands start fast.
 
-# ---------------------------------------------------------------------------
-# Configuration – set these before running
-# ---------------------------------------------------------------------------
-apikey = "<CHANGEME>"
-apiid = "<CHANGEME>"
+os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# BloodHound base URL (used by HMAC client / uploads)
-url = "http://127.0.0.1:8080"
+# Graphs produced outside the hounds; their nodes count as known endpoints when validating
+EXTRA_GRAPH_FILES = ["playbooks_graph.json"]
 
-# Directory where *_graph.json files are created (and where uploads will be read from)
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Where --validate writes the cleaned copies of the hound graphs
+VALIDATED_DIR = os.path.join(OUTPUT_DIR, "validated")
 
+# Single document written by --merge (every hound graph plus EXTRA_GRAPH_FILES)
+MERGED_GRAPH_FILE = "bloodsocer_graph.json"
 
-def credentials_valid():
-    """
-    Return True if apikey/apiid look usable (not <CHANGEME> / empty).
-    """
-    invalid_values = {None, "", "<CHANGEME>"}
-    return apikey not in invalid_values and apiid not in invalid_values
+# Per-stage metrics of this run; main() replaces it with an enabled one for --profile
+profiler = StageProfiler()
 
 
 def require_credentials(action_name: str):
@@ -35,12 +43,29 @@ def require_credentials(action_name: str):
         return
 
     print(f"[ERROR] Valid apiid/apikey required to {action_name}.")
-    print("  Please edit this script and set 'apikey' and 'apiid' to real values.")
+    print("  Please edit Config.py and set 'apikey' and 'apiid' to real values.")
     print("  For instructions on how to obtain API credentials, see:")
     print("    https://bloodhound.specterops.io/integrations/bloodhound-api/working-with-api#authentication")
     sys.exit(1)
 
 
+def hound_graph_file(name):
+    """Path of one hound graph; when both <name> and <name>.gz exist the newest one wins."""
+    candidates = [
+        path
+        for path in (os.path.join(OUTPUT_DIR, name), os.path.join(OUTPUT_DIR, name + ".gz"))
+        if os.path.exists(path)
+    ]
+    if candidates:
+        return max(candidates, key=os.path.getmtime)
+    return os.path.join(OUTPUT_DIR, name)
+
+
+def hound_graph_files():
+    """Paths of the graphs of every registered hound, to upload."""
+    return [hound_graph_file(hound.graph_file) for hound in load_hounds().values()]
+
+
 def run_define_icons():
     """Call the external Define-Icons.py script."""
     cmd = [sys.executable, "Define-Icons.py"]
@@ -68,38 +93,97 @@ def run_ul_cyphers():
         sys.exit(exc.returncode)
 
 
-def run_script(script_name: str):
-    cmd = [sys.executable, script_name, "--apikey", apikey, "--apiid", apiid]
-    try:
-        subprocess.run(cmd, check=True)
-    except FileNotFoundError:
-        print(f"[ERROR] Could not find '{script_name}' in the current directory.")
-        sys.exit(1)
-    except subprocess.CalledProcessError as exc:
-        print(f"[ERROR] {script_name} exited with status {exc.returncode}")
-        sys.exit(exc.returncode)
+def hound_argv():
+    """Command line passed to the hounds: they profile themselves when BloodSOCer does."""
+    if not profiler.enabled:
+        return []
+    return ["--profile"] + (["--cprofile"] if profiler.cprofile else [])
+
+
+def run_in_process(name):
+    """Run one registered hound in this process; exit with its status if it fails."""
+    with profiler.stage(f"{name}_hound"):
+        code = run_hound(name, hound_argv(), output_dir=OUTPUT_DIR)
+    if code != 0:
+        print(f"[ERROR] {name} hound exited with status {code}")
+        sys.exit(code)
 
 
 def run_mitrehound():
-    """Run MitreHound.py with current credentials."""
-    run_script("MitreHound.py")
+    """Run the MITRE ATT&CK hound."""
+    run_in_process("mitre")
 
 
 def run_arthound():
-    """Run ARTHound.py with current credentials."""
-    run_script("ARTHound.py")
+    """Run the Atomic Red Team hound."""
+    run_in_process("art")
 
 
 def run_sigmahound():
-    """Run SigmaHound.py with current credentials."""
-    run_script("SigmaHound.py")
+    """Run the Sigma hound."""
+    run_in_process("sigma")
+
+
+async def run_hounds_async(upload=False, deltas=None, **upload_kwargs):
+    """
+    Run every registered hound at the same time, each in its own worker process. With
+    upload=True, the nodes of each graph are uploaded as soon as its hound succeeds and the
+    edges once every hound is done, all in one upload job. A failing hound, or one whose
+    worker dies (e.g. OOM-killed), only loses its own graph and upload.
+    When deltas is a list, only the delta of each graph against its last uploaded snapshot
+    is uploaded and the deltas are appended to it (see finish_deltas).
+    Returns ({hound_name: exit_code}, upload report or None).
+    """
+    import asyncio
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+    from contextlib import ExitStack
+
+    hounds = load_hounds()
+    exit_codes = {}
+    loop = asyncio.get_running_loop()
+
+    with tempfile.TemporaryDirectory(prefix="bloodsocer-delta-") as delta_dir, ExitStack() as stack:
+        # one single-worker pool per hound, so a dead worker cannot break the other hounds' pools
+        pools = {name: stack.enter_context(ProcessPoolExecutor(max_workers=1)) for name in hounds}
+
+        async def produce(name, hound):
+            try:
+                code = await loop.run_in_executor(pools[name], run_hound_worker, name, hound_argv(), OUTPUT_DIR)
+            except Exception as exc:
+                # BrokenProcessPool when the worker was killed
+                print(f"[ERROR] {name} hound worker failed: {exc!r}")
+                code = 1
+            exit_codes[name] = code
+            if code != 0:
+                print(f"[ERROR] {name} hound exited with status {code}; its graph will not be uploaded")
+                return None
+            path = hound_graph_file(hound.graph_file)
+            if deltas is None or not os.path.exists(path):
+                return path
+            delta = await loop.run_in_executor(None, compute_graph_delta, path, delta_dir)
+            if delta is None:
+                return path
+            deltas.append(delta)
+            return delta["delta_path"]
+
+        sources = [produce(name, hound) for name, hound in hounds.items()]
+        if not upload:
+            await asyncio.gather(*sources)
+            return exit_codes, []
+
+        from UploadEngine import upload_pipeline
+
+        report = await upload_pipeline(sources, base_url=url, token_key=apikey, token_id=apiid, **upload_kwargs)
+        return exit_codes, report
 
 
 def run_all_hounds():
-    """Run define-icons and all hound scripts in sequence."""
-    run_mitrehound()
-    run_arthound()
-    run_sigmahound()
+    """Run all hounds in parallel. Returns {hound_name: exit_code}."""
+    import asyncio
+
+    exit_codes, _ = asyncio.run(run_hounds_async())
+    return exit_codes
 
 
 def run_setup():
@@ -110,6 +194,9 @@ def run_setup():
 
 def clear_database():
     """Call the BloodHound clear-database endpoint using HMAC credentials."""
+    from auth.hmac_authenticated_client import HMACAuthenticatedClient
+    from GraphDelta import forget_snapshots
+
     try:
         with HMACAuthenticatedClient(base_url=url, token_key=apikey, token_id=apiid) as client:
             httpx_client = client.get_httpx_client()
@@ -127,6 +214,9 @@ def clear_database():
             )
             if resp.status_code < 400:
                 print("✅ Database clear request sent successfully.")
+                # the next delta upload has to send everything again (raw and validated graphs)
+                for snapshot_dir in (OUTPUT_DIR, VALIDATED_DIR):
+                    forget_snapshots(snapshot_dir)
             else:
                 print(f"[ERROR] clear-database failed (status {resp.status_code}): {resp.text}")
     except Exception as exc:
@@ -134,84 +224,178 @@ def clear_database():
         sys.exit(1)
 
 
-def upload_files(files):
-    import io
-    import zipfile
-
-    client = HMACAuthenticatedClient(base_url=url, token_key=apikey, token_id=apiid)
-    with client as c:
-        httpx_client = c.get_httpx_client()
-
-        # create job
-        try:
-            start_resp = httpx_client.post("/api/v2/file-upload/start", timeout=30.0)
-            start_resp.raise_for_status()
-            job_id = start_resp.json().get("data", {}).get("id")
-            if not job_id:
-                print("[ERROR] start response missing job id")
-                return
-        except Exception as e:
-            print(f"[ERROR] failed to create upload job: {e}")
-            return
+def upload_files(files, compress=False, concurrency=DEFAULT_UPLOAD_CONCURRENCY, retries=DEFAULT_UPLOAD_RETRIES,
+                 shard_size=None, wait_timeout=None):
+    """
+    Upload graph files to a single BloodHound upload job, concurrently and with retries.
+    shard_size (bytes) splits each graph into node shards uploaded before edge shards.
+    wait_timeout (seconds) waits for ingest to finish and reports its throughput.
+    Returns the per-file outcome report (see UploadEngine.upload_graphs).
+    """
+    from UploadEngine import run_uploads
+
+    with profiler.stage("upload", unit="KiB") as stage:
+        stage.add(sum(os.path.getsize(path) for path in files if os.path.exists(path)) // 1024)
+        return run_uploads(
+            files,
+            base_url=url,
+            token_key=apikey,
+            token_id=apiid,
+            compress=compress,
+            concurrency=concurrency,
+            retries=retries,
+            shard_size=shard_size,
+            wait_timeout=wait_timeout,
+        )
+
+
+def report_failed(report):
+    """
+    True if the upload report contains a file that did not upload or whose ingest did not
+    complete (or the job itself failed).
+    """
+    return report is None or any(
+        item["status"] != "uploaded" or item.get("ingest", "complete") != "complete" for item in report
+    )
 
-        # upload each file (prefer JSON, fallback to ZIP) — single concise status per file
-        for path in files:
-            if not os.path.exists(path):
-                print(f"[WARN] file not found: {path}")
-                continue
 
-            last_resp = None
-            uploaded = False
-            try:
-                with open(path, "rb") as fh:
-                    file_bytes = fh.read()
-
-                # try posting raw JSON
-                try:
-                    text = file_bytes.decode("utf-8")
-                    last_resp = httpx_client.post(
-                        f"/api/v2/file-upload/{job_id}",
-                        content=text,
-                        headers={"Content-Type": "application/json"},
-                        timeout=120.0,
-                    )
-                    if last_resp.status_code < 400:
-                        uploaded = True
-                except Exception:
-                    last_resp = None
-
-                # fallback to ZIP if needed
-                if not uploaded:
-                    buf = io.BytesIO()
-                    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-                        zf.writestr(os.path.basename(path), file_bytes)
-                    zip_bytes = buf.getvalue()
-                    last_resp = httpx_client.post(
-                        f"/api/v2/file-upload/{job_id}",
-                        content=zip_bytes,
-                        headers={"Content-Type": "application/zip"},
-                        timeout=120.0,
-                    )
-                    if last_resp.status_code < 400:
-                        uploaded = True
-
-                if uploaded:
-                    print(f"Uploaded {path} (job {job_id}). Ingest may take a few minutes.")
+def validate_hound_graphs(files, single_direction=False):
+    """
+    Drop dangling and duplicate edges (and, with single_direction, redundant reverse edges)
+    across all graphs; returns the paths of the cleaned copies in VALIDATED_DIR.
+    Missing files are passed through so the upload reports them. Edges may also point into
+    the graphs on disk that are not uploaded this time (e.g. of a hound that failed), which
+    are indexed too so those edges are not dropped.
+    """
+    from GraphValidation import validate_graphs
+
+    present = [path for path in files if os.path.exists(path)]
+    others = [path for path in hound_graph_files() if path not in present]
+    known = others + [os.path.join(OUTPUT_DIR, name) for name in EXTRA_GRAPH_FILES]
+    with profiler.stage("validate", unit="items") as stage:
+        results = dict(zip(present, validate_graphs(present, VALIDATED_DIR, known, single_direction)))
+        stage.add(sum(stats["nodes"] + stats["edges"] for _, stats in results.values()))
+    for path, (_, stats) in results.items():
+        print(
+            f"🧪 {os.path.basename(path)}: kept {stats['nodes']} nodes and {stats['edges']} edges, dropped "
+            f"{stats['dangling']} dangling, {stats['duplicate']} duplicate and {stats['redundant']} redundant edge(s)"
+        )
+    return [results[path][0] if path in results else path for path in files]
+
+
+def merge_hound_graphs(files):
+    """Merge the hound graphs and EXTRA_GRAPH_FILES into MERGED_GRAPH_FILE; returns its path."""
+    from GraphMerge import merge_graphs
+
+    for path in files:
+        if not os.path.exists(path):
+            print(f"[WARN] file not found, left out of the merged graph: {path}")
+    extra = [os.path.join(OUTPUT_DIR, name) for name in EXTRA_GRAPH_FILES]
+    sources = [path for path in files + extra if os.path.exists(path)]
+    out_path = os.path.join(OUTPUT_DIR, MERGED_GRAPH_FILE)
+    with profiler.stage("merge", unit="items") as stage:
+        stats = merge_graphs(sources, out_path)
+        stage.add(stats["nodes"] + stats["edges"])
+    print(
+        f"🧩 Merged {len(sources)} graph(s) into {out_path}: {stats['nodes']} nodes and {stats['edges']} edges "
+        f"({stats['duplicate_nodes']} duplicate nodes and {stats['duplicate_edges']} duplicate edges folded)"
+    )
+    return out_path
+
+
+def prepare_upload_files(files, args):
+    """Apply --merge and --validate to the hound graphs; returns the files to upload."""
+    if args.merge:
+        files = [merge_hound_graphs(files)]
+    if args.validate:
+        files = validate_hound_graphs(files, args.single_direction)
+    return files
+
+
+def upload_options(args):
+    """Upload keyword arguments from the parsed command line."""
+    return {
+        "compress": args.zip_upload,
+        "concurrency": args.upload_concurrency,
+        "retries": args.upload_retries,
+        "shard_size": int(args.shard_size * 1024 * 1024) if args.shard_size else None,
+        "wait_timeout": args.wait_timeout,
+    }
+
+
+def compute_graph_delta(path, delta_dir):
+    """
+    Diff one graph against its last uploaded snapshot (see GraphDelta.compute_delta).
+    Returns None when the delta cannot be computed (e.g. a truncated graph); the caller
+    then uploads the whole graph.
+    """
+    from GraphDelta import compute_delta
+
+    try:
+        delta = compute_delta(path, delta_dir)
+    except Exception as exc:
+        print(f"[WARN] cannot compute the delta of {path} ({exc}); uploading the whole graph")
+        return None
+    print(
+        f"🔍 {os.path.basename(path)}: {delta['nodes']} node(s) and {delta['edges']} edge(s) added or changed, "
+        f"{len(delta['stale_nodes'])} node(s) and {len(delta['stale_edges'])} edge(s) to remove"
+    )
+    return delta
+
+
+def finish_deltas(deltas, report, concurrency=DEFAULT_UPLOAD_CONCURRENCY, retries=DEFAULT_UPLOAD_RETRIES):
+    """
+    Once the deltas were uploaded, delete the stale nodes and edges with Cypher and record
+    the new snapshots. Nothing is recorded when any step failed, so the next run resends
+    the same delta. Returns True on success.
+    """
+    import asyncio
+    from GraphDelta import save_snapshot, stale_queries
+    from UploadEngine import run_cypher_statements
+
+    if report_failed(report):
+        print("[WARN] delta upload incomplete; the snapshots are kept and the delta will be sent again")
+        return False
+
+    queries = [query for delta in deltas for query in stale_queries(delta)]
+    if queries:
+        with profiler.stage("delete_stale", unit="statements") as stage:
+            stage.add(len(queries))
+            failed = asyncio.run(run_cypher_statements(
+                queries, base_url=url, token_key=apikey, token_id=apiid, concurrency=concurrency, retries=retries
+            ))
+        if failed:
+            print(f"[WARN] {failed} of {len(queries)} stale-item delete(s) failed; the snapshots are kept")
+            return False
+        print(f"🧹 Removed stale nodes and edges with {len(queries)} Cypher statement(s)")
+
+    for delta in deltas:
+        save_snapshot(delta["path"], delta["snapshot"])
+    return True
+
+
+def upload_graph_files(files, args):
+    """Upload files with the command-line upload options, as deltas with --delta. Returns True on success."""
+    options = upload_options(args)
+    if not args.delta:
+        return not report_failed(upload_files(files, **options))
+
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="bloodsocer-delta-") as delta_dir:
+        # missing files and graphs without a delta are uploaded whole (missing ones are reported)
+        to_upload = [path for path in files if not os.path.exists(path)]
+        deltas = []
+        with profiler.stage("delta", unit="files") as stage:
+            for path in stage.track([path for path in files if os.path.exists(path)]):
+                delta = compute_graph_delta(path, delta_dir)
+                if delta is None:
+                    to_upload.append(path)
                 else:
-                    code = getattr(last_resp, "status_code", "N/A")
-                    print(f"[WARN] upload failed for {path} (status: {code})")
-            except Exception as e:
-                print(f"[ERROR] upload failed for {path}: {e}")
-
-        # finish job (trigger ingest)
-        try:
-            end_resp = httpx_client.post(f"/api/v2/file-upload/{job_id}/end", timeout=30.0)
-            if end_resp.status_code in (200, 201, 202):
-                print("Upload job finished; ingestion started (may take a few minutes).")
-            else:
-                print(f"[WARN] end job returned {end_resp.status_code}")
-        except Exception as e:
-            print(f"[ERROR] end job request failed: {e}")
+                    deltas.append(delta)
+        to_upload += [delta["delta_path"] for delta in deltas if delta["delta_path"]]
+        report = upload_files(to_upload, **options) if to_upload else []
+        return finish_deltas(deltas, report, args.upload_concurrency, args.upload_retries)
 
 
 def main():
@@ -265,29 +449,118 @@ def main():
         action="store_true",
         help="Immediately upload mitrehound_graph.json, arthound_graph.json and sigmahound_graph.json and exit (temporary switch)",
     )
+    parser.add_argument(
+        "-z", "--zip-upload",
+        dest="zip_upload",
+        action="store_true",
+        help="Upload graphs as ZIP archives compressed on the fly instead of plain JSON",
+    )
+    parser.add_argument(
+        "--upload-concurrency",
+        dest="upload_concurrency",
+        type=int,
+        default=DEFAULT_UPLOAD_CONCURRENCY,
+        help=f"Number of graph files uploaded in parallel (default: {DEFAULT_UPLOAD_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--upload-retries",
+        dest="upload_retries",
+        type=int,
+        default=DEFAULT_UPLOAD_RETRIES,
+        help=f"Retries per request on 429/5xx or connection errors (default: {DEFAULT_UPLOAD_RETRIES})",
+    )
+    parser.add_argument(
+        "--shard-size",
+        dest="shard_size",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Split each graph into node and edge shards of about MB megabytes before uploading",
+    )
+    parser.add_argument(
+        "--wait",
+        dest="wait_timeout",
+        type=float,
+        nargs="?",
+        const=DEFAULT_INGEST_TIMEOUT,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "After uploading, wait for BloodHound to finish ingesting (at most SECONDS, "
+            f"default {DEFAULT_INGEST_TIMEOUT}) and report upload vs ingest time and throughput"
+        ),
+    )
+    parser.add_argument(
+        "-d", "--delta",
+        dest="delta",
+        action="store_true",
+        help=(
+            "Upload only the nodes and edges added or changed since the last upload and delete "
+            "the ones that disappeared with Cypher (requires Cypher mutations enabled on the server)"
+        ),
+    )
+    parser.add_argument(
+        "--merge",
+        dest="merge",
+        action="store_true",
+        help=(
+            "Upload one deduplicated graph (output/bloodsocer_graph.json) merging every hound "
+            "graph and output/playbooks_graph.json instead of one file per hound"
+        ),
+    )
+    parser.add_argument(
+        "-v", "--validate",
+        dest="validate",
+        action="store_true",
+        help=(
+            "Before uploading, drop edges whose endpoints are not in any graph and edges that "
+            "appear more than once (cleaned copies go to output/validated/)"
+        ),
+    )
+    parser.add_argument(
+        "--single-direction",
+        dest="single_direction",
+        action="store_true",
+        help="Validate (see --validate) and also drop HasTTP edges that only mirror a PartOf edge",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        action="store_true",
+        help=(
+            "Record wall/CPU time, peak memory and throughput of every stage in output/profile/ "
+            "(bloodsocer.json, plus one report per hound)"
+        ),
+    )
+    parser.add_argument(
+        "--cprofile",
+        dest="cprofile",
+        action="store_true",
+        help="With --profile, also dump a cProfile of the slowest stage of each report",
+    )
     parser.add_argument(
         "-m", "--mitre",
         dest="mitre",
         action="store_true",
-        help="Run MitreHound.py only",
+        help="Run the MITRE ATT&CK hound only",
     )
     parser.add_argument(
         "-r", "--art",
         dest="art",
         action="store_true",
-        help="Run ARTHound.py only",
+        help="Run the Atomic Red Team hound only",
     )
     parser.add_argument(
         "-s", "--sigma",
         dest="sigma",
         action="store_true",
-        help="Run SigmaHound.py only",
+        help="Run the Sigma hound only",
     )
     parser.add_argument(
         "-a", "--all",
         dest="all",
         action="store_true",
-        help="Run MitreHound.py, SigmaHound.py and ARTHound.py in sequence and upload the results",
+        help="Run every hound in parallel and upload each result as soon as it is ready",
     )
 
     # If no args provided, show help and exit
@@ -296,7 +569,18 @@ def main():
         return
 
     args = parser.parse_args()
+    args.validate = args.validate or args.single_direction
+
+    global profiler
+    profiler = StageProfiler(enabled=args.profile, cprofile=args.cprofile)
+    try:
+        run_commands(args)
+    finally:
+        profiler.write_report(profile_path(OUTPUT_DIR, "bloodsocer"))
+
 
+def run_commands(args):
+    """Carry out the command selected on the parsed command line."""
     if args.clear_db:
         require_credentials("clear the database (--clear-db)")
         clear_database()
@@ -305,12 +589,9 @@ def main():
     # upload-only switch
     if args.upload_only:
         require_credentials("upload files (--upload-only)")
-        files = [
-            os.path.join(OUTPUT_DIR, "mitrehound_graph.json"),
-            os.path.join(OUTPUT_DIR, "arthound_graph.json"),
-            os.path.join(OUTPUT_DIR, "sigmahound_graph.json"),
-        ]
-        upload_files(files)
+        files = prepare_upload_files(hound_graph_files(), args)
+        if not upload_graph_files(files, args):
+            sys.exit(1)
         return
 
     if args.setup:
@@ -320,14 +601,31 @@ def main():
 
     if args.all:
         require_credentials("run all steps (--all)")
-        run_all_hounds()
-        # upload the generated files after running all hounds
-        files = [
-            os.path.join(OUTPUT_DIR, "mitrehound_graph.json"),
-            os.path.join(OUTPUT_DIR, "arthound_graph.json"),
-            os.path.join(OUTPUT_DIR, "sigmahound_graph.json"),
-        ]
-        upload_files(files)
+        import asyncio
+        from UploadEngine import print_upload_report
+
+        if args.validate or args.merge:
+            # validating or merging needs every graph, so the upload starts once all hounds are done
+            with profiler.stage("hounds"):
+                exit_codes, _ = asyncio.run(run_hounds_async())
+            hounds = load_hounds()
+            files = [hound_graph_file(hounds[name].graph_file) for name, code in exit_codes.items() if code == 0]
+            upload_ok = upload_graph_files(prepare_upload_files(files, args), args)
+        else:
+            # run the hounds in parallel and upload each graph as soon as it is ready
+            deltas = [] if args.delta else None
+            with profiler.stage("hounds_and_upload"):
+                exit_codes, report = asyncio.run(run_hounds_async(upload=True, deltas=deltas, **upload_options(args)))
+            if report:
+                print_upload_report(report)
+            upload_ok = not report_failed(report)
+            if deltas is not None:
+                upload_ok = finish_deltas(deltas, report, args.upload_concurrency, args.upload_retries)
+        failed = [name for name, code in exit_codes.items() if code != 0]
+        if failed:
+            print(f"[ERROR] hound(s) failed: {', '.join(failed)}")
+        if failed or not upload_ok:
+            sys.exit(1)
         return
 
     if args.defineicons:
@@ -351,12 +649,9 @@ def main():
             print("[ERROR] Valid apiid/apikey required to upload files.")
             print("Please update 'apikey' and 'apiid' before uploading.")
             return
-        files = [
-            os.path.join(OUTPUT_DIR, "mitrehound_graph.json"),
-            os.path.join(OUTPUT_DIR, "arthound_graph.json"),
-            os.path.join(OUTPUT_DIR, "sigmahound_graph.json"),
-        ]
-        upload_files(files)
+        files = prepare_upload_files(hound_graph_files(), args)
+        if not upload_graph_files(files, args):
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+BloodSOCer configuration.
+
+Kept free of third-party imports so the hounds and the CLI can read it without pulling
+in httpx or the BloodHound client; network libraries are imported only by the commands
+that talk to the server.
+"""
+
+import os
+
+# ---------------------------------------------------------------------------
+# Configuration – set these before running
+# ---------------------------------------------------------------------------
+apikey = "<CHANGEME>"
+apiid = "<CHANGEME>"
+
+# BloodHound base URL (used by HMAC client / uploads)
+url = "http://127.0.0.1:8080"
+
+# Directory where *_graph.json files are created (and where uploads will be read from)
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+
+# Upload defaults (see UploadEngine)
+DEFAULT_UPLOAD_CONCURRENCY = 3
+DEFAULT_UPLOAD_RETRIES = 4
+
+# How long --wait polls an upload job for ingest to finish (seconds)
+DEFAULT_INGEST_TIMEOUT = 3600
+
+
+def credentials_valid():
+    """
+    Return True if apikey/apiid look usable (not <CHANGEME> / empty).
+    """
+    invalid_values = {None, "", "<CHANGEME>"}
+    return apikey not in invalid_values and apiid not in invalid_values
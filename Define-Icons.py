@@ -1,57 +1,101 @@
 #!/usr/bin/env python3
+"""
+Define the custom node icons of every kind BloodSOCer uploads (see KindRegistry.py).
 
-import requests
-import json
-import auth
-from auth.hmac_authenticated_client import HMACAuthenticatedClient
-from blood_hound_api_client import AuthenticatedClient
-from blood_hound_api_client.api.api_info import get_api_version
-from blood_hound_api_client.models import GetApiVersionResponse200
-from blood_hound_api_client.types import Response
-
-# Import apikey, apiid, and url from BloodSOCer.py
-try:
-    from BloodSOCer import apikey, apiid, url
-except Exception:
-    apikey = None
-    apiid = None
-    url = "http://127.0.0.1:8080"
-
-if not apikey or apikey == "<CHANGEME>" or not apiid or apiid == "<CHANGEME>":
-    raise SystemExit("apikey and apiid must be set in BloodSOCer.py before running this script.")
-
-client = HMACAuthenticatedClient(base_url=url, token_key=apikey, token_id=apiid)
-
-with client as client:
-    def define_icon(icon_type, icon_name, icon_color):
-        payload = {
-            "custom_types": {
-                icon_type: {
-                    "icon": {
-                        "type": "font-awesome",
-                        "name": icon_name,
-                        "color": icon_color
-                    }
-                }
-            }
-        }
+The kinds come from KindRegistry.KIND_ICONS, from the kinds each hound declares and from
+the graphs in output/. The custom types already defined on the server are fetched once;
+all missing kinds are then created in one batched request and kinds whose icon changed
+are updated, so running this against an instance that is already set up makes no writes.
+"""
 
+import argparse
+import os
+import sys
+
+from Config import OUTPUT_DIR, apikey, apiid, credentials_valid, url
+
+
+def graph_paths():
+    """The hound graphs and the extra graphs (playbooks) whose kinds get an icon."""
+    from BloodSOCer import EXTRA_GRAPH_FILES, hound_graph_files
+
+    return hound_graph_files() + [os.path.join(OUTPUT_DIR, name) for name in EXTRA_GRAPH_FILES]
+
+
+def fetch_custom_types(httpx_client):
+    """The server's custom types as {kind: config}, or None when they cannot be read."""
+    from KindRegistry import server_custom_types
+
+    resp = httpx_client.get("/api/v2/custom-nodes")
+    if resp.status_code >= 400:
+        print(f"[ERROR] cannot list custom node types (status {resp.status_code}): {resp.text}")
+        return None
+    return server_custom_types(resp.json().get("data"))
+
+
+def sync_icons(httpx_client, wanted):
+    """Create the missing custom types in one request and update the changed ones. Returns True on success."""
+    from KindRegistry import diff_custom_types
+
+    existing = fetch_custom_types(httpx_client)
+    if existing is None:
+        return False
+    missing, changed = diff_custom_types(wanted, existing)
+    ok = True
+
+    if missing:
+        resp = httpx_client.post("/api/v2/custom-nodes", json={"custom_types": missing})
+        if resp.status_code < 400:
+            print(f"🔹 Defined icons for: {', '.join(missing)}")
+        else:
+            print(f"[ERROR] defining icons failed (status {resp.status_code}): {resp.text}")
+            ok = False
+
+    # the API only creates types in batches; existing ones are updated one by one
+    for kind, config in changed.items():
+        resp = httpx_client.put(f"/api/v2/custom-nodes/{kind}", json={"config": config})
+        if resp.status_code < 400:
+            print(f"🔹 Updated icon for: {kind}")
+        else:
+            print(f"[ERROR] updating the icon of {kind} failed (status {resp.status_code}): {resp.text}")
+            ok = False
+
+    unchanged = len(wanted) - len(missing) - len(changed)
+    print(f"✅ Icons: {len(missing)} defined, {len(changed)} updated, {unchanged} already up to date")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Define BloodHound icons for every kind BloodSOCer uploads.")
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="Print the kinds and icons that would be defined, without contacting the server",
+    )
+    args = parser.parse_args()
+
+    from Hound import load_hounds
+    from KindRegistry import build_custom_types
+
+    declared = [node_kinds for hound in load_hounds().values() for node_kinds in hound.kinds]
+    wanted = build_custom_types(graph_paths(), declared)
+    if args.list:
+        for kind, config in wanted.items():
+            icon = config["icon"]
+            print(f"{kind:<12} {icon['name']:<16} {icon['color']}")
+        return
+
+    if not credentials_valid():
+        sys.exit("apikey and apiid must be set in Config.py before running this script.")
+
+    from auth.hmac_authenticated_client import HMACAuthenticatedClient
+
+    with HMACAuthenticatedClient(base_url=url, token_key=apikey, token_id=apiid) as client:
         # Use the httpx client provided by the HMACAuthenticatedClient
         httpx_client = client.get_httpx_client()
-        # call without verify (HTTPX client controls verification)
-        resp = httpx_client.post("/api/v2/custom-nodes", json=payload)
-
-        print(f"🔹 Sent icon for: {icon_type}")
-        print("Status Code:", resp.status_code)
-        print("Response Body:", resp.text)
-        print("---")
-        return resp
-
-    # Call function for each icon type you want to send
-    define_icon("Rule", "burst", "#03CEFC")
-    define_icon("Tactic", "layer-group", "#D67500")
-    define_icon("Technique", "newspaper", "#EFFC00")
-    define_icon("Software", "microchip", "#0BD600")
-    define_icon("TA_Group", "user-secret", "#A00505")
-    define_icon("Playbook", "clipboard-list", "#8400FF")
-    define_icon("ART", "radiation", "#D6001C")
+        if not sync_icons(httpx_client, wanted):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Delta uploads against the last uploaded snapshot of each graph.
+
+A snapshot maps every node id and edge key of the last successfully uploaded graph to
+a digest of its JSON. compute_delta streams the new graph, writes only the added or
+changed nodes and edges to a delta graph, and lists the nodes and edges that are gone
+so they can be removed with Cypher. The snapshot is replaced only once the delta has
+been uploaded and the stale items deleted, so a failed run is simply retried next time.
+
+BloodHound merges an uploaded node into the existing one, so a property removed from a
+changed node is left on the server until the node is re-created (e.g. after --clear-db).
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+from GraphWriter import GraphWriter, iter_graph_items, read_graph_metadata
+from HoundCache import CACHE_DIRNAME
+
+SNAPSHOT_SUFFIX = ".uploaded.json"
+
+# Ids per Cypher delete statement
+CYPHER_DELETE_BATCH = 500
+
+
+def snapshot_path(graph_path):
+    """Snapshot of a graph file; <name>.json and <name>.json.gz share one snapshot."""
+    out_dir, name = os.path.split(graph_path)
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return os.path.join(out_dir, CACHE_DIRNAME, name + SNAPSHOT_SUFFIX)
+
+
+def read_snapshot(graph_path):
+    try:
+        with open(snapshot_path(graph_path), "r", encoding="utf-8") as fh:
+            snapshot = json.load(fh)
+    except (OSError, ValueError):
+        return {"nodes": {}, "edges": {}}
+    return {"nodes": snapshot.get("nodes", {}), "edges": snapshot.get("edges", {})}
+
+
+def save_snapshot(graph_path, snapshot):
+    path = snapshot_path(graph_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(snapshot, fh, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def forget_snapshots(out_dir):
+    """Drop every snapshot under out_dir, e.g. after the database was cleared."""
+    for path in glob.glob(os.path.join(out_dir, CACHE_DIRNAME, "*" + SNAPSHOT_SUFFIX)):
+        os.remove(path)
+
+
+def item_digest(item):
+    text = json.dumps(item, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def endpoint(ref):
+    return [ref.get("value"), ref.get("match_by") or "id"]
+
+
+def edge_key(edge):
+    """Identity of an edge: its kind and both endpoints (properties may change)."""
+    return json.dumps([edge.get("kind")] + endpoint(edge["start"]) + endpoint(edge["end"]), ensure_ascii=False)
+
+
+def compute_delta(path, delta_dir):
+    """
+    Compare the graph at path with its snapshot and write the added and changed items to
+    a delta graph in delta_dir (with the source metadata). Returns
+    {"path", "delta_path" (None when nothing was added or changed), "nodes", "edges"
+    (items written), "stale_nodes" (ids), "stale_edges" ([kind, start, start_by, end, end_by]),
+    "snapshot"}.
+    """
+    old = read_snapshot(path)
+    snapshot = {"nodes": {}, "edges": {}}
+    name = os.path.basename(path)
+    if name.endswith(".gz"):
+        name = name[:-3]
+    delta_path = os.path.join(delta_dir, name)
+
+    with GraphWriter(delta_path, gzip_output=False, metadata=read_graph_metadata(path)) as writer:
+        for node in iter_graph_items(path, "nodes"):
+            digest = item_digest(node)
+            snapshot["nodes"][node["id"]] = digest
+            if old["nodes"].get(node["id"]) != digest:
+                writer.add_node(node)
+        for edge in iter_graph_items(path, "edges"):
+            key = edge_key(edge)
+            digest = item_digest(edge)
+            snapshot["edges"][key] = digest
+            if old["edges"].get(key) != digest:
+                writer.add_edge(edge)
+
+    stale_nodes = sorted(set(old["nodes"]) - set(snapshot["nodes"]))
+    gone = set(stale_nodes)
+    stale_edges = []
+    for key in sorted(set(old["edges"]) - set(snapshot["edges"])):
+        kind, start, start_by, end, end_by = json.loads(key)
+        # DETACH DELETE of a stale node already removes its edges
+        if (start_by == "id" and start in gone) or (end_by == "id" and end in gone):
+            continue
+        stale_edges.append([kind, start, start_by, end, end_by])
+
+    if not writer.node_count and not writer.edge_count:
+        os.remove(delta_path)
+        delta_path = None
+
+    return {
+        "path": path,
+        "delta_path": delta_path,
+        "nodes": writer.node_count,
+        "edges": writer.edge_count,
+        "stale_nodes": stale_nodes,
+        "stale_edges": stale_edges,
+        "snapshot": snapshot,
+    }
+
+
+def cypher_string(value):
+    """Cypher string literal (JSON string escaping is valid Cypher)."""
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def cypher_list(values):
+    return "[" + ", ".join(cypher_string(value) for value in values) + "]"
+
+
+def match_property(match_by):
+    """Node property an OpenGraph edge endpoint is matched on."""
+    return "name" if match_by == "name" else "objectid"
+
+
+def stale_queries(delta):
+    """Cypher statements deleting the stale nodes and edges of a delta."""
+    queries = []
+    ids = delta["stale_nodes"]
+    for i in range(0, len(ids), CYPHER_DELETE_BATCH):
+        queries.append(f"MATCH (n) WHERE n.objectid IN {cypher_list(ids[i:i + CYPHER_DELETE_BATCH])} DETACH DELETE n")
+
+    # one statement per (kind, start node, end property), covering all its stale end nodes
+    grouped = {}
+    for kind, start, start_by, end, end_by in delta["stale_edges"]:
+        grouped.setdefault((kind, start, start_by, end_by), []).append(end)
+    for (kind, start, start_by, end_by), ends in sorted(grouped.items()):
+        rel_kind = "`" + kind.replace("`", "``") + "`"
+        for i in range(0, len(ends), CYPHER_DELETE_BATCH):
+            queries.append(
+                f"MATCH (a)-[r:{rel_kind}]->(b) WHERE a.{match_property(start_by)} = {cypher_string(start)} "
+                f"AND b.{match_property(end_by)} IN {cypher_list(ends[i:i + CYPHER_DELETE_BATCH])} DELETE r"
+            )
+    return queries
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Merge several OpenGraph files into one deduplicated document.
+
+Nodes are keyed by id and edges by kind and endpoints (GraphDelta.edge_key). When a key
+comes up again, its kinds are unioned in order and its properties merged: a value set by
+an earlier graph wins, empty values (None, "", [], {}) are filled in by later graphs and
+lists are unioned. The source_kind of each input is folded into its nodes' kinds, and the
+merged document carries a single source_kind of its own.
+"""
+
+from GraphDelta import edge_key
+from GraphWriter import GraphWriter, iter_graph_items, read_graph_metadata
+
+MERGED_SOURCE_KIND = "BloodSOCer"
+
+
+def is_empty(value):
+    return value is None or value == "" or value == [] or value == {}
+
+
+def merge_properties(target, extra):
+    """Merge the properties dict extra into target (see the module docstring); returns target."""
+    for key, value in (extra or {}).items():
+        current = target.get(key)
+        if is_empty(current):
+            target[key] = value
+        elif isinstance(current, list) and isinstance(value, list):
+            target[key] = current + [item for item in value if item not in current]
+    return target
+
+
+def merge_item(target, item):
+    """Fold a duplicate node or edge into the first one seen."""
+    if "kinds" in item:
+        target["kinds"] = target.get("kinds", []) + [kind for kind in item["kinds"] if kind not in target.get("kinds", [])]
+    if not is_empty(item.get("properties")):
+        target["properties"] = merge_properties(dict(target.get("properties") or {}), item["properties"])
+
+
+def merge_graphs(paths, out_path, source_kind=MERGED_SOURCE_KIND, pretty=False, gzip_output=None):
+    """
+    Merge the graphs in paths (earlier graphs take precedence) into out_path.
+    Returns {"nodes", "edges", "duplicate_nodes", "duplicate_edges"}.
+    """
+    nodes = {}
+    edges = {}
+    stats = {"duplicate_nodes": 0, "duplicate_edges": 0}
+
+    for path in paths:
+        metadata = read_graph_metadata(path) or {}
+        extra_kind = metadata.get("source_kind")
+        for node in iter_graph_items(path, "nodes"):
+            if extra_kind and extra_kind not in node.get("kinds", []):
+                node["kinds"] = node.get("kinds", []) + [extra_kind]
+            if node["id"] in nodes:
+                stats["duplicate_nodes"] += 1
+                merge_item(nodes[node["id"]], node)
+            else:
+                nodes[node["id"]] = node
+        for edge in iter_graph_items(path, "edges"):
+            key = edge_key(edge)
+            if key in edges:
+                stats["duplicate_edges"] += 1
+                merge_item(edges[key], edge)
+            else:
+                edges[key] = edge
+
+    metadata = {"source_kind": source_kind} if source_kind else None
+    with GraphWriter(out_path, pretty=pretty, gzip_output=gzip_output, metadata=metadata) as writer:
+        writer.add_nodes(nodes.values())
+        writer.add_edges(edges.values())
+    stats["nodes"] = writer.node_count
+    stats["edges"] = writer.edge_count
+    return stats
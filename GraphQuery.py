@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation of the saved queries in Cyphers/ against the generated graphs.
+
+GraphIndex loads *_graph.json files into memory the way BloodHound ingests them: nodes
+with the same id are merged (GraphMerge.merge_item), the source_kind of a graph becomes a
+kind of its nodes, the name property is upper-cased, edges are resolved by id or name
+and duplicates collapse into one relationship. Nodes get integer ids with out/in
+adjacency lists and per-kind and per-name indexes.
+
+run_query understands the single-relationship path patterns the saved queries use:
+
+    MATCH p=[shortestPath|allShortestPaths](
+        (s:Label)-[:KIND|KIND *min..max]->(t:Label)
+    ) WHERE <s|t>.prop =|<>|CONTAINS|STARTS WITH|ENDS WITH "text" AND s <> t ...
+    RETURN [DISTINCT] p, s, t [LIMIT n]
+
+Shortest paths are found with a breadth-first search from whichever side has fewer
+candidate nodes; other variable-length patterns are enumerated depth-first, without
+reusing a relationship, and pruned with the distance to the nearest end candidate.
+Anything else raises ValueError. Check the answers before uploading, or in CI:
+
+    python3 GraphQuery.py --output answers.json
+    python3 GraphQuery.py --expect answers.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+
+from GraphMerge import merge_item
+from GraphWriter import iter_graph_items, read_graph_metadata
+
+DEFAULT_QUERY_DIR = os.path.join(os.path.dirname(__file__), "Cyphers")
+
+QUERY_RE = re.compile(
+    r"^\s*match\s+(?:(\w+)\s*=\s*)?(.+?)\s*(?:\bwhere\s+(.+?)\s*)?\breturn\s+(distinct\s+)?(.+?)"
+    r"\s*(?:\blimit\s+(\d+)\s*)?;?\s*$",
+    re.I | re.S,
+)
+SHORTEST_RE = re.compile(r"^(shortestpath|allshortestpaths)\s*\((.*)\)$", re.I | re.S)
+CHAIN_RE = re.compile(r"^\(([^()]*)\)\s*(<?)-\s*(?:\[([^\[\]]*)\])?\s*-(>?)\s*\(([^()]*)\)$", re.S)
+NODE_RE = re.compile(r"^\s*(\w*)\s*((?::\s*\w+\s*)*)$")
+REL_RE = re.compile(r"^\s*(\w*)\s*(?::\s*(\w+(?:\s*\|\s*:?\s*\w+)*))?\s*(\*\s*(\d*)\s*(\.\.\s*(\d*))?)?\s*$")
+COND_RE = re.compile(
+    r"\s*(not\s+)?(\w+)(?:\.(\w+))?\s*(=|<>|contains\b|starts\s+with\b|ends\s+with\b)\s*"
+    r"(?:\"((?:[^\"\\]|\\.)*)\"|'((?:[^'\\]|\\.)*)'|(\w+)(?:\.(\w+))?)\s*(?:\band\b|$)",
+    re.I,
+)
+
+
+class GraphIndex:
+    """In-memory graph with integer node ids, adjacency lists and kind/name indexes."""
+
+    def __init__(self, paths=()):
+        self.nodes = []       # int -> node dict
+        self.index = {}       # node id -> int
+        self.kinds = {}       # kind -> [int]
+        self.names = {}       # upper-case name -> [int]
+        self.edge_kinds = []  # relationship int -> kind
+        self.out = []         # int -> [(neighbour int, relationship int)]
+        self.into = []
+        if paths:
+            self.load(paths)
+
+    def load(self, paths):
+        """Load the graphs at paths (missing files are skipped): every node first, then every edge."""
+        paths = [path for path in paths if os.path.exists(path)]
+        for path in paths:
+            source_kind = (read_graph_metadata(path) or {}).get("source_kind")
+            for node in iter_graph_items(path, "nodes"):
+                if source_kind and source_kind not in node.get("kinds", []):
+                    node["kinds"] = node.get("kinds", []) + [source_kind]
+                number = self.index.get(node["id"])
+                if number is None:
+                    self.index[node["id"]] = len(self.nodes)
+                    self.nodes.append(node)
+                    self.out.append([])
+                    self.into.append([])
+                else:
+                    merge_item(self.nodes[number], node)
+
+        self.kinds = {}
+        self.names = {}
+        for number, node in enumerate(self.nodes):
+            for kind in node.get("kinds") or []:
+                self.kinds.setdefault(kind, []).append(number)
+            properties = node.setdefault("properties", {})
+            if isinstance(properties.get("name"), str):
+                properties["name"] = properties["name"].upper()
+                self.names.setdefault(properties["name"], []).append(number)
+
+        seen = set()
+        for path in paths:
+            for edge in iter_graph_items(path, "edges"):
+                for start in self.resolve(edge["start"]):
+                    for end in self.resolve(edge["end"]):
+                        key = (start, edge["kind"], end)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        self.out[start].append((end, len(self.edge_kinds)))
+                        self.into[end].append((start, len(self.edge_kinds)))
+                        self.edge_kinds.append(edge["kind"])
+        return self
+
+    def resolve(self, ref):
+        """Nodes an edge endpoint refers to (every node with that name for match_by name)."""
+        if (ref.get("match_by") or "id") == "name":
+            candidates = self.names.get(str(ref.get("value")).upper(), [])
+        else:
+            number = self.index.get(ref.get("value"))
+            candidates = [] if number is None else [number]
+        kind = ref.get("kind")
+        return [number for number in candidates if not kind or kind in self.nodes[number]["kinds"]]
+
+    def neighbours(self, number, direction):
+        if direction == "out":
+            return self.out[number]
+        if direction == "in":
+            return self.into[number]
+        return self.out[number] + self.into[number]
+
+
+def parse_node(text):
+    match = NODE_RE.match(text)
+    if not match:
+        raise ValueError(f"unsupported node pattern: ({text})")
+    return match.group(1), [label.strip() for label in match.group(2).split(":") if label.strip()]
+
+
+def parse_relationship(text):
+    """(kinds or None, min hops, max hops or None) of a [..] relationship pattern."""
+    match = REL_RE.match(text or "")
+    if not match:
+        raise ValueError(f"unsupported relationship pattern: [{text}]")
+    _, kinds, star, low, dots, high = match.groups()
+    kinds = {kind.strip(" :") for kind in kinds.split("|")} if kinds else None
+    if not star:
+        return kinds, 1, 1
+    if not dots:
+        return (kinds, int(low), int(low)) if low else (kinds, 1, None)
+    return kinds, int(low) if low else 1, int(high) if high else None
+
+
+def parse_conditions(text):
+    """[(negate, var, prop, op, literal, (var, prop) or None)] from a WHERE clause of ANDed comparisons."""
+    conditions = []
+    position = 0
+    text = (text or "").strip()
+    while position < len(text):
+        match = COND_RE.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"unsupported WHERE clause: {text[position:]}")
+        negate, var, prop, op, double, single, other, other_prop = match.groups()
+        op = " ".join(op.lower().split())
+        literal = double if double is not None else single
+        if literal is not None:
+            literal = re.sub(r"\\(.)", r"\1", literal)
+            reference = None
+        elif other.isdigit():
+            literal, reference = int(other), None
+        else:
+            reference = (other, other_prop)
+        conditions.append((bool(negate), var, prop, op, literal, reference))
+        position = match.end()
+    return conditions
+
+
+def parse_query(query):
+    """Parse a saved query into a plan dict; raises ValueError for unsupported Cypher."""
+    match = QUERY_RE.match(query)
+    if not match:
+        raise ValueError("only MATCH ... [WHERE ...] RETURN ... [LIMIT n] queries are supported")
+    path_var, pattern, where, distinct, returns, limit = match.groups()
+
+    mode = "all"
+    shortest = SHORTEST_RE.match(pattern.strip())
+    if shortest:
+        mode = "shortest" if shortest.group(1).lower() == "shortestpath" else "all_shortest"
+        pattern = shortest.group(2)
+    chain = CHAIN_RE.match(pattern.strip())
+    if not chain:
+        raise ValueError(f"only single-relationship path patterns are supported: {pattern}")
+    start_text, left, rel_text, right, end_text = chain.groups()
+    if left and right:
+        raise ValueError("a relationship cannot point both ways")
+
+    start_var, start_labels = parse_node(start_text)
+    end_var, end_labels = parse_node(end_text)
+    kinds, low, high = parse_relationship(rel_text)
+    if mode != "all" and low > 1:
+        raise ValueError("shortest path patterns need a minimum length of 0 or 1")
+    if mode == "all" and high is None:
+        raise ValueError("unbounded variable-length patterns need shortestPath() or an upper bound")
+
+    plan = {
+        "mode": mode,
+        "direction": "out" if right else "in" if left else "both",
+        "kinds": kinds,
+        "min": low,
+        "max": high,
+        "start": (start_var or "_start", start_labels),
+        "end": (end_var or "_end", end_labels),
+        "path": path_var,
+        "conditions": parse_conditions(where),
+        "returns": [item.strip() for item in returns.split(",")],
+        "distinct": bool(distinct),
+        "limit": int(limit) if limit else None,
+    }
+    known = {plan["start"][0], plan["end"][0]}
+    for _, var, _, _, _, reference in plan["conditions"]:
+        for name in [var] + ([reference[0]] if reference else []):
+            if name not in known:
+                raise ValueError(f"unknown variable in WHERE: {name}")
+    for item in plan["returns"]:
+        if item not in known | {path_var}:
+            raise ValueError(f"only node and path variables can be returned: {item}")
+    return plan
+
+
+def node_value(graph, number, prop):
+    if prop is None:
+        return number
+    if prop == "objectid":
+        return graph.nodes[number]["id"]
+    return (graph.nodes[number].get("properties") or {}).get(prop)
+
+
+def compare(op, left, right):
+    """Cypher comparison: None when either side is null, so the row is filtered out."""
+    if left is None or right is None:
+        return None
+    if op == "=":
+        return left == right
+    if op == "<>":
+        return left != right
+    if not (isinstance(left, str) and isinstance(right, str)):
+        return None
+    if op == "contains":
+        return right in left
+    if op == "starts with":
+        return left.startswith(right)
+    return left.endswith(right)
+
+
+def conditions_hold(graph, conditions, bindings):
+    for negate, var, prop, op, literal, reference in conditions:
+        right = literal if reference is None else node_value(graph, bindings[reference[0]], reference[1])
+        result = compare(op, node_value(graph, bindings[var], prop), right)
+        if result is None or result == negate:
+            return False
+    return True
+
+
+def split_conditions(plan):
+    """Conditions on the start node only, on the end node only, and on both."""
+    start_var, end_var = plan["start"][0], plan["end"][0]
+    start, end, both = [], [], []
+    for condition in plan["conditions"]:
+        used = {condition[1]} | ({condition[5][0]} if condition[5] else set())
+        if used == {start_var}:
+            start.append(condition)
+        elif used == {end_var}:
+            end.append(condition)
+        else:
+            both.append(condition)
+    return start, end, both
+
+
+def candidates(graph, var, labels, conditions):
+    if labels:
+        numbers = set(graph.kinds.get(labels[0], []))
+        for label in labels[1:]:
+            numbers &= set(graph.kinds.get(label, []))
+        numbers = sorted(numbers)
+    else:
+        numbers = range(len(graph.nodes))
+    return [number for number in numbers if conditions_hold(graph, conditions, {var: number})]
+
+
+def allowed(graph, kinds):
+    """Predicate on relationship ints for a set of kinds (None: any kind)."""
+    if kinds is None:
+        return lambda rel: True
+    return lambda rel: graph.edge_kinds[rel] in kinds
+
+
+def bfs(graph, origin, direction, max_hops, rel_ok, all_parents):
+    """Breadth-first search from origin: {node: [(parent, relationship)]} and {node: depth}."""
+    parents = {origin: []}
+    depth = {origin: 0}
+    queue = deque([origin])
+    while queue:
+        node = queue.popleft()
+        if max_hops is not None and depth[node] >= max_hops:
+            continue
+        for neighbour, rel in graph.neighbours(node, direction):
+            if not rel_ok(rel):
+                continue
+            if neighbour not in depth:
+                depth[neighbour] = depth[node] + 1
+                parents[neighbour] = [(node, rel)]
+                queue.append(neighbour)
+            elif all_parents and depth[neighbour] == depth[node] + 1:
+                parents[neighbour].append((node, rel))
+    return parents, depth
+
+
+def unwind(parents, node):
+    """Every path from the BFS origin to node as ([nodes], [relationships])."""
+    if not parents[node]:
+        yield [node], []
+        return
+    for parent, rel in parents[node]:
+        for nodes, rels in unwind(parents, parent):
+            yield nodes + [node], rels + [rel]
+
+
+REVERSE = {"out": "in", "in": "out", "both": "both"}
+
+
+def shortest_paths(graph, plan, starts, end_ok, pair_ok):
+    """Yield (start, end, nodes, rels) of the shortest path(s) between every matching pair."""
+    rel_ok = allowed(graph, plan["kinds"])
+    all_parents = plan["mode"] == "all_shortest"
+    ends = [number for number in range(len(graph.nodes)) if end_ok(number)] if len(starts) > 1 else None
+
+    # search from the smaller side; paths found backwards are reversed
+    if ends is not None and len(ends) < len(starts):
+        start_set = set(starts)
+        for end in ends:
+            parents, depth = bfs(graph, end, REVERSE[plan["direction"]], plan["max"], rel_ok, all_parents)
+            for start in sorted(start_set.intersection(depth)):
+                if start == end or depth[start] < plan["min"] or not pair_ok(start, end):
+                    continue
+                for nodes, rels in unwind(parents, start):
+                    yield start, end, nodes[::-1], rels[::-1]
+        return
+
+    for start in starts:
+        parents, depth = bfs(graph, start, plan["direction"], plan["max"], rel_ok, all_parents)
+        for end in sorted(depth):
+            if end == start or depth[end] < plan["min"] or not end_ok(end) or not pair_ok(start, end):
+                continue
+            for nodes, rels in unwind(parents, end):
+                yield start, end, nodes, rels
+
+
+def distances_to(graph, targets, direction, max_hops, rel_ok):
+    """Hops from every node to the nearest of targets (multi-source BFS against direction)."""
+    distance = {target: 0 for target in targets}
+    queue = deque(targets)
+    while queue:
+        node = queue.popleft()
+        if distance[node] >= max_hops:
+            continue
+        for neighbour, rel in graph.neighbours(node, REVERSE[direction]):
+            if rel_ok(rel) and neighbour not in distance:
+                distance[neighbour] = distance[node] + 1
+                queue.append(neighbour)
+    return distance
+
+
+def variable_paths(graph, plan, starts, end_ok, pair_ok):
+    """Yield (start, end, nodes, rels) of every path of min..max hops that never reuses a relationship."""
+    rel_ok = allowed(graph, plan["kinds"])
+    low, high, direction = plan["min"], plan["max"], plan["direction"]
+    end_var, end_labels = plan["end"]
+    pruned = end_labels or any(condition[1] == end_var for condition in plan["conditions"])
+    distance = None
+    if pruned:
+        targets = [number for number in range(len(graph.nodes)) if end_ok(number)]
+        distance = distances_to(graph, targets, direction, high, rel_ok)
+
+    def walk(nodes, rels):
+        node = nodes[-1]
+        hops = len(rels)
+        if hops >= low and end_ok(node) and pair_ok(nodes[0], node):
+            yield nodes[0], node, list(nodes), list(rels)
+        if hops == high:
+            return
+        for neighbour, rel in graph.neighbours(node, direction):
+            if not rel_ok(rel) or rel in rels:
+                continue
+            if distance is not None and distance.get(neighbour, high + 1) > high - hops - 1:
+                continue
+            nodes.append(neighbour)
+            rels.append(rel)
+            yield from walk(nodes, rels)
+            nodes.pop()
+            rels.pop()
+
+    for start in starts:
+        yield from walk([start], [])
+
+
+def run_query(graph, query, limit=None):
+    """Evaluate query against graph; returns one {return item: value} row per match (see serialize_row)."""
+    plan = parse_query(query)
+    start_var, start_labels = plan["start"]
+    end_var, end_labels = plan["end"]
+    start_conditions, end_conditions, pair_conditions = split_conditions(plan)
+
+    starts = candidates(graph, start_var, start_labels, start_conditions)
+    end_label_set = set(end_labels)
+
+    def end_ok(number):
+        return end_label_set.issubset(graph.nodes[number]["kinds"]) and \
+            conditions_hold(graph, end_conditions, {end_var: number})
+
+    def pair_ok(start, end):
+        return conditions_hold(graph, pair_conditions, {start_var: start, end_var: end})
+
+    search = variable_paths if plan["mode"] == "all" else shortest_paths
+    limits = [value for value in (plan["limit"], limit) if value is not None]
+    limit = min(limits) if limits else None
+
+    rows = []
+    seen = set()
+    for start, end, nodes, rels in search(graph, plan, starts, end_ok, pair_ok):
+        values = {start_var: start, end_var: end, plan["path"]: (tuple(nodes), tuple(rels))}
+        row = {item: values[item] for item in plan["returns"]}
+        if plan["distinct"]:
+            key = tuple(row[item] for item in plan["returns"])
+            if key in seen:
+                continue
+            seen.add(key)
+        rows.append(row)
+        if limit is not None and len(rows) >= limit:
+            break
+    return rows
+
+
+def serialize_row(graph, row):
+    """JSON-friendly row: nodes as their ids, paths as [id, kind, id, kind, ..., id]."""
+    result = {}
+    for item, value in row.items():
+        if isinstance(value, tuple):
+            nodes, rels = value
+            path = [graph.nodes[nodes[0]]["id"]]
+            for node, rel in zip(nodes[1:], rels):
+                path += [graph.edge_kinds[rel], graph.nodes[node]["id"]]
+            result[item] = path
+        else:
+            result[item] = graph.nodes[value]["id"]
+    return result
+
+
+def describe_row(graph, row):
+    """One-line rendering of a row with node names."""
+    def label(number):
+        return (graph.nodes[number].get("properties") or {}).get("name") or graph.nodes[number]["id"]
+
+    parts = []
+    for item, value in row.items():
+        if isinstance(value, tuple):
+            nodes, rels = value
+            text = label(nodes[0])
+            for node, rel in zip(nodes[1:], rels):
+                text += f" -[{graph.edge_kinds[rel]}]-> {label(node)}"
+        else:
+            text = label(value)
+        parts.append(f"{item}: {text}")
+    return ", ".join(parts)
+
+
+def load_saved_queries(files):
+    """[(path, {"name", "query", ...})] from saved-query JSON files."""
+    queries = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        queries.extend((path, query) for query in (data if isinstance(data, list) else [data]))
+    return queries
+
+
+def default_graph_paths():
+    """The hound graphs and the extra graphs (playbooks), as BloodSOCer uploads them."""
+    from BloodSOCer import EXTRA_GRAPH_FILES, hound_graph_files
+    from Config import OUTPUT_DIR
+
+    return hound_graph_files() + [os.path.join(OUTPUT_DIR, name) for name in EXTRA_GRAPH_FILES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the saved queries against the generated graphs, without a server.")
+    parser.add_argument("files", nargs="*", help="Saved-query JSON files (default: every JSON file under Cyphers/)")
+    parser.add_argument(
+        "-g", "--graph",
+        dest="graphs",
+        action="append",
+        help="Graph file to load (repeatable; default: the hound graphs and the playbooks in output/)",
+    )
+    parser.add_argument("--limit", type=int, help="Stop each query after this many rows")
+    parser.add_argument("--show", type=int, default=5, help="Rows printed per query (default: 5)")
+    parser.add_argument("--output", help="Write every query's rows as JSON to this file")
+    parser.add_argument("--expect", help="Answers JSON of a previous --output run; fail when a query's rows differ")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(DEFAULT_QUERY_DIR, "**", "*.json"), recursive=True))
+    start = time.perf_counter()
+    graph = GraphIndex(args.graphs or default_graph_paths())
+    print(
+        f"📦 Loaded {len(graph.nodes)} nodes and {len(graph.edge_kinds)} relationships "
+        f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+    )
+
+    answers = {}
+    failed = False
+    for path, saved in load_saved_queries(files):
+        name = saved.get("name") or os.path.basename(path)
+        start = time.perf_counter()
+        try:
+            rows = run_query(graph, saved["query"], args.limit)
+        except ValueError as exc:
+            print(f"[ERROR] {name} ({path}): {exc}")
+            failed = True
+            continue
+        print(f"🔎 {name}: {len(rows)} row(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for row in rows[:args.show]:
+            print(f"   {describe_row(graph, row)}")
+        answers[name] = sorted((serialize_row(graph, row) for row in rows), key=lambda row: json.dumps(row, sort_keys=True))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(answers, fh, indent=2)
+        print(f"Answers written to {args.output}")
+
+    if args.expect:
+        with open(args.expect, "r", encoding="utf-8") as fh:
+            expected = json.load(fh)
+        for name, rows in expected.items():
+            got = answers.get(name)
+            if got != rows:
+                detail = "different rows" if got is not None and len(got) == len(rows) else f"{len(got or [])} row(s)"
+                print(f"❌ {name}: {detail}, expected {len(rows)} row(s)")
+                failed = True
+        if not failed:
+            print("✅ Every query returned the expected rows")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
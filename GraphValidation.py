@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Cross-hound edge validation.
+
+The hounds emit edges without checking their endpoints: Sigma tags may name techniques
+that MITRE does not define, MITRE "uses" relationships may point at malware that is not
+exported, and the same edge can come out of several sources. validate_graphs builds one
+node index over every graph, then rewrites each graph without dangling and duplicate
+edges, optionally keeping only one direction of edge pairs that say the same thing.
+"""
+
+import os
+
+from GraphDelta import edge_key
+from GraphWriter import GraphWriter, iter_graph_items, read_graph_metadata
+
+# kind -> kind of the reverse edge it duplicates: HasTTP(tactic -> technique) is
+# PartOf(technique -> tactic) read backwards. The saved queries only walk PartOf.
+REVERSE_EDGE_KINDS = {"HasTTP": "PartOf"}
+
+
+def build_node_index(paths):
+    """
+    Index the nodes of every graph in paths: {"ids": {id: set(kinds)}, "names": set(names),
+    "reverse": set((kind, start, end)) of the edges listed in REVERSE_EDGE_KINDS values}.
+    """
+    ids = {}
+    names = set()
+    reverse = set()
+    reverse_kinds = set(REVERSE_EDGE_KINDS.values())
+    for path in paths:
+        for node in iter_graph_items(path, "nodes"):
+            ids.setdefault(node["id"], set()).update(node.get("kinds") or [])
+            name = (node.get("properties") or {}).get("name")
+            if name:
+                names.add(name)
+        for edge in iter_graph_items(path, "edges"):
+            if edge.get("kind") in reverse_kinds:
+                reverse.add((edge["kind"], edge["start"].get("value"), edge["end"].get("value")))
+    return {"ids": ids, "names": names, "reverse": reverse}
+
+
+def endpoint_exists(ref, index):
+    """True when an edge endpoint matches an indexed node (and its kind, when the endpoint names one)."""
+    if (ref.get("match_by") or "id") == "name":
+        return ref.get("value") in index["names"]
+    kinds = index["ids"].get(ref.get("value"))
+    if kinds is None:
+        return False
+    return not ref.get("kind") or ref["kind"] in kinds
+
+
+def validate_graph(path, out_path, index, seen_edges, single_direction=False):
+    """
+    Copy the graph at path to out_path, dropping dangling edges, edges already in
+    seen_edges (updated in place, so duplicates across graphs are caught too) and, with
+    single_direction, edges whose REVERSE_EDGE_KINDS counterpart exists.
+    Returns {"nodes", "edges", "dangling", "duplicate", "redundant"} counts.
+    """
+    stats = {"nodes": 0, "edges": 0, "dangling": 0, "duplicate": 0, "redundant": 0}
+    with GraphWriter(out_path, metadata=read_graph_metadata(path)) as writer:
+        for node in iter_graph_items(path, "nodes"):
+            writer.add_node(node)
+        for edge in iter_graph_items(path, "edges"):
+            if not (endpoint_exists(edge["start"], index) and endpoint_exists(edge["end"], index)):
+                stats["dangling"] += 1
+                continue
+            key = edge_key(edge)
+            if key in seen_edges:
+                stats["duplicate"] += 1
+                continue
+            seen_edges.add(key)
+            reverse_kind = REVERSE_EDGE_KINDS.get(edge.get("kind"))
+            if single_direction and reverse_kind and \
+                    (reverse_kind, edge["end"].get("value"), edge["start"].get("value")) in index["reverse"]:
+                stats["redundant"] += 1
+                continue
+            writer.add_edge(edge)
+    stats["nodes"] = writer.node_count
+    stats["edges"] = writer.edge_count
+    return stats
+
+
+def validate_graphs(paths, out_dir, known_paths=(), single_direction=False):
+    """
+    Validate every graph in paths against the nodes of paths + known_paths (graphs that are
+    not rewritten, e.g. the playbooks). The cleaned graphs are written to out_dir under
+    their own names. Returns [(out_path, stats)] in the order of paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    index = build_node_index(list(paths) + [path for path in known_paths if os.path.exists(path)])
+    seen_edges = set()
+    results = []
+    for path in paths:
+        out_path = os.path.join(out_dir, os.path.basename(path))
+        results.append((out_path, validate_graph(path, out_path, index, seen_edges, single_direction)))
+    return results
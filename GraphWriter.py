@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Streaming OpenGraph writer shared by the hounds.
+
+Nodes are written to disk as soon as they are added; edges are spooled to a temporary
+file and appended after the nodes, so memory stays flat whatever the graph size.
+Output is compact JSON by default, indented with pretty=True, and gzip-compressed
+with gzip_output=True (or a path ending in .gz).
+"""
+
+import gzip
+import json
+import os
+import re
+import tempfile
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Characters read per chunk by the streaming JSON reader
+STREAM_CHUNK_SIZE = 1 << 20
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def graph_path(out_dir, filename, gzip_output=False):
+    """Return the output path of a graph file, with a .gz suffix when compressed."""
+    path = os.path.join(out_dir, filename)
+    return path + ".gz" if gzip_output else path
+
+
+def open_graph_file(path, mode="rt"):
+    """Open a graph file for reading, transparently handling gzip-compressed files."""
+    with open(path, "rb") as fh:
+        magic = fh.read(2)
+    if magic == GZIP_MAGIC:
+        return gzip.open(path, mode, encoding=None if "b" in mode else "utf-8")
+    return open(path, mode, encoding=None if "b" in mode else "utf-8")
+
+
+def load_graph(path):
+    """Load a (possibly gzip-compressed) graph file."""
+    with open_graph_file(path) as fh:
+        return json.load(fh)
+
+
+class JsonStreamReader:
+    """
+    Incremental JSON reader over a file handle.
+    Only the current chunk and the value being decoded are held in memory.
+    """
+
+    def __init__(self, fh, chunk_size=STREAM_CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read one more chunk, dropping what has already been consumed. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            self.pos = JSON_WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed JSON stream: expected one of {chars!r}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """Decode the next complete JSON value, reading more chunks as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A scalar cut at the chunk boundary (e.g. a number) may look complete
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self):
+        """Yield the elements of the array at the current position, one decoded value at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self.expect(",]") == "]":
+                return
+
+    def iter_keys(self):
+        """Yield the keys of the object at the current position; the caller must consume each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.decode()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def skip(self):
+        """Consume the next value without ever decoding a whole array or object at once."""
+        char = self.peek()
+        if char == "[":
+            for _ in self.iter_array():
+                pass
+        elif char == "{":
+            for _ in self.iter_keys():
+                self.skip()
+        else:
+            self.decode()
+
+
+def iter_graph_items(path, section):
+    """Stream the elements of graph.nodes or graph.edges (section) from a graph file."""
+    with open_graph_file(path) as fh:
+        reader = JsonStreamReader(fh)
+        for key in reader.iter_keys():
+            if key != "graph":
+                reader.skip()
+                continue
+            for graph_key in reader.iter_keys():
+                if graph_key == section:
+                    yield from reader.iter_array()
+                else:
+                    reader.skip()
+
+
+def read_graph_metadata(path):
+    """Return the top-level 'metadata' of a graph file, or None."""
+    with open_graph_file(path) as fh:
+        reader = JsonStreamReader(fh)
+        for key in reader.iter_keys():
+            if key == "metadata":
+                return reader.decode()
+            reader.skip()
+    return None
+
+
+class GraphWriter:
+    """
+    Write {"metadata": ..., "graph": {"nodes": [...], "edges": [...]}} incrementally.
+
+        with GraphWriter(path) as writer:
+            writer.add_node(node)
+            writer.add_edge(edge)
+
+    The file is written to a temporary path and moved into place on success,
+    so a failed run never leaves a truncated graph behind.
+    """
+
+    def __init__(self, path, pretty=False, gzip_output=None, metadata=None):
+        self.path = path
+        self.pretty = pretty
+        self.gzip_output = path.endswith(".gz") if gzip_output is None else gzip_output
+        self.metadata = metadata
+        self.node_count = 0
+        self.edge_count = 0
+        self.out = None
+        self.raw = None
+        self.edge_spool = None
+        self.tmp_path = None
+
+    def dumps(self, value, level):
+        if not self.pretty:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        text = json.dumps(value, ensure_ascii=False, indent=2)
+        return text.replace("\n", "\n" + "  " * level)
+
+    def newline(self, level):
+        return "\n" + "  " * level if self.pretty else ""
+
+    def __enter__(self):
+        out_dir = os.path.dirname(self.path) or "."
+        fd, self.tmp_path = tempfile.mkstemp(dir=out_dir, suffix=".part")
+        raw = os.fdopen(fd, "wb")
+        if self.gzip_output:
+            self.out = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+            self.raw = raw
+        else:
+            self.out = raw
+            self.raw = None
+        self.edge_spool = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+
+        self.write("{")
+        if self.metadata is not None:
+            self.write(self.newline(1) + '"metadata":' + (" " if self.pretty else "") + self.dumps(self.metadata, 1) + ",")
+        self.write(self.newline(1) + '"graph":' + (" " if self.pretty else "") + "{")
+        self.write(self.newline(2) + '"nodes":' + (" " if self.pretty else "") + "[")
+        return self
+
+    def write(self, text):
+        self.out.write(text.encode("utf-8"))
+
+    def add_node(self, node):
+        """Write one node; returns the number of characters it took."""
+        text = ("," if self.node_count else "") + self.newline(3) + self.dumps(node, 3)
+        self.write(text)
+        self.node_count += 1
+        return len(text)
+
+    def add_edge(self, edge):
+        """Spool one edge; returns the number of characters it took."""
+        text = ("," if self.edge_count else "") + self.newline(3) + self.dumps(edge, 3)
+        self.edge_spool.write(text)
+        self.edge_count += 1
+        return len(text)
+
+    def add_nodes(self, nodes):
+        for node in nodes:
+            self.add_node(node)
+
+    def add_edges(self, edges):
+        for edge in edges:
+            self.add_edge(edge)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.write((self.newline(2) if self.node_count else "") + "],")
+                self.write(self.newline(2) + '"edges":' + (" " if self.pretty else "") + "[")
+                self.edge_spool.seek(0)
+                for block in iter(lambda: self.edge_spool.read(1 << 16), ""):
+                    self.write(block)
+                self.write((self.newline(2) if self.edge_count else "") + "]")
+                self.write(self.newline(1) + "}" + self.newline(0) + "}" + ("\n" if self.pretty else ""))
+            self.out.close()
+            if self.raw is not None:
+                self.raw.close()
+        finally:
+            self.edge_spool.close()
+
+        if exc_type is None:
+            # mkstemp creates the file 0600; graphs are regular output files
+            os.chmod(self.tmp_path, 0o644)
+            os.replace(self.tmp_path, self.path)
+        elif os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        return False
+
+
+def write_graph(path, nodes, edges, pretty=False, gzip_output=None, metadata=None):
+    """Write already-collected nodes and edges with GraphWriter. Returns (node_count, edge_count)."""
+    with GraphWriter(path, pretty=pretty, gzip_output=gzip_output, metadata=metadata) as writer:
+        writer.add_nodes(nodes)
+        writer.add_edges(edges)
+    return writer.node_count, writer.edge_count
+
+
+def add_output_arguments(parser):
+    """Add the --pretty / --gzip output options shared by every hound."""
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the output graph (larger file); compact JSON is written by default",
+    )
+    parser.add_argument(
+        "--gzip",
+        dest="gzip_output",
+        action="store_true",
+        help="Write a gzip-compressed <name>.json.gz graph",
+    )
+
+
+def output_format(args):
+    """Short description of the output options, recorded with cached graphs."""
+    return "pretty" if args.pretty else "compact"
+
+
+def write_graph_shards(path, shard_dir, shard_bytes):
+    """
+    Split a graph file into node-only shards followed by edge-only shards of about
+    shard_bytes each (a shard is closed once it reaches the limit), streaming the source.
+    The source metadata is copied into every shard.
+    Returns (node_shard_paths, edge_shard_paths).
+    """
+    base = os.path.basename(path)
+    for suffix in (".gz", ".json"):
+        if base.endswith(suffix):
+            base = base[: -len(suffix)]
+    metadata = read_graph_metadata(path)
+
+    shards = {"nodes": [], "edges": []}
+    for section in ("nodes", "edges"):
+        writer = None
+        size = 0
+        try:
+            for item in iter_graph_items(path, section):
+                if writer is None:
+                    shard_path = os.path.join(shard_dir, f"{base}.{section}-{len(shards[section]) + 1:03d}.json")
+                    writer = GraphWriter(shard_path, metadata=metadata).__enter__()
+                    shards[section].append(shard_path)
+                    size = 0
+                size += writer.add_node(item) if section == "nodes" else writer.add_edge(item)
+                if size >= shard_bytes:
+                    writer.__exit__(None, None, None)
+                    writer = None
+        except BaseException as exc:
+            if writer is not None:
+                writer.__exit__(type(exc), exc, exc.__traceback__)
+            raise
+        if writer is not None:
+            writer.__exit__(None, None, None)
+
+    return shards["nodes"], shards["edges"]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Hound plugin API.
+
+Every data source subclasses Hound and registers itself with @register_hound. BloodSOCer
+loads the registry and runs hounds in-process (run_hound), or in worker processes when
+they must be isolated from each other (run_hound_worker), instead of launching a new
+interpreter per hound. Each hound module stays runnable on its own through hound_main.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+from Config import OUTPUT_DIR as DEFAULT_OUTPUT_DIR
+from Profiler import StageProfiler, forget_open_stages
+
+# Modules providing the built-in hounds; add a module here to register a new source
+HOUND_MODULES = ("MitreHound", "ARTHound", "SigmaHound")
+
+# name -> Hound instance, filled by @register_hound
+HOUND_REGISTRY = {}
+
+
+class Hound:
+    """
+    Base class of a hound. Subclasses set name, graph_file, description and kinds (the
+    node kinds they emit, see KindRegistry), add their options in add_arguments and do
+    the work in run(args), where args.output_dir is the directory the graph must be
+    written to and args.profiler a StageProfiler to wrap the hound's stages in.
+    """
+
+    name = None
+    graph_file = None
+    description = None
+    # every combination of node kinds written, primary kind first
+    kinds = ()
+
+    def add_arguments(self, parser):
+        """Add the hound's own options to parser."""
+
+    def run(self, args):
+        """Extract the data source and write the graph into args.output_dir."""
+        raise NotImplementedError
+
+    def build_parser(self):
+        parser = argparse.ArgumentParser(description=self.description)
+        parser.add_argument("--apikey", help="BloodHound API key (unused, accepted for BloodSOCer compatibility)")
+        parser.add_argument("--apiid", help="BloodHound API id (unused, accepted for BloodSOCer compatibility)")
+        parser.add_argument(
+            "--output-dir",
+            dest="output_dir",
+            default=DEFAULT_OUTPUT_DIR,
+            help="Directory the graph is written to (default: output/)",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Record wall/CPU time, peak memory and throughput per stage in <output-dir>/profile/<hound>.json",
+        )
+        parser.add_argument(
+            "--cprofile",
+            action="store_true",
+            help="With --profile, also dump a cProfile of the slowest stage next to the report",
+        )
+        self.add_arguments(parser)
+        return parser
+
+    def parse_args(self, argv=None, output_dir=None):
+        args = self.build_parser().parse_args(argv)
+        if output_dir is not None:
+            args.output_dir = output_dir
+        os.makedirs(args.output_dir, exist_ok=True)
+        args.profiler = StageProfiler(enabled=args.profile, cprofile=args.cprofile)
+        return args
+
+    def execute(self, args):
+        """Run the hound and write its profile report when --profile is on."""
+        try:
+            self.run(args)
+        finally:
+            args.profiler.write_report(profile_path(args.output_dir, self.name))
+
+
+def profile_path(output_dir, name):
+    """Where the --profile report of name (a hound or "bloodsocer") is written."""
+    return os.path.join(output_dir, "profile", f"{name}.json")
+
+
+def register_hound(cls):
+    """Class decorator: register one instance of a Hound subclass under its name."""
+    HOUND_REGISTRY[cls.name] = cls()
+    return cls
+
+
+def load_hounds():
+    """Import the hound modules so they register themselves. Returns the registry."""
+    for module in HOUND_MODULES:
+        importlib.import_module(module)
+    return HOUND_REGISTRY
+
+
+def get_hound(name):
+    load_hounds()
+    try:
+        return HOUND_REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"unknown hound '{name}' (known: {', '.join(sorted(HOUND_REGISTRY))})") from None
+
+
+def exit_status(code):
+    """Map a SystemExit code to a process exit status."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code)
+    return 1
+
+
+def run_hound(name, argv=None, output_dir=None):
+    """Run a hound in this process. Returns its exit status; errors are reported, not raised."""
+    hound = get_hound(name)
+    try:
+        hound.execute(hound.parse_args(argv if argv is not None else [], output_dir=output_dir))
+    except SystemExit as exc:
+        return exit_status(exc.code)
+    except Exception as exc:
+        print(f"❌ {name}: {exc}")
+        return 1
+    return 0
+
+
+class PrefixedStream:
+    """Text stream wrapper that prefixes every line and writes it out in one piece."""
+
+    def __init__(self, stream, prefix):
+        self.stream = stream
+        self.prefix = prefix
+        self.pending = ""
+
+    def write(self, text):
+        lines = (self.pending + text).split("\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self.stream.write(f"{self.prefix}{line}\n")
+        if lines:
+            self.stream.flush()
+        return len(text)
+
+    def flush(self):
+        if self.pending:
+            self.stream.write(self.prefix + self.pending)
+            self.pending = ""
+        self.stream.flush()
+
+
+def run_hound_worker(name, argv=None, output_dir=None):
+    """
+    Pool entry point: run a hound with its output prefixed by its name and flushed
+    line by line, so parallel hounds stay readable. Returns its exit status.
+    """
+    forget_open_stages()
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = PrefixedStream(stdout, f"[{name}] ")
+    sys.stderr = PrefixedStream(stderr, f"[{name}] ")
+    try:
+        return run_hound(name, argv, output_dir)
+    finally:
+        sys.stdout.flush()
+        sys.stdout, sys.stderr = stdout, stderr
+
+
+def hound_main(name):
+    """Entry point of a standalone hound script (the calling module has already registered it)."""
+    hound = HOUND_REGISTRY[name]
+    hound.execute(hound.parse_args())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Content-addressed extraction cache shared by the hounds.
+
+Each hound fingerprints its inputs (STIX file hash, git tree hash of the rules/atomics folder)
+and records it together with its extractor version next to the graph it produced.
+When both match on the next run, the previous graph is reused and parsing is skipped.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+
+from GraphWriter import load_graph
+
+CACHE_DIRNAME = ".cache"
+HASH_BLOCK_SIZE = 1 << 16
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def git_tree_hash(repo_dir, subpath):
+    """
+    Return the git tree hash of subpath at HEAD, or None when it cannot be trusted
+    (not a git checkout, git missing, or uncommitted changes under subpath).
+    """
+    try:
+        tree = subprocess.run(
+            ["git", "-C", repo_dir, "rev-parse", f"HEAD:{subpath}"],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "-C", repo_dir, "status", "--porcelain", "--", subpath],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    if dirty or not tree:
+        return None
+    return tree
+
+
+def cache_record_path(out_path):
+    out_dir, name = os.path.split(out_path)
+    return os.path.join(out_dir, CACHE_DIRNAME, name + ".fingerprint.json")
+
+
+def read_cache_record(out_path):
+    try:
+        with open(cache_record_path(out_path), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def cached_graph_valid(out_path, fingerprint, extractor_version):
+    """
+    True if out_path was produced from the same inputs by the same extractor version
+    and has not been modified since.
+    """
+    if not fingerprint or not os.path.isfile(out_path):
+        return False
+
+    record = read_cache_record(out_path)
+    if record.get("fingerprint") != fingerprint or record.get("extractor_version") != extractor_version:
+        return False
+    return record.get("output_sha256") == file_sha256(out_path)
+
+
+def store_cache_record(out_path, fingerprint, extractor_version):
+    """Record the fingerprint and extractor version that produced out_path."""
+    if not fingerprint:
+        return
+
+    record_path = cache_record_path(out_path)
+    os.makedirs(os.path.dirname(record_path), exist_ok=True)
+    record = {
+        "fingerprint": fingerprint,
+        "extractor_version": extractor_version,
+        "output_sha256": file_sha256(out_path),
+    }
+    tmp_path = record_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(record, fh, indent=2)
+    os.replace(tmp_path, record_path)
+
+
+def git_head_commit(repo_dir):
+    """Return the commit checked out in repo_dir, or None if it cannot be determined."""
+    try:
+        commit = subprocess.run(
+            ["git", "-C", repo_dir, "rev-parse", "HEAD"],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit or None
+
+
+def git_changed_files(repo_dir, since_commit, subpath):
+    """
+    Return (changed, deleted) paths under subpath between since_commit and HEAD,
+    relative to repo_dir. Renames are reported as a delete plus an add.
+    Returns None when git cannot compute the diff (unknown commit, shallow clone...).
+    """
+    try:
+        output = subprocess.run(
+            ["git", "-C", repo_dir, "diff", "--name-status", "--no-renames", since_commit, "HEAD", "--", subpath],
+            check=True, capture_output=True, text=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    changed = []
+    deleted = []
+    for line in output.splitlines():
+        status, _, path = line.partition("\t")
+        if not path:
+            continue
+        if status.startswith("D"):
+            deleted.append(path)
+        else:
+            changed.append(path)
+    return changed, deleted
+
+
+def state_path(out_path):
+    out_dir, name = os.path.split(out_path)
+    return os.path.join(out_dir, CACHE_DIRNAME, name + ".state.json")
+
+
+def read_hound_state(out_path):
+    """Return the incremental-refresh state saved for out_path ({} if missing or unreadable)."""
+    try:
+        with open(state_path(out_path), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_hound_state(out_path, state):
+    path = state_path(out_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp_path, path)
+
+
+def load_previous_graph(out_path, state, extractor_version):
+    """
+    Return the previous graph if it can be patched incrementally: the state was written by
+    this extractor version and the graph on disk is still the one that state describes.
+    """
+    if state.get("extractor_version") != extractor_version:
+        return None
+    if not os.path.isfile(out_path) or file_sha256(out_path) != state.get("output_sha256"):
+        return None
+    try:
+        return load_graph(out_path)
+    except (OSError, ValueError):
+        return None
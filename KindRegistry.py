@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Registry of the node kinds BloodSOCer puts in BloodHound and of their custom icons.
+
+KIND_ICONS holds the icon of every kind that is shown in the UI. gather_kinds collects the
+kinds the hounds declare (Hound.kinds) and the ones their graphs actually contain, so a
+kind that only comes along as a secondary kind (Mitre, Windows, Atomic, ...) is still
+registered, with DEFAULT_ICON: BloodHound may draw a node with the icon of any of its
+kinds, so a secondary kind must not look like a primary one. diff_custom_types compares
+the result with the custom types defined on the server.
+"""
+
+import os
+
+from GraphWriter import iter_graph_items, read_graph_metadata
+
+KIND_ICONS = {
+    "Rule": {"type": "font-awesome", "name": "burst", "color": "#03CEFC"},
+    "Tactic": {"type": "font-awesome", "name": "layer-group", "color": "#D67500"},
+    "Technique": {"type": "font-awesome", "name": "newspaper", "color": "#EFFC00"},
+    "Software": {"type": "font-awesome", "name": "microchip", "color": "#0BD600"},
+    "TA_Group": {"type": "font-awesome", "name": "user-secret", "color": "#A00505"},
+    "Playbook": {"type": "font-awesome", "name": "clipboard-list", "color": "#8400FF"},
+    "ART": {"type": "font-awesome", "name": "radiation", "color": "#D6001C"},
+}
+
+# Icon of every kind that is not in KIND_ICONS
+DEFAULT_ICON = {"type": "font-awesome", "name": "circle", "color": "#9E9E9E"}
+
+
+def gather_kinds(paths, declared=()):
+    """
+    Kinds of the declared kind combinations, then of the nodes in the graphs at paths
+    (missing files are skipped), in the order they are first seen.
+    Source kinds (metadata.source_kind) are left out: BloodHound manages those itself.
+    """
+    kinds = {}
+    for node_kinds in declared:
+        kinds.update(dict.fromkeys(node_kinds))
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        source_kind = (read_graph_metadata(path) or {}).get("source_kind")
+        for node in iter_graph_items(path, "nodes"):
+            for kind in node.get("kinds") or []:
+                if kind != source_kind:
+                    kinds.setdefault(kind)
+    return list(kinds)
+
+
+def build_custom_types(paths, declared=()):
+    """
+    {kind: {"icon": ...}} for every kind in KIND_ICONS and every kind gather_kinds finds,
+    the latter with DEFAULT_ICON.
+    """
+    custom_types = {kind: {"icon": icon} for kind, icon in KIND_ICONS.items()}
+    for kind in gather_kinds(paths, declared):
+        custom_types.setdefault(kind, {"icon": DEFAULT_ICON})
+    return custom_types
+
+
+def server_custom_types(data):
+    """
+    Normalize the "data" of GET /api/v2/custom-nodes to {kind: config}. Accepts the list of
+    {"kindName", "config"} entries BloodHound returns as well as a {kind: config} mapping.
+    """
+    if isinstance(data, dict):
+        return dict(data)
+    return {entry["kindName"]: entry.get("config") or {} for entry in data or [] if entry.get("kindName")}
+
+
+def diff_custom_types(wanted, existing):
+    """Split wanted {kind: config} into (missing, changed) against the server's existing {kind: config}."""
+    missing = {kind: config for kind, config in wanted.items() if kind not in existing}
+    changed = {
+        kind: config
+        for kind, config in wanted.items()
+        if kind in existing and existing[kind].get("icon") != config["icon"]
+    }
+    return missing, changed
@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 
+import hashlib
 import json
 import re
-import urllib.error
-import urllib.request
+import sys
+import tempfile
 from datetime import datetime
-from BloodSOCer import OUTPUT_DIR
+from GraphWriter import (
+    STREAM_CHUNK_SIZE,
+    GraphWriter,
+    JsonStreamReader,
+    add_output_arguments,
+    graph_path,
+    output_format,
+)
+from Hound import Hound, hound_main, register_hound
+from HoundCache import cached_graph_valid, file_sha256, store_cache_record
 import os
 
 GITHUB_COMMITS_URL = (
@@ -18,15 +28,25 @@ RESOURCES_DIR = os.path.join(os.path.dirname(__file__), "ressources")
 os.makedirs(RESOURCES_DIR, exist_ok=True)
 OUTPUT_FILE = "mitrehound_graph.json"
 
+# Bump when the extraction logic changes so cached graphs are regenerated
+EXTRACTOR_VERSION = "2"
+
+# Download cache: metadata (ETag, Last-Modified, sha256) is stored next to each cached bundle
+CACHE_META_SUFFIX = ".meta.json"
+CACHED_BUNDLE_RE = re.compile(r"^enterprise-attack-(\d+(?:\.\d+)*)\.json$")
+DOWNLOAD_BLOCK_SIZE = 1 << 16
+
 
-def latest_version_info():
+def latest_version_info(commits_url=GITHUB_COMMITS_URL, stix_url=RAW_BASE_URL, cache_dir=RESOURCES_DIR):
     """
     Fetch the latest enterprise-attack.json commit message to derive the version.
     Returns (download_url, version_string, filename).
     """
+    import urllib.request
+
     version = "latest"
     try:
-        req = urllib.request.Request(GITHUB_COMMITS_URL, headers={"User-Agent": "BloodSOCer"})
+        req = urllib.request.Request(commits_url, headers={"User-Agent": "BloodSOCer"})
         with urllib.request.urlopen(req, timeout=30) as resp:
             data = json.loads(resp.read().decode("utf-8"))
             if data:
@@ -39,272 +59,496 @@ def latest_version_info():
         pass
 
     filename = f"enterprise-attack-{version}.json" if version != "latest" else "enterprise-attack-latest.json"
-    return RAW_BASE_URL, version, os.path.join(RESOURCES_DIR, filename)
+    return stix_url, version, os.path.join(cache_dir, filename)
 
 
-def download_file():
-    url, version, path = latest_version_info()
-    print(f"⬇️  Downloading MITRE Enterprise STIX JSON (version: {version})...")
+def read_cache_meta(path):
+    """Return the metadata stored next to a cached bundle ({} if missing or unreadable)."""
     try:
-        urllib.request.urlretrieve(url, path)
-        print(f"✅ Downloaded to '{path}'")
-    except urllib.error.URLError as exc:
-        raise RuntimeError(f"Failed to download MITRE data: {exc}") from exc
-    return path
+        with open(path + CACHE_META_SUFFIX, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
 
-def extract_tactics(mitre_data):
-    tactics = []
-    for obj in mitre_data.get("objects", []):
-        if obj.get("type") != "x-mitre-tactic":
-            continue
 
-        ext_ref = next((ref for ref in obj.get("external_references", []) if ref.get("source_name") == "mitre-attack"), None)
-        if not ext_ref:
-            continue
+def write_cache_meta(path, meta):
+    tmp_path = path + CACHE_META_SUFFIX + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=2)
+    os.replace(tmp_path, path + CACHE_META_SUFFIX)
 
-        tactic_id = ext_ref.get("external_id")
-        reference = ext_ref.get("url") or f"https://attack.mitre.org/tactics/{tactic_id}/"
-        created = obj.get("created", "").replace("Z", "").strip()
-        modified = obj.get("modified", "").replace("Z", "").strip()
-
-        node = {
-            "id": tactic_id,
-            "kinds": ["Tactic", "Mitre"],
-            "properties": {
-                "tid": tactic_id,
-                "name": obj.get("name", ""),
-                "reference": reference,
-                "created": created,
-                "lastmodified": modified,
-                "description": obj.get("description", "")
-            }
-        }
-        tactics.append(node)
-    return tactics
 
-def extract_techniques(mitre_data):
-    nodes = []
-    for obj in mitre_data.get("objects", []):
-        if obj.get("type") != "attack-pattern":
-            continue
+def cached_bundle_valid(path, meta):
+    """A cached bundle is usable only if it exists and still matches its recorded checksum."""
+    if not os.path.isfile(path) or not meta.get("sha256"):
+        return False
+    return file_sha256(path) == meta["sha256"]
 
-        external_refs = obj.get("external_references", [])
-        mitre_ref = next((ref for ref in external_refs if ref.get("source_name") == "mitre-attack"), None)
-        if not mitre_ref:
-            continue
 
-        ext_id = mitre_ref.get("external_id")
-        if not ext_id:
-            continue
+def newest_cached_bundle(cache_dir=RESOURCES_DIR):
+    """
+    Return the path of the highest-versioned cached enterprise-attack bundle,
+    falling back to enterprise-attack-latest.json. Returns None if nothing is cached.
+    """
+    versions = []
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return None
 
-        tid_match = re.match(r"(T\d{4})(?:\.(\d{3}))?", ext_id)
-        if not tid_match:
-            continue
+    for name in names:
+        match = CACHED_BUNDLE_RE.match(name)
+        if match:
+            versions.append((tuple(int(part) for part in match.group(1).split(".")), name))
 
-        tid = tid_match.group(1)
-        subid = tid_match.group(2) or ""
-
-        reference = mitre_ref.get("url") or f"https://attack.mitre.org/techniques/{ext_id}/"
-
-        node = {
-            "id": ext_id,
-            "kinds": ["Technique", "Mitre"],
-            "properties": {
-                "tid": tid,
-                "subid": subid,
-                "name": obj.get("name"),
-                "displayname": ext_id,
-                "reference": reference,
-                "description": obj.get("description", "")
-            }
-        }
-        nodes.append(node)
-    return nodes
+    if versions:
+        return os.path.join(cache_dir, max(versions)[1])
 
+    latest = os.path.join(cache_dir, "enterprise-attack-latest.json")
+    return latest if os.path.isfile(latest) else None
 
-def extract_tools(mitre_data):
-    tools = []
 
-    for obj in mitre_data.get("objects", []):
-        if obj.get("type") != "tool":
-            continue
+def fetch_to_cache(url, path, meta):
+    """
+    Download url to path, revalidating with ETag / Last-Modified from meta.
+    The body is streamed to a temporary file, checked against Content-Length,
+    hashed and atomically moved into place. Returns the new metadata, or meta unchanged on 304.
+    """
+    import urllib.error
+    import urllib.request
 
-        # Get MITRE external ID
-        external_refs = obj.get("external_references", [])
-        mitre_ref = next((ref for ref in external_refs if ref.get("source_name") == "mitre-attack"), None)
-        if not mitre_ref:
-            continue
+    headers = {"User-Agent": "BloodSOCer"}
+    if os.path.isfile(path):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
 
-        ext_id = mitre_ref.get("external_id")
-        if not ext_id:
-            continue
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        resp = urllib.request.urlopen(req, timeout=120)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304:
+            return meta
+        raise
 
-        reference = mitre_ref.get("url") or f"https://attack.mitre.org/software/{ext_id}/"
-
-        def format_date(date_str):
-            try:
-                dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                return dt.strftime("%d %B %Y")
-            except Exception:
-                return ""
-
-        node = {
-            "id": ext_id,
-            "kinds": [
-                "Software",
-                "Mitre"
-            ],
-            "properties": {
-                "tid": ext_id,
-                "name": obj.get("name"),
-                "reference": reference,
-                "created": format_date(obj.get("created", "")),
-                "lastmodified": format_date(obj.get("modified", ""))
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with resp, os.fdopen(tmp_fd, "wb") as out:
+            for block in iter(lambda: resp.read(DOWNLOAD_BLOCK_SIZE), b""):
+                out.write(block)
+                digest.update(block)
+                size += len(block)
+
+            expected = resp.headers.get("Content-Length")
+            if expected is not None and int(expected) != size:
+                raise RuntimeError(f"truncated download ({size} of {expected} bytes)")
+
+            new_meta = {
+                "url": url,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "sha256": digest.hexdigest(),
+                "size": size,
             }
-        }
+        # mkstemp creates the file 0600; the cached bundle is a regular shared file
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-        tools.append(node)
+    write_cache_meta(path, new_meta)
+    return new_meta
 
-    return tools
 
-def extract_intrusion_sets(mitre_data):
-    groups = []
+def download_file(offline=False, commits_url=GITHUB_COMMITS_URL, stix_url=RAW_BASE_URL, cache_dir=RESOURCES_DIR):
+    """
+    Return the path of an up-to-date enterprise-attack bundle, using the local cache when possible.
 
-    for obj in mitre_data.get("objects", []):
-        if obj.get("type") != "intrusion-set":
-            continue
+    - offline: never touch the network, use the newest cached bundle.
+    - a known version that is already cached (and passes its checksum) is reused without any transfer.
+    - otherwise the file is revalidated with ETag / Last-Modified and only downloaded when changed.
+    """
+    # urllib.request pulls in http.client, email and ssl; only import it when a command may download
+    import urllib.error
 
-        # Get MITRE external ID
-        external_refs = obj.get("external_references", [])
-        mitre_ref = next((ref for ref in external_refs if ref.get("source_name") == "mitre-attack"), None)
-        if not mitre_ref:
-            continue
+    if offline:
+        path = newest_cached_bundle(cache_dir)
+        if not path:
+            raise RuntimeError(f"Offline mode requested but no cached MITRE bundle found in '{cache_dir}'")
+        print(f"📦 Offline mode: using cached MITRE bundle '{path}'")
+        return path
 
-        ext_id = mitre_ref.get("external_id")
-        if not ext_id:
-            continue
+    url, version, path = latest_version_info(commits_url, stix_url, cache_dir)
+    meta = read_cache_meta(path)
 
-        reference = mitre_ref.get("url") or f"https://attack.mitre.org/groups/{ext_id}/"
-
-        node = {
-            "id": ext_id,
-            "kinds": [
-                "TA_Group",
-                "Mitre"
-            ],
-            "properties": {
-                "tid": ext_id,
-                "name": obj.get("name"),
-                "reference": reference
-            }
-        }
+    if version != "latest" and cached_bundle_valid(path, meta):
+        print(f"📦 MITRE Enterprise STIX JSON version {version} already cached at '{path}'")
+        return path
 
-        groups.append(node)
+    print(f"⬇️  Downloading MITRE Enterprise STIX JSON (version: {version})...")
+    try:
+        new_meta = fetch_to_cache(url, path, meta)
+    except (urllib.error.URLError, OSError, RuntimeError) as exc:
+        cached = newest_cached_bundle(cache_dir)
+        if cached:
+            print(f"⚠️ Download failed ({exc}), falling back to cached bundle '{cached}'")
+            return cached
+        raise RuntimeError(f"Failed to download MITRE data: {exc}") from exc
 
-    return groups
+    if new_meta is meta:
+        if not cached_bundle_valid(path, meta):
+            # The server says nothing changed but our copy is corrupt: fetch it again unconditionally
+            new_meta = fetch_to_cache(url, path, {})
+        else:
+            print(f"✅ Cached copy at '{path}' is up to date (not modified)")
+            return path
 
-def extract_edges(mitre_data):
-    edges = []
-    stix_id_to_external_id = {}
-    tactic_shortname_to_id = {}
+    print(f"✅ Downloaded to '{path}' (sha256 {new_meta['sha256'][:12]}…)")
+    return path
 
-    for obj in mitre_data.get("objects", []):
-        if obj["type"] in ["attack-pattern", "tool", "intrusion-set"]:
-            for ref in obj.get("external_references", []):
-                if ref.get("source_name") == "mitre-attack":
-                    stix_id_to_external_id[obj["id"]] = ref.get("external_id")
+# Registry of per-type handlers used by the single extraction pass: {stix_type: handler(obj, entry, state)}
+STIX_HANDLERS = {}
 
-        if obj["type"] == "x-mitre-tactic":
-            for ref in obj.get("external_references", []):
-                if ref.get("source_name") == "mitre-attack":
-                    tactic_id = ref.get("external_id")
-                    tactic_shortname_to_id[obj.get("x_mitre_shortname")] = tactic_id
-                    stix_id_to_external_id[obj["id"]] = tactic_id
+# Only these STIX types can be the endpoint of a relationship edge
+EDGE_ENDPOINT_TYPES = ("attack-pattern", "tool", "intrusion-set", "x-mitre-tactic")
 
-    for obj in mitre_data.get("objects", []):
-        if obj.get("type") != "relationship":
-            continue
 
-        rel_type = obj.get("relationship_type")
-        source_id = stix_id_to_external_id.get(obj.get("source_ref"))
-        target_id = stix_id_to_external_id.get(obj.get("target_ref"))
+def stix_handler(stix_type):
+    """
+    Register a handler for a STIX object type.
+    Adding support for a new type only needs a new decorated function, never another pass.
+    """
+    def register(func):
+        STIX_HANDLERS[stix_type] = func
+        return func
+    return register
 
-        if not source_id or not target_id:
-            continue
 
-        src_obj = next((o for o in mitre_data["objects"] if o["id"] == obj["source_ref"]), None)
-        tgt_obj = next((o for o in mitre_data["objects"] if o["id"] == obj["target_ref"]), None)
+def mitre_reference(obj):
+    """Return the 'mitre-attack' external reference of a STIX object, or None."""
+    return next((ref for ref in obj.get("external_references", []) if ref.get("source_name") == "mitre-attack"), None)
 
-        if not src_obj or not tgt_obj:
-            continue
 
-        if rel_type == "uses":
-            if src_obj.get("type") in ["tool", "malware"] and tgt_obj.get("type") == "attack-pattern":
-                edges.append({"kind": "Exploits", "start": {"value": source_id, "match_by": "id"}, "end": {"value": target_id, "match_by": "id"}})
-            elif src_obj.get("type") == "intrusion-set":
-                edges.append({"kind": "Uses", "start": {"value": source_id, "match_by": "id"}, "end": {"value": target_id, "match_by": "id"}})
+def index_entry(obj):
+    """
+    Build the STIX index entry for an object: type, MITRE external id/url,
+    tactic shortname and kill-chain phases. The 'mitre-attack' reference is scanned only here.
+    """
+    mitre_ref = mitre_reference(obj) or {}
+    return {
+        "type": obj.get("type"),
+        "external_id": mitre_ref.get("external_id"),
+        "url": mitre_ref.get("url"),
+        "shortname": obj.get("x_mitre_shortname"),
+        "kill_chain_phases": obj.get("kill_chain_phases", []),
+    }
 
-    for obj in mitre_data.get("objects", []):
-        if obj.get("type") != "attack-pattern":
-            continue
 
-        external_refs = obj.get("external_references", [])
-        mitre_ref = next((ref for ref in external_refs if ref.get("source_name") == "mitre-attack"), None)
-        if not mitre_ref:
+def new_extraction_state(writer=None):
+    """
+    State shared by the handlers during one extraction pass.
+    'index' maps STIX id -> index entry, 'relationships' holds (type, source_ref, target_ref)
+    tuples resolved once every object has been seen. With a GraphWriter, nodes and edges
+    are streamed to it instead of being collected in 'nodes' / 'edges'.
+    """
+    return {"nodes": [], "edges": [], "index": {}, "relationships": [], "writer": writer}
+
+
+def emit_node(state, node):
+    if state["writer"] is not None:
+        state["writer"].add_node(node)
+    else:
+        state["nodes"].append(node)
+
+
+def emit_edge(state, edge):
+    if state["writer"] is not None:
+        state["writer"].add_edge(edge)
+    else:
+        state["edges"].append(edge)
+
+
+def process_stix_object(obj, state):
+    """Index one STIX object and route it to the handler registered for its type."""
+    stix_type = obj.get("type")
+    entry = None
+    if stix_type != "relationship" and obj.get("id"):
+        entry = index_entry(obj)
+        if entry["external_id"]:
+            state["index"][obj["id"]] = entry
+
+    handler = STIX_HANDLERS.get(stix_type)
+    if handler:
+        handler(obj, entry, state)
+
+
+def format_date(date_str):
+    try:
+        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        return dt.strftime("%d %B %Y")
+    except Exception:
+        return ""
+
+
+@stix_handler("x-mitre-tactic")
+def handle_tactic(obj, entry, state):
+    if not entry or not entry["external_id"]:
+        return
+
+    tactic_id = entry["external_id"]
+    reference = entry["url"] or f"https://attack.mitre.org/tactics/{tactic_id}/"
+    created = obj.get("created", "").replace("Z", "").strip()
+    modified = obj.get("modified", "").replace("Z", "").strip()
+
+    emit_node(state, {
+        "id": tactic_id,
+        "kinds": ["Tactic", "Mitre"],
+        "properties": {
+            "tid": tactic_id,
+            "name": obj.get("name", ""),
+            "reference": reference,
+            "created": created,
+            "lastmodified": modified,
+            "description": obj.get("description", "")
+        }
+    })
+
+
+@stix_handler("attack-pattern")
+def handle_technique(obj, entry, state):
+    if not entry or not entry["external_id"]:
+        return
+
+    ext_id = entry["external_id"]
+    tid_match = re.match(r"(T\d{4})(?:\.(\d{3}))?", ext_id)
+    if not tid_match:
+        return
+
+    tid = tid_match.group(1)
+    subid = tid_match.group(2) or ""
+
+    reference = entry["url"] or f"https://attack.mitre.org/techniques/{ext_id}/"
+
+    emit_node(state, {
+        "id": ext_id,
+        "kinds": ["Technique", "Mitre"],
+        "properties": {
+            "tid": tid,
+            "subid": subid,
+            "name": obj.get("name"),
+            "displayname": ext_id,
+            "reference": reference,
+            "description": obj.get("description", "")
+        }
+    })
+
+
+@stix_handler("tool")
+def handle_tool(obj, entry, state):
+    if not entry or not entry["external_id"]:
+        return
+
+    ext_id = entry["external_id"]
+    reference = entry["url"] or f"https://attack.mitre.org/software/{ext_id}/"
+
+    emit_node(state, {
+        "id": ext_id,
+        "kinds": [
+            "Software",
+            "Mitre"
+        ],
+        "properties": {
+            "tid": ext_id,
+            "name": obj.get("name"),
+            "reference": reference,
+            "created": format_date(obj.get("created", "")),
+            "lastmodified": format_date(obj.get("modified", ""))
+        }
+    })
+
+
+@stix_handler("intrusion-set")
+def handle_intrusion_set(obj, entry, state):
+    if not entry or not entry["external_id"]:
+        return
+
+    ext_id = entry["external_id"]
+    reference = entry["url"] or f"https://attack.mitre.org/groups/{ext_id}/"
+
+    emit_node(state, {
+        "id": ext_id,
+        "kinds": [
+            "TA_Group",
+            "Mitre"
+        ],
+        "properties": {
+            "tid": ext_id,
+            "name": obj.get("name"),
+            "reference": reference
+        }
+    })
+
+
+@stix_handler("relationship")
+def handle_relationship(obj, entry, state):
+    # Endpoints may appear later in the bundle, so resolution is deferred to resolve_edges()
+    state["relationships"].append((obj.get("relationship_type"), obj.get("source_ref"), obj.get("target_ref")))
+
+
+def resolve_edges(state):
+    """Turn the deferred relationships and indexed techniques into edges once the pass is done."""
+    index = state["index"]
+    tactic_shortname_to_id = {
+        entry["shortname"]: entry["external_id"]
+        for entry in index.values()
+        if entry["type"] == "x-mitre-tactic"
+    }
+
+    for rel_type, source_ref, target_ref in state["relationships"]:
+        src = index.get(source_ref)
+        tgt = index.get(target_ref)
+
+        if not src or not tgt:
+            continue
+        if src["type"] not in EDGE_ENDPOINT_TYPES or tgt["type"] not in EDGE_ENDPOINT_TYPES:
             continue
 
-        ext_id = mitre_ref.get("external_id")
-        if not ext_id:
+        source_id = src["external_id"]
+        target_id = tgt["external_id"]
+
+        if rel_type == "uses":
+            if src["type"] in ["tool", "malware"] and tgt["type"] == "attack-pattern":
+                emit_edge(state, {"kind": "Exploits", "start": {"value": source_id, "match_by": "id"}, "end": {"value": target_id, "match_by": "id"}})
+            elif src["type"] == "intrusion-set":
+                emit_edge(state, {"kind": "Uses", "start": {"value": source_id, "match_by": "id"}, "end": {"value": target_id, "match_by": "id"}})
+
+    for entry in index.values():
+        if entry["type"] != "attack-pattern":
             continue
 
+        ext_id = entry["external_id"]
         is_sub = "." in ext_id
         if is_sub:
             parent_id = ext_id.split(".")[0]
-            edges.append({"kind": "SubTechniqueOf", "start": {"value": ext_id, "match_by": "id"}, "end": {"value": parent_id, "match_by": "id"}})
+            emit_edge(state, {"kind": "SubTechniqueOf", "start": {"value": ext_id, "match_by": "id"}, "end": {"value": parent_id, "match_by": "id"}})
             continue  # Skip tactic linkage for sub-techniques
 
-        for phase in obj.get("kill_chain_phases", []):
+        for phase in entry["kill_chain_phases"]:
             if phase.get("kill_chain_name") != "mitre-attack":
                 continue
             tactic_id = tactic_shortname_to_id.get(phase.get("phase_name"))
             if not tactic_id:
                 continue
 
-            edges.append({"kind": "PartOf", "start": {"value": ext_id, "match_by": "id"}, "end": {"value": tactic_id, "match_by": "id"}})
-            edges.append({"kind": "HasTTP", "start": {"value": tactic_id, "match_by": "id"}, "end": {"value": ext_id, "match_by": "id"}})
+            emit_edge(state, {"kind": "PartOf", "start": {"value": ext_id, "match_by": "id"}, "end": {"value": tactic_id, "match_by": "id"}})
+            emit_edge(state, {"kind": "HasTTP", "start": {"value": tactic_id, "match_by": "id"}, "end": {"value": ext_id, "match_by": "id"}})
 
-    return edges
 
+def extract_graph(objects, writer=None):
+    """
+    Extract nodes and edges from an iterable of STIX objects in a single pass.
+    Returns (nodes, edges); both are empty when they were streamed to `writer`.
+    """
+    state = new_extraction_state(writer)
+    for obj in objects:
+        process_stix_object(obj, state)
+    resolve_edges(state)
+    return state["nodes"], state["edges"]
 
-def main():
-    try:
-        input_file = download_file()
-
-        with open(input_file, "r", encoding="utf-8") as f:
-            mitre_data = json.load(f)
-
-        nodes = extract_tactics(mitre_data)
-        nodes += extract_techniques(mitre_data)
-        nodes += extract_tools(mitre_data)
-        nodes += extract_intrusion_sets(mitre_data)
-
-        edges = extract_edges(mitre_data)
-
-        output_data = {
-            "graph": {
-                "nodes": nodes,
-                "edges": edges
-            }
-        }
-
-        out_path = os.path.join(OUTPUT_DIR, "mitrehound_graph.json")
-        with open(out_path, "w", encoding="utf-8") as fh:
-            json.dump(output_data, fh, ensure_ascii=False, indent=2)
 
-        print(f"✅ Extracted {len(nodes)} nodes to '{out_path}'")
+def iter_stix_objects(path, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield STIX objects one at a time from the top-level 'objects' array of a bundle,
+    without decoding the whole file. Other top-level keys are skipped.
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        reader = JsonStreamReader(fh, chunk_size)
+        for key in reader.iter_keys():
+            if key == "objects":
+                yield from reader.iter_array()
+            else:
+                reader.skip()
+
+
+def load_stix_objects(path):
+    """Load the whole bundle with json.load and return its objects (non-streaming mode)."""
+    with open(path, "r", encoding="utf-8") as f:
+        mitre_data = json.load(f)
+    return mitre_data.get("objects", [])
+
+
+@register_hound
+class MitreAttackHound(Hound):
+    name = "mitre"
+    graph_file = OUTPUT_FILE
+    description = "Extract MITRE ATT&CK Enterprise data to a BloodHound OpenGraph file."
+    kinds = (("Tactic", "Mitre"), ("Technique", "Mitre"), ("Software", "Mitre"), ("TA_Group", "Mitre"))
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Do not contact GitHub; use the newest cached bundle in ressources/",
+        )
+        parser.add_argument(
+            "--stix-url",
+            default=RAW_BASE_URL,
+            help="URL of the enterprise-attack.json bundle (e.g. a local mirror)",
+        )
+        parser.add_argument(
+            "--commits-url",
+            default=GITHUB_COMMITS_URL,
+            help="GitHub commits API URL used to derive the bundle version",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-extract even if the cached graph matches the current bundle",
+        )
+        add_output_arguments(parser)
+        parser.add_argument(
+            "--load-all",
+            dest="load_all",
+            action="store_true",
+            help="Decode the whole STIX bundle in memory instead of streaming its objects",
+        )
+
+    def run(self, args):
+        profiler = args.profiler
+        try:
+            with profiler.stage("download"):
+                input_file = download_file(offline=args.offline, commits_url=args.commits_url, stix_url=args.stix_url)
+
+            out_path = graph_path(args.output_dir, OUTPUT_FILE, args.gzip_output)
+            with profiler.stage("fingerprint", unit="files") as stage:
+                fingerprint = file_sha256(input_file)
+                stage.add()
+            cache_version = f"{EXTRACTOR_VERSION}/{output_format(args)}"
+            if not args.force and cached_graph_valid(out_path, fingerprint, cache_version):
+                print(f"✅ MITRE bundle unchanged, reusing '{out_path}'")
+                return
+
+            with profiler.stage("extract", unit="objects") as stage:
+                if args.load_all:
+                    objects = load_stix_objects(input_file)
+                else:
+                    objects = iter_stix_objects(input_file)
+
+                with GraphWriter(out_path, pretty=args.pretty, gzip_output=args.gzip_output) as writer:
+                    extract_graph(stage.track(objects), writer)
+                store_cache_record(out_path, fingerprint, cache_version)
+
+            print(f"✅ Extracted {writer.node_count} nodes and {writer.edge_count} edges to '{out_path}'")
+
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
 
-    except Exception as e:
-        print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    main()
+    hound_main("mitre")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Per-stage profiling for --profile.
+
+    profiler = StageProfiler(enabled=True)
+    with profiler.stage("parse", unit="files") as stage:
+        for path in stage.track(paths, progress=True):
+            ...
+    profiler.write_report(path)
+
+Each stage records wall time, CPU time (this process, and its finished child processes),
+the tracemalloc peak of Python allocations and the peak RSS, plus an item count and the
+resulting throughput. track() counts items and, with progress=True, prints a rate line
+about once a second. With cprofile=True every stage that is not nested in a profiled one
+runs under its own cProfile (only one profiler can be active at a time) and the hottest of
+them (largest wall time) is dumped next to the report. When disabled, stages only count
+items and cost next to nothing.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Seconds between two progress lines
+PROGRESS_INTERVAL = 1.0
+
+# Stages currently running, outermost first. tracemalloc has a single peak counter that
+# every stage resets, so the peak is passed on to the stages around a stage when it
+# starts and when it ends.
+_open_stages = []
+
+
+def forget_open_stages():
+    """
+    Drop the stages a forked worker inherited from its parent (and stop their inherited
+    cProfile), so the worker's own stages are profiled as outermost stages.
+    """
+    for stage in _open_stages:
+        if stage.profile is not None:
+            stage.profile.disable()
+    del _open_stages[:]
+
+
+def peak_rss_kb(who="self"):
+    """Peak resident set size in KiB (None where the resource module is unavailable)."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def children_cpu_seconds():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class Stage:
+    """One profiled stage; count items with add() or track()."""
+
+    def __init__(self, name, unit, enabled):
+        self.name = name
+        self.unit = unit
+        self.enabled = enabled
+        self.count = 0
+
+    def add(self, count=1):
+        self.count += count
+
+    def track(self, iterable, total=None, progress=False):
+        """Yield from iterable, counting items and printing a rate line when progress is on."""
+        if not (self.enabled and progress):
+            for item in iterable:
+                self.count += 1
+                yield item
+            return
+
+        start = last = time.perf_counter()
+        for item in iterable:
+            self.count += 1
+            yield item
+            now = time.perf_counter()
+            if now - last >= PROGRESS_INTERVAL:
+                last = now
+                done = f"{self.count}/{total}" if total else str(self.count)
+                print(f"⏱️  {self.name}: {done} {self.unit} ({self.count / (now - start):.0f} {self.unit}/s)", flush=True)
+
+
+class StageProfiler:
+    def __init__(self, enabled=False, cprofile=False):
+        self.enabled = enabled
+        self.cprofile = enabled and cprofile
+        self.stages = []
+        self.profiles = {}
+        self.started = time.perf_counter()
+        self.owns_tracing = False
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.owns_tracing = True
+
+    def stage(self, name, unit="items"):
+        return StageContext(self, Stage(name, unit, self.enabled))
+
+    def report(self):
+        return {
+            "wall_seconds": round(time.perf_counter() - self.started, 6),
+            "peak_rss_kb": peak_rss_kb(),
+            "peak_rss_children_kb": peak_rss_kb("children"),
+            "stages": self.stages,
+        }
+
+    def write_report(self, path):
+        """Write the JSON report (and the hottest stage's cProfile dump); returns the dump path or None."""
+        if not self.enabled:
+            return None
+        if self.owns_tracing:
+            tracemalloc.stop()
+            self.owns_tracing = False
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        dump_path = None
+        if self.profiles:
+            profiled = [stage for stage in self.stages if stage["name"] in self.profiles]
+            hottest = max(profiled, key=lambda stage: stage["wall_seconds"])["name"]
+            dump_path = os.path.splitext(path)[0] + f".{hottest}.prof"
+            self.profiles[hottest].dump_stats(dump_path)
+
+        report = self.report()
+        report["cprofile_dump"] = dump_path
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"📈 Profile written to {path}" + (f" (cProfile of the hottest stage: {dump_path})" if dump_path else ""))
+        return dump_path
+
+
+class StageContext:
+    def __init__(self, profiler, stage):
+        self.profiler = profiler
+        self.stage = stage
+        self.profile = None
+
+    def __enter__(self):
+        if not self.profiler.enabled:
+            return self.stage
+        # the peak reached so far belongs to the stages around this one
+        peak = tracemalloc.get_traced_memory()[1]
+        for outer in _open_stages:
+            outer.peak = max(outer.peak, peak)
+        tracemalloc.reset_peak()
+        self.peak = 0
+        # a nested stage is already covered by the cProfile of the stage around it
+        nested = any(outer.profile is not None for outer in _open_stages)
+        _open_stages.append(self)
+        self.children_cpu = children_cpu_seconds()
+        self.cpu = time.process_time()
+        if self.profiler.cprofile and not nested:
+            import cProfile
+
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self.wall = time.perf_counter()
+        return self.stage
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.profiler.enabled:
+            return False
+        wall = time.perf_counter() - self.wall
+        if self.profile is not None:
+            self.profile.disable()
+            self.profiler.profiles[self.stage.name] = self.profile
+        peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        _open_stages.remove(self)
+        for outer in _open_stages:
+            outer.peak = max(outer.peak, peak)
+        stage = self.stage
+        self.profiler.stages.append({
+            "name": stage.name,
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(time.process_time() - self.cpu, 6),
+            "children_cpu_seconds": round(children_cpu_seconds() - self.children_cpu, 6),
+            "tracemalloc_peak_kb": peak // 1024,
+            "peak_rss_kb": peak_rss_kb(),
+            "count": stage.count,
+            "unit": stage.unit,
+            "per_second": round(stage.count / wall, 1) if wall and stage.count else None,
+            "failed": exc_type is not None,
+        })
+        return False
@@ -1,18 +1,44 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import yaml
 import json
 import uuid
 import subprocess
 import shutil
 from datetime import datetime
-from BloodSOCer import OUTPUT_DIR
+from functools import partial
+from GraphWriter import add_output_arguments, graph_path, output_format, write_graph
+from Hound import Hound, hound_main, register_hound
+from HoundCache import (
+    cached_graph_valid,
+    file_sha256,
+    git_tree_hash,
+    load_previous_graph,
+    read_hound_state,
+    store_cache_record,
+    write_hound_state,
+)
+
+# Prefer the C LibYAML loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 SIGMA_REPO_URL = "https://github.com/SigmaHQ/sigma.git"
 SIGMA_REPO_DIR = "sigma"
 SIGMA_RULES_DIR = os.path.join(SIGMA_REPO_DIR, "rules", "windows")
 OUTPUT_FILE = "sigmahound_graph.json"
+CHANGES_FILE = "sigmahound_changes.json"
+
+# Bump when the extraction logic changes so cached graphs are regenerated
+EXTRACTOR_VERSION = "1"
+
+# The only top-level keys parse_sigma_rule uses; everything else (detection, logsource, ...) is skipped
+SIGMA_HEADER_KEYS = frozenset(("id", "title", "status", "description", "author", "date", "modified", "tags"))
+TOP_LEVEL_KEY_RE = re.compile(r"^([A-Za-z_][\w-]*)\s*:(?:\s|$)")
 
 
 def clone_sigma_repo():
@@ -30,17 +56,67 @@ def clone_sigma_repo():
             print(f"❌ Failed to clone repo: {e}")
             exit(1)
     else:
-        print("📂 Sigma repo already exists locally. Skipping clone.")
-        
+        print("📂 Sigma repo already exists locally. Updating...")
+        try:
+            subprocess.run(["git", "-C", SIGMA_REPO_DIR, "pull"], check=True)
+            print("✅ Repo updated.")
+        except subprocess.CalledProcessError as e:
+            print(f"⚠️ Failed to update repo: {e}")
+
 
 def parse_yaml_file(filepath):
     with open(filepath, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def parse_sigma_header(filepath):
+    """
+    Load only the SIGMA_HEADER_KEYS of a rule.
+    A restricted scanner splits the file into top-level key blocks, keeps the wanted ones
+    and stops reading once all of them were seen; only that subset goes through YAML.
+    Returns None when the layout is not a plain single-document mapping so the caller
+    can fall back to a full parse.
+    """
+    kept = []
+    seen = set()
+    keep = False
+    with open(filepath, "r", encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#") or line[0] in " \t" or line.startswith("- "):
+                # blank line, comment or continuation of the current top-level key
+                if keep:
+                    kept.append(line)
+                continue
 
+            match = TOP_LEVEL_KEY_RE.match(line)
+            if not match:
+                # document markers, flow mappings, complex keys...
+                return None
 
-def parse_sigma_rule(file_path):
+            if seen == SIGMA_HEADER_KEYS:
+                break
+            key = match.group(1)
+            if key in seen:
+                return None
+
+            keep = key in SIGMA_HEADER_KEYS
+            if keep:
+                seen.add(key)
+                kept.append(line)
+
+    try:
+        data = yaml.load("".join(kept), Loader=SafeLoader)
+    except yaml.YAMLError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_sigma_rule(file_path, fast=True):
     try:
-        data = parse_yaml_file(file_path)
+        data = parse_sigma_header(file_path) if fast else None
+        if data is None:
+            data = parse_yaml_file(file_path)
         rule_id = str(data.get("id") or uuid.uuid4())
 
         # Helper: convert value to string if it's a date-like object
@@ -88,39 +164,149 @@ def extract_edges_from_tags(rule_id, tags):
     return edges
 
 
-def collect_sigma_rules():
+def list_sigma_files(rules_dir=None):
+    """Return every rule file under rules_dir (default SIGMA_RULES_DIR), sorted."""
+    paths = []
+    for root, _, files in os.walk(rules_dir or SIGMA_RULES_DIR):
+        for file in files:
+            if file.endswith((".yml", ".yaml")):
+                paths.append(os.path.join(root, file))
+    paths.sort()
+    return paths
+
+
+def collect_sigma_rules(fast=True):
     nodes = []
     edges = []
 
-    for root, _, files in os.walk(SIGMA_RULES_DIR):
-        for file in files:
-            if file.endswith((".yml", ".yaml")):
-                full_path = os.path.join(root, file)
-                node, new_edges = parse_sigma_rule(full_path)
-                if node:
-                    nodes.append(node)
-                    edges.extend(new_edges)
+    for full_path in list_sigma_files():
+        node, new_edges = parse_sigma_rule(full_path, fast=fast)
+        if node:
+            nodes.append(node)
+            edges.extend(new_edges)
 
     return nodes, edges
 
 
-def main():
-    clone_sigma_repo()
-    nodes, edges = collect_sigma_rules()
+def sync_sigma_rules(previous_graph, manifest, fast=True, track=None):
+    """
+    Bring previous_graph up to date with the rules on disk using a per-file manifest
+    {relative_path: {"sha256": ..., "rule_id": ...}}. Only added or modified files are parsed;
+    nodes and DetectedBy edges of modified and deleted files are dropped. A rule that fails
+    to parse gets no manifest entry, so the next run parses it again.
+    With an empty graph and manifest this is a full parse. track(iterable, total), if given,
+    wraps the files to parse (Stage.track for --profile).
+    Returns (nodes, edges, new_manifest, changes).
+    """
+    current = {os.path.relpath(path, SIGMA_REPO_DIR): path for path in list_sigma_files()}
+    changes = {"added": [], "modified": [], "deleted": sorted(set(manifest) - set(current))}
+    new_manifest = {}
+    to_parse = []
 
-    graph = {
-        "graph": {
-            "nodes": nodes,
-            "edges": edges
-        }
+    for rel_path, path in current.items():
+        digest = file_sha256(path)
+        entry = manifest.get(rel_path)
+        if entry and entry.get("sha256") == digest:
+            new_manifest[rel_path] = entry
+            continue
+        changes["modified" if entry else "added"].append(rel_path)
+        to_parse.append((rel_path, path, digest))
+
+    stale = {
+        manifest[rel_path].get("rule_id")
+        for rel_path in changes["modified"] + changes["deleted"]
     }
+    nodes = [node for node in previous_graph["graph"]["nodes"] if node["id"] not in stale]
+    edges = [edge for edge in previous_graph["graph"]["edges"] if edge["end"]["value"] not in stale]
+
+    for rel_path, path, digest in (track or (lambda iterable, total: iterable))(to_parse, len(to_parse)):
+        node, new_edges = parse_sigma_rule(path, fast=fast)
+        if node is None:
+            # no manifest entry, so the next run parses the rule again
+            continue
+        new_manifest[rel_path] = {"sha256": digest, "rule_id": node["id"]}
+        nodes.append(node)
+        edges.extend(new_edges)
+
+    return nodes, edges, new_manifest, changes
+
+
+def write_changes(output_dir, changes):
+    """Write the added/modified/deleted summary of this run to CHANGES_FILE; returns its path."""
+    changes_path = os.path.join(output_dir, CHANGES_FILE)
+    with open(changes_path, "w", encoding="utf-8") as fh:
+        json.dump(changes, fh, ensure_ascii=False, indent=2)
+    return changes_path
+
+
+@register_hound
+class SigmaRulesHound(Hound):
+    name = "sigma"
+    graph_file = OUTPUT_FILE
+    description = "Extract Sigma Windows rules to a BloodHound OpenGraph file."
+    kinds = (("Rule", "Windows"),)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-parse every rule, ignoring the cached graph and the per-file manifest",
+        )
+        parser.add_argument(
+            "--full-parse",
+            dest="full_parse",
+            action="store_true",
+            help="Load every rule with a full YAML parse instead of reading only the header keys",
+        )
+        add_output_arguments(parser)
+
+    def run(self, args):
+        profiler = args.profiler
+        with profiler.stage("git"):
+            clone_sigma_repo()
+
+        out_path = graph_path(args.output_dir, OUTPUT_FILE, args.gzip_output)
+        cache_version = f"{EXTRACTOR_VERSION}/{output_format(args)}"
+        with profiler.stage("fingerprint"):
+            fingerprint = git_tree_hash(SIGMA_REPO_DIR, "rules/windows")
+        if not args.force and cached_graph_valid(out_path, fingerprint, cache_version):
+            # nothing changed in this run; do not leave the previous run's changes behind
+            write_changes(args.output_dir, {"added": [], "modified": [], "deleted": []})
+            print(f"✅ Sigma rules unchanged, reusing {out_path}")
+            return
+
+        with profiler.stage("parse", unit="files") as stage:
+            state = read_hound_state(out_path)
+            previous_graph = None if args.force else load_previous_graph(out_path, state, EXTRACTOR_VERSION)
+            if previous_graph is None:
+                previous_graph = {"graph": {"nodes": [], "edges": []}}
+                state = {}
+
+            nodes, edges, manifest, changes = sync_sigma_rules(
+                previous_graph, state.get("files", {}), fast=not args.full_parse,
+                track=partial(stage.track, progress=True),
+            )
 
-    out_path = os.path.join(OUTPUT_DIR, "sigmahound_graph.json")
-    with open(out_path, "w", encoding="utf-8") as fh:
-        json.dump(graph, fh, ensure_ascii=False, indent=2)
+        with profiler.stage("write", unit="items") as stage:
+            write_graph(out_path, nodes, edges, pretty=args.pretty, gzip_output=args.gzip_output)
+            stage.add(len(nodes) + len(edges))
+            # with a rule that failed to parse, keep the cache stale so the next run retries it
+            failed = [path for path in changes["added"] + changes["modified"] if path not in manifest]
+            if not failed:
+                store_cache_record(out_path, fingerprint, cache_version)
+            write_hound_state(out_path, {
+                "extractor_version": EXTRACTOR_VERSION,
+                "output_sha256": file_sha256(out_path),
+                "files": manifest,
+            })
 
-    print(f"✅ SigmaHound data written to {out_path}")
+        changes_path = write_changes(args.output_dir, changes)
+        print(
+            f"🔄 Sigma rules: {len(changes['added'])} added, {len(changes['modified'])} modified, "
+            f"{len(changes['deleted'])} deleted (details in {changes_path})"
+        )
+        print(f"✅ SigmaHound data written to {out_path}")
 
 
 if __name__ == "__main__":
-    main()
+    hound_main("sigma")
@@ -1,50 +1,159 @@
 #!/usr/bin/env python3
+"""
+Sync the saved queries under Cyphers/ (or the files given on the command line) to BloodHound.
 
+The saved queries already on the server are fetched once and matched by name: queries
+that are missing are imported, queries whose content (query and description) changed are
+updated in place and the others are left alone, so running this against an instance that
+is already set up makes no writes. Writes run concurrently up to --concurrency, through
+the same signed session and with the same retries as the graph uploads.
+"""
+
+import argparse
 import glob
+import hashlib
+import json
 import os
 import sys
 
-from auth.hmac_authenticated_client import HMACAuthenticatedClient
+from Config import DEFAULT_UPLOAD_CONCURRENCY, DEFAULT_UPLOAD_RETRIES, apikey, apiid, credentials_valid, url
 
-DEFAULT_URL = "http://127.0.0.1:8080"
 DEFAULT_DIR = os.path.join(os.path.dirname(__file__), "Cyphers")
 
-# Import apikey, apiid, and url from BloodSOCer.py
-try:
-    from BloodSOCer import apikey, apiid, url
-except Exception:
-    apikey = None
-    apiid = None
-    url = DEFAULT_URL
+# Saved queries fetched per request when listing the server's queries
+SAVED_QUERIES_PAGE = 500
+
+
+def load_queries(files):
+    """Read the saved-query JSON files; returns [(path, {"name", "query", "description"})]."""
+    queries = []
+    for path in files:
+        if not os.path.exists(path):
+            print(f"[WARN] file not found: {path}")
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError) as exc:
+            print(f"[ERROR] cannot read {path}: {exc}")
+            continue
+        for query in data if isinstance(data, list) else [data]:
+            if not query.get("name") or not query.get("query"):
+                print(f"[ERROR] {path}: a saved query needs a name and a query")
+                continue
+            queries.append((path, query))
+    return queries
+
+
+def content_hash(query):
+    """Hash of what a saved query does (its Cypher and description), ignoring surrounding whitespace."""
+    content = {"query": query.get("query", "").strip(), "description": (query.get("description") or "").strip()}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def plan_sync(queries, existing):
+    """
+    Compare local queries with the server's. Returns (to_import, to_update, unchanged) where
+    to_import is [(path, query)] and to_update [(path, query, server_id)].
+    """
+    by_name = {}
+    for saved in existing:
+        by_name.setdefault(saved.get("name"), []).append(saved)
+
+    to_import, to_update, unchanged = [], [], []
+    for path, query in queries:
+        matches = by_name.get(query["name"])
+        if not matches:
+            to_import.append((path, query))
+        elif any(content_hash(saved) == content_hash(query) for saved in matches):
+            unchanged.append((path, query))
+        else:
+            to_update.append((path, query, matches[0]["id"]))
+    return to_import, to_update, unchanged
+
 
+async def fetch_saved_queries(http, retries):
+    """Every saved query visible to the API user, or None when the list cannot be read."""
+    from UploadEngine import request_with_retries
 
-def credentials_valid():
-    invalid_values = {None, "", "<CHANGEME>"}
-    return apikey not in invalid_values and apiid not in invalid_values
+    saved = []
+    while True:
+        resp, _, error = await request_with_retries(
+            http, "GET", "/api/v2/saved-queries", retries,
+            lambda: {"params": {"skip": len(saved), "limit": SAVED_QUERIES_PAGE}, "timeout": 60.0},
+        )
+        if resp is None or resp.status_code >= 400:
+            code = getattr(resp, "status_code", "N/A")
+            print(f"[ERROR] cannot list saved queries (status {code}): {error or resp.text[:200]}")
+            return None
+        page = resp.json().get("data") or []
+        saved.extend(page)
+        if len(page) < SAVED_QUERIES_PAGE:
+            return saved
 
 
-def import_file(httpx_client, path):
-    with open(path, "rb") as fh:
-        payload = fh.read()
-    resp = httpx_client.post(
-        "/api/v2/saved-queries/import",
-        content=payload,
-        headers={"Content-Type": "application/json"},
-        timeout=60.0,
+async def sync_saved_queries(queries, base_url, token_key, token_id, concurrency=DEFAULT_UPLOAD_CONCURRENCY,
+                             retries=DEFAULT_UPLOAD_RETRIES):
+    """Import the new queries and update the changed ones. Returns the number of failed writes, None if listing failed."""
+    import asyncio
+    from UploadEngine import open_session, request_with_retries
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    async with open_session(base_url, token_key, token_id) as http:
+        existing = await fetch_saved_queries(http, retries)
+        if existing is None:
+            return None
+        to_import, to_update, unchanged = plan_sync(queries, existing)
+
+        async def write(method, endpoint, path, query, action):
+            payload = {"name": query["name"], "query": query["query"], "description": query.get("description") or ""}
+            async with semaphore:
+                resp, _, error = await request_with_retries(
+                    http, method, endpoint, retries, lambda: {"json": payload, "timeout": 60.0}
+                )
+            if resp is not None and resp.status_code < 400:
+                print(f"[OK] {action} '{query['name']}' from {path} (status {resp.status_code})")
+                return True
+            code = getattr(resp, "status_code", "N/A")
+            print(f"[ERROR] {action} failed for {path} (status {code}): {error or resp.text[:200]}")
+            return False
+
+        results = await asyncio.gather(
+            *(write("POST", "/api/v2/saved-queries/import", path, query, "imported") for path, query in to_import),
+            *(write("PUT", f"/api/v2/saved-queries/{saved_id}", path, query, "updated")
+              for path, query, saved_id in to_update),
+        )
+
+    print(
+        f"✅ Saved queries: {len(to_import)} imported, {len(to_update)} updated, "
+        f"{len(unchanged)} already up to date"
     )
-    if resp.status_code < 400:
-        print(f"[OK] imported {path} (status {resp.status_code})")
-    else:
-        print(f"[ERROR] import failed for {path} (status {resp.status_code}): {resp.text}")
+    return results.count(False)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Import new and changed saved queries into BloodHound.")
+    parser.add_argument("files", nargs="*", help="Saved-query JSON files (default: every JSON file under Cyphers/)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_UPLOAD_CONCURRENCY,
+        help=f"Maximum simultaneous writes (default: {DEFAULT_UPLOAD_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_UPLOAD_RETRIES,
+        help=f"Retries per request on 429/5xx or network errors (default: {DEFAULT_UPLOAD_RETRIES})",
+    )
+    args = parser.parse_args()
+
     if not credentials_valid():
-        print("[ERROR] apikey and apiid must be set in BloodSOCer.py before running this script.")
+        print("[ERROR] apikey and apiid must be set in Config.py before running this script.")
         sys.exit(1)
 
     # If files were passed on the command line, use them; otherwise default to all JSON under Cyphers/
-    files = sys.argv[1:]
+    files = args.files
     if not files:
         files = glob.glob(os.path.join(DEFAULT_DIR, "**", "*.json"), recursive=True)
         files.sort()
@@ -52,16 +161,14 @@ def main():
             print(f"[ERROR] No JSON files found under {DEFAULT_DIR}")
             sys.exit(1)
 
-    with HMACAuthenticatedClient(base_url=url, token_key=apikey, token_id=apiid) as client:
-        httpx_client = client.get_httpx_client()
-        for path in files:
-            if not os.path.exists(path):
-                print(f"[WARN] file not found: {path}")
-                continue
-            try:
-                import_file(httpx_client, path)
-            except Exception as exc:
-                print(f"[ERROR] import failed for {path}: {exc}")
+    import asyncio
+
+    failed = asyncio.run(sync_saved_queries(
+        load_queries(files), base_url=url, token_key=apikey, token_id=apiid,
+        concurrency=args.concurrency, retries=args.retries,
+    ))
+    if failed is None or failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
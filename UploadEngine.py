@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Upload engine for BloodHound graph files.
+
+All files of a run go to one upload job through a single pooled (keep-alive) async
+httpx session (open_session). Uploads run concurrently up to a bounded limit; 429/5xx
+responses and transport errors are retried with exponential backoff and full jitter,
+honoring Retry-After. Bodies are streamed from disk (see upload_body).
+
+BloodHound's HMAC signature covers the request body, which a streamed body does not
+provide up front. The session signs requests itself (BloodHoundHMACAuth): buffered
+bodies are signed as they are sent, and upload_one signs each streamed upload in a first
+pass over the same body, so files are never held in memory.
+"""
+
+import asyncio
+import base64
+import email.utils
+import gzip
+import hashlib
+import hmac
+import inspect
+import os
+import random
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timezone
+
+import httpx
+
+from Config import DEFAULT_UPLOAD_CONCURRENCY, DEFAULT_UPLOAD_RETRIES
+from GraphWriter import iter_graph_items, write_graph_shards
+
+# Bytes read from disk per chunk when streaming uploads
+UPLOAD_CHUNK_SIZE = 1 << 16
+
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+UPLOAD_TIMEOUT = httpx.Timeout(120.0, connect=15.0)
+JOB_TIMEOUT = httpx.Timeout(30.0, connect=15.0)
+
+# File upload job statuses reported by GET /api/v2/file-upload
+JOB_STATUS_NAMES = {
+    -1: "invalid",
+    0: "ready",
+    1: "running",
+    2: "complete",
+    3: "canceled",
+    4: "timed out",
+    5: "failed",
+    6: "ingesting",
+    7: "analyzing",
+    8: "partially complete",
+}
+JOB_COMPLETE = 2
+JOB_FAILED_STATUS = {-1, 3, 4, 5, 8}
+
+# Ingest polling: start fast, back off while the status does not change, reset when it does
+INGEST_POLL_MIN_DELAY = 1.0
+INGEST_POLL_MAX_DELAY = 30.0
+INGEST_POLL_BACKOFF = 1.5
+
+
+class BloodHoundHMACAuth(httpx.Auth):
+    """
+    BloodHound request signing: an HMAC-SHA256 chain over method and URI, the request
+    hour and the body. A request that already carries a Signature header (a streamed body
+    signed beforehand with sign()) is sent as is.
+    """
+
+    def __init__(self, token_key, token_id):
+        self.token_key = token_key
+        self.token_id = token_id
+
+    def sign(self, method, uri, chunks):
+        """Authorization, RequestDate and Signature headers for a body given as an iterable of bytes."""
+        operation = hmac.new(self.token_key.encode("utf-8"), f"{method}{uri}".encode("utf-8"), hashlib.sha256)
+        request_date = datetime.now().astimezone().isoformat("T")
+        dated = hmac.new(operation.digest(), request_date[:13].encode("utf-8"), hashlib.sha256)
+        body = hmac.new(dated.digest(), None, hashlib.sha256)
+        for chunk in chunks:
+            body.update(chunk)
+        return {
+            "Authorization": f"bhesignature {self.token_id}",
+            "RequestDate": request_date,
+            "Signature": base64.b64encode(body.digest()).decode("ascii"),
+        }
+
+    def auth_flow(self, request):
+        if "Signature" not in request.headers:
+            try:
+                content = request.content
+            except httpx.RequestNotRead:
+                raise RuntimeError("a streamed request body must be signed before it is sent") from None
+            request.headers.update(self.sign(request.method, request.url.raw_path.decode("ascii"), [content]))
+        yield request
+
+
+def open_session(base_url, token_key, token_id):
+    """Pooled async httpx session signing every request with the API token."""
+    return httpx.AsyncClient(base_url=base_url, auth=BloodHoundHMACAuth(token_key, token_id))
+
+
+class ZipStreamSink:
+    """
+    Write-only, non-seekable file object for zipfile: the compressed bytes it receives
+    are handed out with drain() instead of being kept, so a ZIP can be produced on the fly.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def open_graph_for_upload(path):
+    """Open a graph file as bytes, decompressing *.gz graphs on the fly."""
+    fh = open(path, "rb")
+    if fh.read(2) == b"\x1f\x8b":
+        fh.close()
+        return gzip.open(path, "rb")
+    fh.seek(0)
+    return fh
+
+
+def iter_graph_chunks(path):
+    with open_graph_for_upload(path) as fh:
+        for block in iter(lambda: fh.read(UPLOAD_CHUNK_SIZE), b""):
+            yield block
+
+
+def iter_zip_chunks(path):
+    """Yield a ZIP archive of the graph as it is compressed, without building it in memory."""
+    arcname = os.path.basename(path)
+    if arcname.endswith(".gz"):
+        arcname = arcname[:-3]
+
+    # a fixed timestamp makes the archive identical on every pass (signing, then upload)
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime(os.path.getmtime(path))[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    sink = ZipStreamSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with zf.open(info, "w", force_zip64=True) as entry, open_graph_for_upload(path) as src:
+            for block in iter(lambda: src.read(UPLOAD_CHUNK_SIZE), b""):
+                entry.write(block)
+                data = sink.drain()
+                if data:
+                    yield data
+    yield sink.drain()
+
+
+def upload_body(path, compress=False):
+    """
+    Choose the request body and headers for a graph file up front:
+    - compress: a ZIP stream built on the fly (application/zip)
+    - plain JSON: streamed from the file handle with a known Content-Length
+    - gzip graph: decompressed on the fly and streamed as JSON
+    """
+    if compress:
+        return iter_zip_chunks(path), {"Content-Type": "application/zip"}
+
+    headers = {"Content-Type": "application/json"}
+    with open(path, "rb") as fh:
+        is_gzip = fh.read(2) == b"\x1f\x8b"
+    if not is_gzip:
+        headers["Content-Length"] = str(os.path.getsize(path))
+    return iter_graph_chunks(path), headers
+
+
+async def aiter_chunks(chunks):
+    """Adapt a blocking chunk iterator to the async client, reading in a worker thread."""
+    loop = asyncio.get_running_loop()
+    iterator = iter(chunks)
+    try:
+        while True:
+            block = await loop.run_in_executor(None, next, iterator, None)
+            if block is None:
+                return
+            yield block
+    finally:
+        # release the file handle even when the request is aborted mid-body
+        if hasattr(iterator, "close"):
+            iterator.close()
+
+
+def retry_after_seconds(resp):
+    """Parse a Retry-After header (seconds or HTTP date); None when absent or invalid."""
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt, resp=None):
+    """Exponential backoff with full jitter; a server Retry-After always wins."""
+    retry_after = retry_after_seconds(resp)
+    if retry_after is not None:
+        return min(retry_after, RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+async def request_with_retries(http, method, path, retries, make_kwargs):
+    """
+    Send a request, retrying transport errors and RETRYABLE_STATUS responses.
+    make_kwargs() is called (and awaited if it is a coroutine function) for every attempt
+    so streamed bodies are reopened.
+    Returns (response or None, attempts, last error message or None).
+    """
+    resp = None
+    error = None
+    for attempt in range(retries + 1):
+        resp = None
+        try:
+            kwargs = make_kwargs()
+            if inspect.isawaitable(kwargs):
+                kwargs = await kwargs
+            resp = await http.request(method, path, **kwargs)
+            if resp.status_code not in RETRYABLE_STATUS:
+                return resp, attempt + 1, None
+            error = f"HTTP {resp.status_code}"
+        except httpx.TransportError as exc:
+            error = f"{type(exc).__name__}: {exc}"
+
+        if attempt < retries:
+            await asyncio.sleep(backoff_delay(attempt, resp))
+    return resp, retries + 1, error
+
+
+async def upload_one(http, job_id, path, semaphore, compress, retries, label=None):
+    """Upload one graph file and return its outcome entry (reported under label, default path)."""
+    outcome = {"path": label or path, "status": "failed", "attempts": 0, "http_status": None, "error": None, "seconds": 0.0}
+    if not os.path.exists(path):
+        outcome.update(status="missing", error="file not found")
+        return outcome
+
+    async with semaphore:
+        start = time.perf_counter()
+
+        endpoint = f"/api/v2/file-upload/{job_id}"
+
+        async def make_kwargs():
+            content, headers = upload_body(path, compress)
+            if isinstance(http.auth, BloodHoundHMACAuth):
+                # the signature covers the body: hash it in a first pass, then stream it
+                uri = http.build_request("POST", endpoint).url.raw_path.decode("ascii")
+                chunks, _ = upload_body(path, compress)
+                loop = asyncio.get_running_loop()
+                headers.update(await loop.run_in_executor(None, http.auth.sign, "POST", uri, chunks))
+            return {"content": aiter_chunks(content), "headers": headers, "timeout": UPLOAD_TIMEOUT}
+
+        try:
+            resp, attempts, error = await request_with_retries(http, "POST", endpoint, retries, make_kwargs)
+        except Exception as exc:
+            resp, attempts, error = None, 1, str(exc)
+
+        outcome["seconds"] = time.perf_counter() - start
+        outcome["attempts"] = attempts
+        if resp is not None:
+            outcome["http_status"] = resp.status_code
+        if resp is not None and resp.status_code < 400:
+            outcome["status"] = "uploaded"
+        else:
+            outcome["error"] = error or (resp.text[:200] if resp is not None else "no response")
+    return outcome
+
+
+def plan_shards(files, shard_dir, shard_size):
+    """
+    Split every graph into node shards and edge shards of about shard_size bytes.
+    Returns two upload phases of (path, label): all node shards, then all edge shards,
+    so node ids exist before edges reference them. Missing files stay in the first phase
+    so they are reported.
+    """
+    node_phase = []
+    edge_phase = []
+    for path in files:
+        if not os.path.exists(path):
+            node_phase.append((path, path))
+            continue
+        node_shards, edge_shards = write_graph_shards(path, shard_dir, shard_size)
+        for shards, phase in ((node_shards, node_phase), (edge_shards, edge_phase)):
+            for shard in shards:
+                phase.append((shard, f"{path} [{os.path.basename(shard)}]"))
+    return [node_phase, edge_phase]
+
+
+async def upload_graphs(files, base_url, token_key, token_id, compress=False,
+                        concurrency=DEFAULT_UPLOAD_CONCURRENCY, retries=DEFAULT_UPLOAD_RETRIES,
+                        shard_size=None, wait_timeout=None):
+    """
+    Create one upload job, upload every file concurrently, then end the job to trigger ingest.
+    With shard_size (bytes), graphs are split first and uploaded as node shards, then edge shards.
+    With wait_timeout (seconds), wait for ingest to finish and report its duration and throughput.
+    Returns a list of per-file outcomes ({"path", "status", "attempts", "http_status", "error",
+    "seconds"}, plus "ingest" when waiting), or None if the job could not be created.
+    """
+    shard_dir = None
+    phases = [[(path, path) for path in files]]
+    if shard_size:
+        shard_dir = tempfile.TemporaryDirectory(prefix="bloodsocer-shards-")
+        phases = plan_shards(files, shard_dir.name, shard_size)
+
+    try:
+        return await upload_phases(phases, base_url, token_key, token_id, compress, concurrency, retries, wait_timeout)
+    finally:
+        if shard_dir is not None:
+            shard_dir.cleanup()
+
+
+async def start_job(http, retries):
+    """Create an upload job and return its id (None on failure)."""
+    start_resp, _, error = await request_with_retries(
+        http, "POST", "/api/v2/file-upload/start", retries, lambda: {"timeout": JOB_TIMEOUT}
+    )
+    if start_resp is None or start_resp.status_code >= 400:
+        code = getattr(start_resp, "status_code", "N/A")
+        print(f"[ERROR] failed to create upload job (status: {code}): {error or start_resp.text}")
+        return None
+    job_id = start_resp.json().get("data", {}).get("id")
+    if not job_id:
+        print("[ERROR] start response missing job id")
+    return job_id
+
+
+async def end_job(http, job_id, retries):
+    """End an upload job, which triggers ingest."""
+    end_resp, _, error = await request_with_retries(
+        http, "POST", f"/api/v2/file-upload/{job_id}/end", retries, lambda: {"timeout": JOB_TIMEOUT}
+    )
+    if end_resp is not None and end_resp.status_code in (200, 201, 202):
+        print("Upload job finished; ingestion started (may take a few minutes).")
+    else:
+        code = getattr(end_resp, "status_code", "N/A")
+        print(f"[WARN] end job returned {code}: {error or ''}")
+
+
+async def fetch_job(http, job_id, retries):
+    """Return the upload job record of job_id, or None when it cannot be read."""
+    resp, _, _ = await request_with_retries(
+        http, "GET", "/api/v2/file-upload", retries,
+        lambda: {"params": {"id": f"eq:{job_id}"}, "timeout": JOB_TIMEOUT},
+    )
+    if resp is None or resp.status_code >= 400:
+        return None
+    for job in resp.json().get("data") or []:
+        if str(job.get("id")) == str(job_id):
+            return job
+    return None
+
+
+async def wait_for_ingest(http, job_id, timeout, retries):
+    """
+    Poll the upload job until ingest completes, fails or timeout (seconds) expires.
+    The delay between polls grows while the status stays the same and drops back to
+    INGEST_POLL_MIN_DELAY whenever it changes.
+    Returns {"status": name, "ok": bool, "message": str, "seconds": float}.
+    """
+    start = time.perf_counter()
+    delay = INGEST_POLL_MIN_DELAY
+    last_status = None
+    while True:
+        job = await fetch_job(http, job_id, retries)
+        status = job.get("status") if job else None
+        elapsed = time.perf_counter() - start
+        message = (job or {}).get("status_message") or ""
+
+        if status == JOB_COMPLETE or status in JOB_FAILED_STATUS:
+            return {"status": JOB_STATUS_NAMES[status], "ok": status == JOB_COMPLETE, "message": message, "seconds": elapsed}
+
+        if status != last_status:
+            print(f"⏳ Ingest job {job_id}: {JOB_STATUS_NAMES.get(status, 'unknown')} ({elapsed:.0f}s)")
+            last_status = status
+            delay = INGEST_POLL_MIN_DELAY
+        else:
+            delay = min(delay * INGEST_POLL_BACKOFF, INGEST_POLL_MAX_DELAY)
+
+        if elapsed >= timeout:
+            return {"status": "timed out waiting", "ok": False, "message": f"no result after {timeout:g}s", "seconds": elapsed}
+        await asyncio.sleep(min(delay, max(0.0, timeout - elapsed)))
+
+
+def count_graph_items(paths):
+    """Total (nodes, edges) in the given graph files."""
+    nodes = edges = 0
+    for path in paths:
+        nodes += sum(1 for _ in iter_graph_items(path, "nodes"))
+        edges += sum(1 for _ in iter_graph_items(path, "edges"))
+    return nodes, edges
+
+
+async def watch_ingest(http, job_id, uploaded_paths, upload_seconds, timeout, retries):
+    """
+    Wait for the job's ingest (counting the uploaded nodes and edges meanwhile), print
+    upload vs ingest time and ingest throughput, and return the wait_for_ingest result.
+    """
+    loop = asyncio.get_running_loop()
+    counts = loop.run_in_executor(None, count_graph_items, uploaded_paths)
+    ingest = await wait_for_ingest(http, job_id, timeout, retries)
+    nodes, edges = await counts
+
+    seconds = max(ingest["seconds"], 1e-9)
+    icon = "✅" if ingest["ok"] else "❌"
+    print(f"{icon} Ingest {ingest['status']}{': ' + ingest['message'] if ingest['message'] else ''}")
+    print(
+        f"📊 upload {upload_seconds:.1f}s, ingest {ingest['seconds']:.1f}s; "
+        f"{nodes} nodes ({nodes / seconds:.0f}/s), {edges} edges ({edges / seconds:.0f}/s)"
+    )
+    return ingest
+
+
+def mark_ingest(report, ingest):
+    """Record the job's ingest status on every uploaded entry of the report."""
+    for item in report:
+        if item["status"] == "uploaded":
+            item["ingest"] = ingest["status"]
+
+
+async def upload_phases(phases, base_url, token_key, token_id, compress, concurrency, retries, wait_timeout=None):
+    """
+    Upload each phase (a list of (path, label)) concurrently, one phase after another, in one job.
+    With wait_timeout (seconds), wait for ingest and record its status in the report.
+    """
+    async with open_session(base_url, token_key, token_id) as http:
+        start = time.perf_counter()
+        job_id = await start_job(http, retries)
+        if not job_id:
+            return None
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        report = []
+        uploaded = []
+        for phase in phases:
+            outcomes = await asyncio.gather(
+                *(upload_one(http, job_id, path, semaphore, compress, retries, label) for path, label in phase)
+            )
+            report += outcomes
+            uploaded += [path for (path, _), item in zip(phase, outcomes) if item["status"] == "uploaded"]
+
+        await end_job(http, job_id, retries)
+        if wait_timeout:
+            ingest = await watch_ingest(http, job_id, uploaded, time.perf_counter() - start, wait_timeout, retries)
+            mark_ingest(report, ingest)
+
+    return report
+
+
+async def upload_pipeline(sources, base_url, token_key, token_id, compress=False,
+                          concurrency=DEFAULT_UPLOAD_CONCURRENCY, retries=DEFAULT_UPLOAD_RETRIES,
+                          shard_size=None, wait_timeout=None):
+    """
+    Upload graphs as soon as their producers finish.
+    sources are awaitables resolving to a graph path, or None when the producer failed
+    (that source is then simply skipped). The job is created when the first graph is ready
+    and ended once every upload is done. Edges may point into a graph that is not ready yet,
+    so each graph is split into its nodes, uploaded right away, and its edges, which are held
+    until every source has resolved and all nodes are uploaded. With shard_size (bytes), both
+    parts are further split into shards of about that size. With wait_timeout, ingest is
+    awaited as in upload_graphs; the reported upload time runs from the first ready graph to
+    the end of the job.
+    Returns the per-file outcome report ([] if no producer succeeded, None if the job failed;
+    every source is still awaited in that case).
+    """
+    shard_dir = tempfile.TemporaryDirectory(prefix="bloodsocer-shards-")
+    shard_bytes = shard_size or float("inf")
+    loop = asyncio.get_running_loop()
+    try:
+        async with open_session(base_url, token_key, token_id) as http:
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+            job_id = None
+            job_failed = False
+            start = None
+            uploads = []
+            edge_phase = []
+            uploaded = []
+
+            async def upload_phase(phase):
+                results = await asyncio.gather(
+                    *(upload_one(http, job_id, shard, semaphore, compress, retries, label) for shard, label in phase)
+                )
+                uploaded.extend(shard for (shard, _), item in zip(phase, results) if item["status"] == "uploaded")
+                return results
+
+            async def upload_nodes(path):
+                node_phase, edges = await loop.run_in_executor(None, plan_shards, [path], shard_dir.name, shard_bytes)
+                edge_phase.extend(edges)
+                return await upload_phase(node_phase)
+
+            for source in asyncio.as_completed(list(sources)):
+                path = await source
+                if path is None or job_failed:
+                    continue
+                if job_id is None:
+                    start = time.perf_counter()
+                    job_id = await start_job(http, retries)
+                    if not job_id:
+                        # keep awaiting the other producers so they all finish and report
+                        job_failed = True
+                        continue
+                uploads.append(asyncio.ensure_future(upload_nodes(path)))
+
+            if job_failed:
+                return None
+            report = [outcome for outcomes in await asyncio.gather(*uploads) for outcome in outcomes]
+            report += await upload_phase(edge_phase)
+            if job_id is not None:
+                await end_job(http, job_id, retries)
+                if wait_timeout:
+                    ingest = await watch_ingest(http, job_id, uploaded, time.perf_counter() - start, wait_timeout, retries)
+                    mark_ingest(report, ingest)
+            return report
+    finally:
+        shard_dir.cleanup()
+
+
+async def run_cypher_statements(queries, base_url, token_key, token_id, concurrency=DEFAULT_UPLOAD_CONCURRENCY,
+                                retries=DEFAULT_UPLOAD_RETRIES):
+    """
+    Run Cypher statements (e.g. the stale-item deletes of a delta upload) through
+    /api/v2/graphs/cypher, concurrently and with retries. Mutating statements need
+    Cypher mutations enabled on the BloodHound server.
+    Returns the number of statements that failed.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    async with open_session(base_url, token_key, token_id) as http:
+        async def run_one(query):
+            async with semaphore:
+                resp, _, error = await request_with_retries(
+                    http, "POST", "/api/v2/graphs/cypher", retries,
+                    lambda: {"json": {"query": query, "include_properties": False}, "timeout": UPLOAD_TIMEOUT},
+                )
+            # 404 means the statement matched nothing, which is fine for a delete
+            if resp is not None and (resp.status_code < 400 or resp.status_code == 404):
+                return True
+            code = getattr(resp, "status_code", "N/A")
+            print(f"[WARN] cypher statement failed (status {code}): {error or resp.text[:200]}")
+            return False
+
+        results = await asyncio.gather(*(run_one(query) for query in queries))
+    return results.count(False)
+
+
+def print_upload_report(report):
+    for item in report:
+        if item["status"] == "uploaded":
+            retried = f", {item['attempts']} attempts" if item["attempts"] > 1 else ""
+            print(f"Uploaded {item['path']} in {item['seconds']:.1f}s{retried}")
+        elif item["status"] == "missing":
+            print(f"[WARN] file not found: {item['path']}")
+        else:
+            print(
+                f"[WARN] upload failed for {item['path']} after {item['attempts']} attempt(s) "
+                f"(status: {item['http_status'] or 'N/A'}): {item['error']}"
+            )
+
+
+def run_uploads(files, **kwargs):
+    """Synchronous entry point: run upload_graphs, print the per-file report and return it."""
+    report = asyncio.run(upload_graphs(files, **kwargs))
+    if report is not None:
+        print_upload_report(report)
+    return report
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Regression benchmark for MitreHound.extract_graph (single-pass node and edge extraction).
+
+Generates synthetic STIX bundles of increasing size and times extraction.
+The growth exponent (log-log slope of time against object count) should stay close to 1;
+the old nested-scan implementation is quadratic and lands close to 2.
+
+    python3 benchmarks/bench_mitre.py --scales 1 2 4 8
+"""
+
+import argparse
+import gc
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import MitreHound  # noqa: E402
+from synthetic import make_stix_bundle  # noqa: E402
+
+
+def time_extract_graph(bundle, repeat=3):
+    # Like timeit, keep the garbage collector out of the measurement
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            MitreHound.extract_graph(bundle["objects"])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MitreHound.extract_graph on synthetic bundles.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4, 8], help="Bundle scale factors to time")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scale (best time is kept)")
+    parser.add_argument("--max-exponent", type=float, default=1.5,
+                        help="Fail if time grows faster than object_count ** max_exponent")
+    args = parser.parse_args()
+
+    results = []
+    for scale in sorted(args.scales):
+        bundle = make_stix_bundle(scale)
+        count = len(bundle["objects"])
+        elapsed = time_extract_graph(bundle, args.repeat)
+        results.append((scale, count, elapsed))
+        print(f"scale={scale:<3} objects={count:<8} extract_graph={elapsed * 1000:8.1f} ms  "
+              f"({elapsed / count * 1e6:.2f} µs/object)")
+
+    first, last = results[0], results[-1]
+    if first[1] == last[1]:
+        return
+
+    exponent = math.log(last[2] / first[2]) / math.log(last[1] / first[1])
+    print(f"growth exponent: {exponent:.2f}")
+    if exponent > args.max_exponent:
+        print(f"❌ extract_graph no longer scales linearly (exponent {exponent:.2f} > {args.max_exponent})")
+        sys.exit(1)
+    print("✅ extract_graph scales linearly with bundle size")
+
+
+if __name__ == "__main__":
+    main()
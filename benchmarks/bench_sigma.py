@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark SigmaHound rule parsing: full YAML load vs header-only fast path.
+
+Runs both modes over a Sigma rules tree (the full sigma/rules checkout by default),
+reports the per-file cost of each and checks that they produce identical nodes and edges.
+
+    python3 benchmarks/bench_sigma.py --rules-dir sigma/rules
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import SigmaHound  # noqa: E402
+
+
+def time_mode(paths, fast):
+    results = []
+    start = time.perf_counter()
+    for path in paths:
+        results.append(SigmaHound.parse_sigma_rule(path, fast=fast))
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and header-only Sigma rule parsing.")
+    parser.add_argument("--rules-dir", default=os.path.join(SigmaHound.SIGMA_REPO_DIR, "rules"),
+                        help="Sigma rules tree to parse (default: sigma/rules)")
+    args = parser.parse_args()
+
+    paths = SigmaHound.list_sigma_files(args.rules_dir)
+    if not paths:
+        print(f"❌ No rules found under {args.rules_dir}")
+        sys.exit(1)
+
+    print(f"LibYAML loader: {'yes' if SigmaHound.SafeLoader.__name__ == 'CSafeLoader' else 'no'}")
+    full_time, full_results = time_mode(paths, fast=False)
+    fast_time, fast_results = time_mode(paths, fast=True)
+    fallbacks = sum(1 for path in paths if SigmaHound.parse_sigma_header(path) is None)
+
+    # Rules without an id get a random uuid, so compare everything else
+    mismatches = 0
+    for (full_node, full_edges), (fast_node, fast_edges) in zip(full_results, fast_results):
+        if full_node is None or fast_node is None:
+            mismatches += (full_node is None) != (fast_node is None)
+            continue
+        if full_node["properties"]["name"] != fast_node["properties"]["name"] or len(full_edges) != len(fast_edges):
+            mismatches += 1
+        elif full_node["id"] == fast_node["id"] and (full_node, full_edges) != (fast_node, fast_edges):
+            mismatches += 1
+
+    count = len(paths)
+    print(f"rules:      {count}")
+    print(f"full parse: {full_time:8.2f} s  ({full_time / count * 1e6:8.1f} µs/file)")
+    print(f"fast path:  {fast_time:8.2f} s  ({fast_time / count * 1e6:8.1f} µs/file, {fallbacks} fallbacks)")
+    print(f"speedup:    {full_time / fast_time:8.2f}x")
+    if mismatches:
+        print(f"❌ {mismatches} rule(s) differ between full and fast parsing")
+        sys.exit(1)
+    print("✅ fast path output matches full parsing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the CLI entry points.
+
+Runs each command under `python -X importtime`, sums the reported import times and checks
+that parse-only runs (--help) stay under a time budget and never load the network stack
+(httpx, the HMAC client, the BloodHound API client), which only the server commands need.
+
+    python3 benchmarks/bench_startup.py --max-ms 150
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (command line, top-level modules that must not be imported by it)
+COMMANDS = [
+    (["BloodSOCer.py", "-h"], {"httpx", "auth", "blood_hound_api_client", "asyncio", "yaml"}),
+    (["MitreHound.py", "-h"], {"httpx", "auth", "blood_hound_api_client"}),
+    (["ARTHound.py", "-h"], {"httpx", "auth", "blood_hound_api_client"}),
+    (["SigmaHound.py", "-h"], {"httpx", "auth", "blood_hound_api_client"}),
+]
+
+
+def parse_importtime(stderr):
+    """Return (total self time in µs, set of imported top-level module names) from -X importtime output."""
+    total = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        total += int(fields[0])
+        modules.add(fields[2].strip().split(".")[0])
+    return total, modules
+
+
+def time_command(argv, repeat):
+    """Best wall time (s) and import time (µs) over repeat runs, plus the imported modules."""
+    best_wall = best_import = None
+    modules = set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime"] + argv,
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+        )
+        wall = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(f"{' '.join(argv)} exited with status {proc.returncode}:\n{proc.stderr[-2000:]}")
+        import_us, modules = parse_importtime(proc.stderr)
+        best_wall = wall if best_wall is None else min(best_wall, wall)
+        best_import = import_us if best_import is None else min(best_import, import_us)
+    return best_wall, best_import, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup with -X importtime.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command (best time is kept)")
+    parser.add_argument("--max-ms", type=float, default=150.0,
+                        help="Fail if the import time of a command exceeds this many milliseconds")
+    args = parser.parse_args()
+
+    failed = False
+    for argv, forbidden in COMMANDS:
+        wall, import_us, modules = time_command(argv, args.repeat)
+        name = " ".join(argv)
+        print(f"{name:<20} wall={wall * 1000:7.1f} ms  imports={import_us / 1000:7.1f} ms  modules={len(modules)}")
+
+        loaded = sorted(forbidden & modules)
+        if loaded:
+            print(f"   ❌ imports {', '.join(loaded)} although it does not need them")
+            failed = True
+        if import_us / 1000 > args.max_ms:
+            print(f"   ❌ import time above {args.max_ms:.0f} ms")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ CLI startup within budget")
+
+
+if __name__ == "__main__":
+    main()
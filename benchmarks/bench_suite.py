@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite covering every hound stage on synthetic corpora.
+
+Generates a STIX bundle, an Atomic Red Team tree and a Sigma rule tree at the requested
+scale (see synthetic.py), then times MITRE extraction from disk, ART and Sigma parsing,
+graph writing, validation, merging and the upload against a local mock of the BloodHound
+endpoints. No network access is needed. Results are written as JSON so CI can compare a
+run with a stored baseline:
+
+    python3 benchmarks/bench_suite.py --scale 2 --output bench.json
+    python3 benchmarks/bench_suite.py --scale 2 --baseline bench.json --max-regression 0.25
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ARTHound  # noqa: E402
+import MitreHound  # noqa: E402
+import SigmaHound  # noqa: E402
+from GraphMerge import merge_graphs  # noqa: E402
+from GraphValidation import validate_graphs  # noqa: E402
+from GraphWriter import write_graph  # noqa: E402
+from mock_bloodhound import start_mock_bloodhound  # noqa: E402
+from synthetic import make_art_tree, make_sigma_tree, make_stix_bundle  # noqa: E402
+
+
+def best_time(func, repeat):
+    """Best wall time over repeat calls of func (garbage collector off), and its last result."""
+    best = None
+    result = None
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best, result
+
+
+def record(results, stage, seconds, items, unit):
+    results[stage] = {
+        "seconds": round(seconds, 6),
+        "items": items,
+        "unit": unit,
+        "per_second": round(items / seconds, 1) if seconds else None,
+    }
+    print(f"{stage:<18} {seconds * 1000:10.1f} ms  {items:>9} {unit:<7} {items / seconds if seconds else 0:12.0f} {unit}/s")
+
+
+def run_suite(scale, repeat, workers, work_dir):
+    results = {}
+
+    bundle_path = os.path.join(work_dir, "enterprise-attack.json")
+    bundle = make_stix_bundle(scale)
+    with open(bundle_path, "w", encoding="utf-8") as fh:
+        json.dump(bundle, fh)
+    objects = len(bundle["objects"])
+    del bundle
+    atomics_dir = make_art_tree(work_dir, scale)
+    sigma_dir = make_sigma_tree(work_dir, scale)
+
+    seconds, (mitre_nodes, mitre_edges) = best_time(
+        lambda: MitreHound.extract_graph(MitreHound.iter_stix_objects(bundle_path)), repeat
+    )
+    record(results, "mitre_extract", seconds, objects, "objects")
+
+    art_paths = ARTHound.list_art_files(atomics_dir)
+    seconds, art_results = best_time(lambda: ARTHound.parse_art_files(art_paths, workers=1), repeat)
+    record(results, "art_parse", seconds, len(art_paths), "files")
+    if workers > 1:
+        seconds, art_results = best_time(lambda: ARTHound.parse_art_files(art_paths, workers=workers), repeat)
+        record(results, "art_parse_pool", seconds, len(art_paths), "files")
+    art_nodes, art_edges, _, _ = ARTHound.merge_art_results(art_results)
+
+    sigma_paths = SigmaHound.list_sigma_files(sigma_dir)
+    for stage, fast in (("sigma_parse", True), ("sigma_parse_full", False)):
+        seconds, sigma_results = best_time(
+            lambda: [SigmaHound.parse_sigma_rule(path, fast=fast) for path in sigma_paths], repeat
+        )
+        record(results, stage, seconds, len(sigma_paths), "files")
+    sigma_nodes = [node for node, _ in sigma_results if node]
+    sigma_edges = [edge for node, edges in sigma_results if node for edge in edges]
+
+    graphs = [
+        (os.path.join(work_dir, "mitrehound_graph.json"), mitre_nodes, mitre_edges),
+        (os.path.join(work_dir, "arthound_graph.json"), art_nodes, art_edges),
+        (os.path.join(work_dir, "sigmahound_graph.json"), sigma_nodes, sigma_edges),
+    ]
+    items = sum(len(nodes) + len(edges) for _, nodes, edges in graphs)
+    seconds, _ = best_time(lambda: [write_graph(path, nodes, edges) for path, nodes, edges in graphs], repeat)
+    record(results, "graph_write", seconds, items, "items")
+    paths = [path for path, _, _ in graphs]
+
+    seconds, _ = best_time(lambda: validate_graphs(paths, os.path.join(work_dir, "validated")), repeat)
+    record(results, "validate", seconds, items, "items")
+
+    merged_path = os.path.join(work_dir, "bloodsocer_graph.json")
+    seconds, _ = best_time(lambda: merge_graphs(paths, merged_path), repeat)
+    record(results, "merge", seconds, items, "items")
+
+    results.update(run_upload_stage(paths, repeat))
+    return results
+
+
+def run_upload_stage(paths, repeat):
+    """Time UploadEngine against the mock server; skipped when httpx or the HMAC client is missing."""
+    try:
+        import asyncio
+        from UploadEngine import upload_graphs
+    except ImportError as exc:
+        print(f"upload             skipped ({exc})")
+        return {"upload": {"skipped": str(exc)}}
+
+    server, base_url = start_mock_bloodhound()
+    try:
+        seconds, report = best_time(
+            lambda: asyncio.run(upload_graphs(paths, base_url=base_url, token_key="bench", token_id="bench")), repeat
+        )
+    finally:
+        server.shutdown()
+    if report is None or any(item["status"] != "uploaded" for item in report):
+        raise RuntimeError(f"upload to the mock server failed: {report}")
+
+    results = {}
+    size = sum(os.path.getsize(path) for path in paths)
+    record(results, "upload", seconds, size // 1024, "KiB")
+    return results
+
+
+def compare(results, baseline, max_regression):
+    """Print stages slower than baseline by more than max_regression (a fraction). Returns their names."""
+    regressions = []
+    for stage, result in results.items():
+        base = baseline.get("results", {}).get(stage, {})
+        if "seconds" not in result or "seconds" not in base or not base["seconds"]:
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        if ratio > 1 + max_regression:
+            regressions.append(stage)
+            print(f"❌ {stage}: {ratio:.2f}x the baseline time ({base['seconds'] * 1000:.1f} ms)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every hound stage on synthetic corpora.")
+    parser.add_argument("--scale", type=int, default=1, help="Corpus scale factor (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (best time is kept)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for the pooled ART stage (default: number of CPUs, 1 skips it)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Results JSON of a previous run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="With --baseline, fail if a stage is slower by more than this fraction (default: 0.25)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bloodsocer-bench-") as work_dir:
+        results = run_suite(args.scale, args.repeat, args.workers, work_dir)
+
+    report = {
+        "scale": args.scale,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if baseline.get("scale") != args.scale:
+            print(f"[WARN] baseline was recorded at scale {baseline.get('scale')}, this run uses {args.scale}")
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
+        print("✅ No stage regressed beyond the allowed margin")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Minimal local stand-in for the BloodHound endpoints BloodSOCer talks to, for benchmarks.
+
+Accepts upload jobs (start / upload / end), reports every job as complete, answers Cypher
+statements, keeps the saved queries and custom node types it is sent (create and update)
+and counts the requests, writes and bytes it received. Given a token_key, it also checks
+the BloodHound HMAC signature of every request (body included) and answers 401 when it
+does not match.
+
+    server, base_url = start_mock_bloodhound()
+    ...
+    server.shutdown()
+"""
+
+import base64
+import hashlib
+import hmac
+import http.server
+import json
+import threading
+import urllib.parse
+
+
+class MockBloodHoundHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def read_body(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(body)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def signature_valid(self, body):
+        """Check the bhesignature headers against server.token_key (always valid without one)."""
+        token_key = self.server.token_key
+        if token_key is None:
+            return True
+        request_date = self.headers.get("RequestDate", "")
+        operation = hmac.new(token_key.encode("utf-8"), f"{self.command}{self.path}".encode("utf-8"), hashlib.sha256)
+        dated = hmac.new(operation.digest(), request_date[:13].encode("utf-8"), hashlib.sha256)
+        expected = base64.b64encode(hmac.new(dated.digest(), body, hashlib.sha256).digest()).decode("ascii")
+        return hmac.compare_digest(expected, self.headers.get("Signature", ""))
+
+    def reply(self, status, payload=None):
+        body = json.dumps(payload if payload is not None else {}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["requests"] += 1
+        if not self.signature_valid(b""):
+            self.reply(401)
+            return
+        if self.path.startswith("/api/v2/file-upload"):
+            jobs = [{"id": job_id, "status": 2, "status_message": "Complete"} for job_id in range(1, stats["jobs"] + 1)]
+            self.reply(200, {"data": jobs})
+        elif self.path.startswith("/api/v2/saved-queries"):
+            query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+            skip = int(query.get("skip", ["0"])[0])
+            limit = int(query.get("limit", ["100"])[0])
+            self.reply(200, {"data": stats["saved_queries"][skip:skip + limit]})
+        elif self.path.startswith("/api/v2/custom-nodes"):
+            self.reply(200, {"data": stats["custom_nodes"]})
+        else:
+            self.reply(404)
+
+    def do_POST(self):
+        body = self.read_body()
+        if not self.signature_valid(body):
+            self.reply(401)
+            return
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["requests"] += 1
+            stats["bytes"] += len(body)
+            if self.command in ("POST", "PUT") and self.path.startswith("/api/v2/saved-queries"):
+                stats["writes"] += 1
+                self.save_query(stats, json.loads(body or b"{}"))
+            elif self.command in ("POST", "PUT") and self.path.startswith("/api/v2/custom-nodes"):
+                stats["writes"] += 1
+                self.save_custom_nodes(stats, json.loads(body or b"{}"))
+            if self.path == "/api/v2/file-upload/start":
+                stats["jobs"] += 1
+                job_id = stats["jobs"]
+            elif self.path.startswith("/api/v2/file-upload/") and not self.path.endswith("/end"):
+                stats["files"] += 1
+        if self.path == "/api/v2/file-upload/start":
+            self.reply(201, {"data": {"id": job_id}})
+        elif self.path.startswith("/api/v2/file-upload/"):
+            self.reply(202 if not self.path.endswith("/end") else 200)
+        else:
+            self.reply(200, {"data": {}})
+
+    do_PUT = do_POST
+
+    def save_query(self, stats, query):
+        """Record an imported (POST) or updated (PUT /api/v2/saved-queries/<id>) saved query."""
+        saved = stats["saved_queries"]
+        if self.command == "PUT":
+            saved_id = int(self.path.rsplit("/", 1)[1])
+            for entry in saved:
+                if entry["id"] == saved_id:
+                    entry.update(query)
+            return
+        saved.append(dict(query, id=len(saved) + 1))
+
+    def save_custom_nodes(self, stats, payload):
+        """Record created (POST {"custom_types"}) or updated (PUT /api/v2/custom-nodes/<kind>) custom types."""
+        nodes = stats["custom_nodes"]
+        if self.command == "PUT":
+            kind = urllib.parse.unquote(self.path.rsplit("/", 1)[1])
+            for entry in nodes:
+                if entry["kindName"] == kind:
+                    entry["config"] = payload.get("config") or {}
+            return
+        for kind, config in (payload.get("custom_types") or {}).items():
+            nodes.append({"id": len(nodes) + 1, "kindName": kind, "config": config})
+
+
+def start_mock_bloodhound(token_key=None):
+    """
+    Serve the mock on a free local port in a background thread. Returns (server, base_url).
+    With token_key, requests must carry a valid HMAC signature for that key.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), MockBloodHoundHandler)
+    server.daemon_threads = True
+    server.token_key = token_key
+    server.stats = {
+        "lock": threading.Lock(),
+        "requests": 0,
+        "bytes": 0,
+        "jobs": 0,
+        "files": 0,
+        "writes": 0,
+        "saved_queries": [],
+        "custom_nodes": [],
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
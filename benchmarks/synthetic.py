@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Synthetic inputs for the benchmarks: STIX bundles, Atomic Red Team trees and Sigma rule
+trees shaped like the real sources, generated deterministically at a given scale.
+"""
+
+import os
+import random
+import uuid
+
+TACTICS = ["initial-access", "execution", "persistence", "privilege-escalation", "defense-evasion"]
+
+# Ids are uuid5 names under one namespace per source, so ART test guids and Sigma rule ids
+# never collide (merge and validation would otherwise see fake duplicates)
+ART_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/redcanaryco/atomic-red-team")
+SIGMA_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/SigmaHQ/sigma")
+
+
+def make_stix_bundle(scale=1, seed=1337):
+    """
+    Build a synthetic enterprise-attack-like bundle.
+    scale=1 is ~500 techniques, 100 tools, 50 groups and 5000 relationships.
+    """
+    rnd = random.Random(seed)
+    objects = []
+
+    for i, shortname in enumerate(TACTICS):
+        objects.append({
+            "type": "x-mitre-tactic",
+            "id": f"x-mitre-tactic--{i}",
+            "name": shortname,
+            "x_mitre_shortname": shortname,
+            "created": "2020-01-01T00:00:00Z",
+            "modified": "2020-01-01T00:00:00Z",
+            "external_references": [{"source_name": "mitre-attack", "external_id": f"TA{i:04d}"}],
+        })
+
+    techniques = []
+    for i in range(500 * scale):
+        ext_id = f"T{1000 + i // 4:04d}" if i % 4 == 0 else f"T{1000 + i // 4:04d}.{i % 4:03d}"
+        stix_id = f"attack-pattern--{i}"
+        techniques.append(stix_id)
+        objects.append({
+            "type": "attack-pattern",
+            "id": stix_id,
+            "name": f"Technique {i}",
+            "external_references": [{"source_name": "mitre-attack", "external_id": ext_id}],
+            "kill_chain_phases": [{"kill_chain_name": "mitre-attack", "phase_name": rnd.choice(TACTICS)}],
+        })
+
+    sources = []
+    for i in range(100 * scale):
+        stix_id = f"tool--{i}"
+        sources.append(stix_id)
+        objects.append({
+            "type": "tool",
+            "id": stix_id,
+            "name": f"Tool {i}",
+            "created": "2020-01-01T00:00:00Z",
+            "modified": "2021-01-01T00:00:00Z",
+            "external_references": [{"source_name": "mitre-attack", "external_id": f"S{i:04d}"}],
+        })
+    for i in range(50 * scale):
+        stix_id = f"intrusion-set--{i}"
+        sources.append(stix_id)
+        objects.append({
+            "type": "intrusion-set",
+            "id": stix_id,
+            "name": f"Group {i}",
+            "external_references": [{"source_name": "mitre-attack", "external_id": f"G{i:04d}"}],
+        })
+
+    for i in range(5000 * scale):
+        objects.append({
+            "type": "relationship",
+            "id": f"relationship--{i}",
+            "relationship_type": "uses",
+            "source_ref": rnd.choice(sources),
+            "target_ref": rnd.choice(techniques),
+        })
+
+    return {"type": "bundle", "objects": objects}
+
+
+def make_art_tree(root, scale=1, seed=1337):
+    """
+    Write an atomics/ tree under root: scale=1 is 200 technique folders of 1-8 tests each.
+    Returns the path of the atomics directory.
+    """
+    rnd = random.Random(seed)
+    atomics_dir = os.path.join(root, "atomics")
+    for i in range(200 * scale):
+        technique = f"T{1000 + i // 4:04d}" if i % 4 == 0 else f"T{1000 + i // 4:04d}.{i % 4:03d}"
+        folder = os.path.join(atomics_dir, technique)
+        os.makedirs(folder, exist_ok=True)
+        lines = [f"attack_technique: {technique}", f"display_name: Technique {i}", "atomic_tests:"]
+        for j in range(rnd.randint(1, 8)):
+            lines += [
+                f"- name: Atomic test {j} for {technique}",
+                f"  auto_generated_guid: {uuid.uuid5(ART_NAMESPACE, f'{technique}/{j}')}",
+                "  description: |",
+                f"    Synthetic atomic test {j} exercising {technique}.",
+                "    It spans several lines like the real descriptions do.",
+                "  supported_platforms:",
+                "  - windows",
+                "  input_arguments:",
+                "    output_file:",
+                "      description: Where the output goes",
+                "      type: path",
+                f"      default: C:\\Temp\\out_{j}.txt",
+                "  executor:",
+                "    name: powershell",
+                "    elevation_required: false",
+                "    command: |",
+                f"      Write-Host \"test {j}\" > #{{output_file}}",
+            ]
+        with open(os.path.join(folder, technique + ".yaml"), "w", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    return atomics_dir
+
+
+def make_sigma_tree(root, scale=1, seed=1337):
+    """
+    Write a rules/windows tree under root: scale=1 is 1000 rules in 20 folders, each with
+    1-3 ATT&CK tags and a detection block. Returns the path of the rules/windows directory.
+    """
+    rnd = random.Random(seed)
+    rules_dir = os.path.join(root, "rules", "windows")
+    for i in range(1000 * scale):
+        folder = os.path.join(rules_dir, f"category_{i % 20:02d}")
+        os.makedirs(folder, exist_ok=True)
+        tags = ["attack.execution"] + [
+            f"attack.t{1000 + rnd.randrange(125 * scale):04d}" for _ in range(rnd.randint(1, 3))
+        ]
+        lines = [
+            f"title: Synthetic Rule {i}",
+            f"id: {uuid.uuid5(SIGMA_NAMESPACE, str(i))}",
+            "status: test",
+            f"description: Detects synthetic behaviour number {i}",
+            "references:",
+            "    - https://example.com/reference",
+            "author: Benchmark",
+            "date: 2023-01-01",
+            "modified: 2024-01-01",
+            "tags:",
+        ] + [f"    - {tag}" for tag in tags] + [
+            "logsource:",
+            "    category: process_creation",
+            "    product: windows",
+            "detection:",
+            "    selection:",
+            f"        Image|endswith: '\\tool{i}.exe'",
+            "        CommandLine|contains:",
+            "            - ' -a '",
+            "            - ' -b '",
+            "    condition: selection",
+            "falsepositives:",
+            "    - Unknown",
+            "level: high",
+        ]
+        with open(os.path.join(folder, f"rule_{i:05d}.yml"), "w", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    return rules_dir
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+GraphDelta: a second run only writes the added or changed items and turns the items that
+disappeared into Cypher deletes (edges of deleted nodes go with their node).
+
+    python3 -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GraphDelta import compute_delta, save_snapshot, snapshot_path, stale_queries  # noqa: E402
+from GraphWriter import iter_graph_items, write_graph  # noqa: E402
+
+
+def node(node_id, name):
+    return {"id": node_id, "kinds": ["Technique"], "properties": {"name": name}}
+
+
+def edge(kind, start, end):
+    return {"kind": kind, "start": {"value": start, "match_by": "id"}, "end": {"value": end, "match_by": "id"}}
+
+
+class GraphDeltaTest(unittest.TestCase):
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        self.graph = os.path.join(work_dir.name, "mitrehound_graph.json")
+        self.delta_dir = os.path.join(work_dir.name, "delta")
+        os.makedirs(self.delta_dir)
+
+    def delta(self, nodes, edges):
+        write_graph(self.graph, nodes, edges)
+        return compute_delta(self.graph, self.delta_dir)
+
+    def test_first_run_sends_everything(self):
+        delta = self.delta([node("T1", "a"), node("T2", "b")], [edge("PartOf", "T2", "T1")])
+        self.assertEqual((delta["nodes"], delta["edges"]), (2, 1))
+        self.assertEqual(stale_queries(delta), [])
+
+    def test_second_run_sends_changes_and_deletes_stale_items(self):
+        first = self.delta(
+            [node("T1", "a"), node("T2", "b"), node("T3", "c")],
+            [edge("PartOf", "T2", "T1"), edge("PartOf", "T3", "T1"), edge("Uses", "T1", "T2")],
+        )
+        save_snapshot(self.graph, first["snapshot"])
+        self.assertTrue(os.path.exists(snapshot_path(self.graph)))
+
+        # T2 renamed, T3 (and its PartOf edge) gone, Uses T1 -> T2 dropped
+        delta = self.delta([node("T1", "a"), node("T2", "renamed")], [edge("PartOf", "T2", "T1")])
+        self.assertEqual([item["id"] for item in iter_graph_items(delta["delta_path"], "nodes")], ["T2"])
+        self.assertEqual(list(iter_graph_items(delta["delta_path"], "edges")), [])
+        self.assertEqual(delta["stale_nodes"], ["T3"])
+        self.assertEqual(delta["stale_edges"], [["Uses", "T1", "id", "T2", "id"]])
+        self.assertEqual(stale_queries(delta), [
+            'MATCH (n) WHERE n.objectid IN ["T3"] DETACH DELETE n',
+            'MATCH (a)-[r:`Uses`]->(b) WHERE a.objectid = "T1" AND b.objectid IN ["T2"] DELETE r',
+        ])
+
+    def test_unchanged_graph_has_no_delta(self):
+        nodes, edges = [node("T1", "a")], [edge("PartOf", "T1", "T1")]
+        save_snapshot(self.graph, self.delta(nodes, edges)["snapshot"])
+        delta = self.delta(nodes, edges)
+        self.assertIsNone(delta["delta_path"])
+        self.assertEqual(stale_queries(delta), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
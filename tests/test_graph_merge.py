@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+GraphMerge: duplicate nodes and edges fold into the first one seen (earlier values win,
+empty ones are filled in, lists and kinds are unioned) and source kinds become node kinds.
+
+    python3 -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GraphMerge import MERGED_SOURCE_KIND, merge_graphs  # noqa: E402
+from GraphWriter import iter_graph_items, read_graph_metadata, write_graph  # noqa: E402
+
+
+def edge(kind, start, end, **properties):
+    item = {"kind": kind, "start": {"value": start, "match_by": "id"}, "end": {"value": end, "match_by": "id"}}
+    if properties:
+        item["properties"] = properties
+    return item
+
+
+class GraphMergeTest(unittest.TestCase):
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        self.dir = work_dir.name
+
+    def graph(self, name, nodes, edges, source_kind=None):
+        path = os.path.join(self.dir, name)
+        write_graph(path, nodes, edges, metadata={"source_kind": source_kind} if source_kind else None)
+        return path
+
+    def test_earlier_graph_wins_and_lists_are_unioned(self):
+        first = self.graph("first.json", [
+            {"id": "T1", "kinds": ["Technique"], "properties": {"name": "First", "description": "", "tags": ["a", "b"]}},
+        ], [edge("PartOf", "T1", "TA1", source="first")], source_kind="Mitre")
+        second = self.graph("second.json", [
+            {"id": "T1", "kinds": ["Technique", "Windows"],
+             "properties": {"name": "Second", "description": "filled in", "tags": ["b", "c"], "extra": 1}},
+            {"id": "R1", "kinds": ["Rule"], "properties": {"name": "Rule"}},
+        ], [edge("PartOf", "T1", "TA1", source="second"), edge("DetectedBy", "T1", "R1")])
+
+        out_path = os.path.join(self.dir, "merged.json")
+        stats = merge_graphs([first, second], out_path)
+        self.assertEqual(stats, {"nodes": 2, "edges": 2, "duplicate_nodes": 1, "duplicate_edges": 1})
+
+        nodes = {item["id"]: item for item in iter_graph_items(out_path, "nodes")}
+        self.assertEqual(nodes["T1"]["kinds"], ["Technique", "Mitre", "Windows"])
+        self.assertEqual(nodes["T1"]["properties"], {
+            "name": "First", "description": "filled in", "tags": ["a", "b", "c"], "extra": 1,
+        })
+        self.assertEqual(nodes["R1"]["kinds"], ["Rule"])
+        edges = list(iter_graph_items(out_path, "edges"))
+        self.assertEqual([item["properties"] for item in edges if item["kind"] == "PartOf"], [{"source": "first"}])
+        self.assertEqual(read_graph_metadata(out_path), {"source_kind": MERGED_SOURCE_KIND})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+GraphQuery: the saved queries in Cyphers/ run offline against a small graph, with the
+shortest paths found by the breadth-first search.
+
+    python3 -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from GraphQuery import GraphIndex, load_saved_queries, run_query, serialize_row  # noqa: E402
+from GraphWriter import write_graph  # noqa: E402
+
+
+def node(node_id, kind, name):
+    return {"id": node_id, "kinds": [kind], "properties": {"name": name}}
+
+
+def edge(kind, start, end):
+    return {"kind": kind, "start": {"value": start, "match_by": "id"}, "end": {"value": end, "match_by": "id"}}
+
+
+class GraphQueryTest(unittest.TestCase):
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        path = os.path.join(work_dir.name, "mitrehound_graph.json")
+        write_graph(path, [
+            node("G1", "TA_Group", "FIN7"),
+            node("G2", "TA_Group", "APT1"),
+            node("S1", "Software", "Carbanak"),
+            node("T1", "Technique", "Command Interpreter"),
+            node("T2", "Technique", "Phishing"),
+            node("TA1", "Tactic", "Execution"),
+            node("TA2", "Tactic", "Initial Access"),
+        ], [
+            edge("Uses", "G1", "S1"),
+            edge("Uses", "S1", "T1"),
+            edge("Uses", "G1", "T1"),
+            edge("PartOf", "T1", "TA1"),
+            edge("Uses", "G2", "T2"),
+            edge("PartOf", "T2", "TA2"),
+        ])
+        self.graph = GraphIndex([path])
+
+    def saved_query(self, name):
+        return load_saved_queries([os.path.join(ROOT, "Cyphers", name)])[0][1]["query"]
+
+    def test_shortest_paths_from_a_group_to_its_tactics(self):
+        rows = run_query(self.graph, self.saved_query("FIN7-Tactics.json"))
+        # the direct Uses edge is shorter than the way through the software; APT1's tactic is not reached
+        self.assertEqual([serialize_row(self.graph, row) for row in rows], [{"p": ["G1", "Uses", "T1", "PartOf", "TA1"]}])
+
+    def test_names_are_matched_upper_cased(self):
+        rows = run_query(self.graph, 'MATCH p=shortestPath((s:TA_Group)-[*1..]->(t)) WHERE t.name CONTAINS "phish" RETURN s')
+        self.assertEqual([serialize_row(self.graph, row) for row in rows], [])
+        rows = run_query(self.graph, 'MATCH p=shortestPath((s:TA_Group)-[*1..]->(t)) WHERE t.name CONTAINS "PHISH" RETURN s')
+        self.assertEqual([serialize_row(self.graph, row) for row in rows], [{"s": "G2"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
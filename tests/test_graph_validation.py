@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+GraphValidation: dangling edges (also against a wrong endpoint kind) and edges repeated
+within or across graphs are dropped, endpoints in known graphs count, and
+single_direction drops the HasTTP edges that mirror a PartOf.
+
+    python3 -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GraphValidation import validate_graphs  # noqa: E402
+from GraphWriter import iter_graph_items, write_graph  # noqa: E402
+
+
+def edge(kind, start, end, end_kind=None):
+    end_ref = {"value": end, "match_by": "id"}
+    if end_kind:
+        end_ref["kind"] = end_kind
+    return {"kind": kind, "start": {"value": start, "match_by": "id"}, "end": end_ref}
+
+
+class GraphValidationTest(unittest.TestCase):
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        self.dir = work_dir.name
+        self.mitre = os.path.join(self.dir, "mitrehound_graph.json")
+        self.sigma = os.path.join(self.dir, "sigmahound_graph.json")
+        self.playbooks = os.path.join(self.dir, "playbooks_graph.json")
+        write_graph(self.mitre, [
+            {"id": "TA1", "kinds": ["Tactic"], "properties": {"name": "Execution"}},
+            {"id": "T1", "kinds": ["Technique"], "properties": {"name": "Command"}},
+        ], [
+            edge("PartOf", "T1", "TA1"),
+            edge("HasTTP", "TA1", "T1"),
+            edge("PartOf", "T1", "TA9"),              # dangling: TA9 is not defined anywhere
+        ])
+        write_graph(self.sigma, [{"id": "R1", "kinds": ["Rule"], "properties": {"name": "Rule"}}], [
+            edge("DetectedBy", "T1", "R1"),
+            edge("DetectedBy", "T1", "R1"),           # duplicate within the graph
+            edge("PartOf", "T1", "TA1"),              # duplicate of a Mitre edge
+            edge("DetectedBy", "T1", "TA1", "Rule"),  # TA1 exists, but is not a Rule
+            edge("Handles", "PB1", "T1"),             # PB1 only exists in the known playbooks graph
+        ])
+        write_graph(self.playbooks, [{"id": "PB1", "kinds": ["Playbook"], "properties": {"name": "PB"}}], [])
+
+    def validate(self, single_direction=False):
+        out_dir = os.path.join(self.dir, "validated")
+        results = validate_graphs([self.mitre, self.sigma], out_dir, [self.playbooks], single_direction)
+        edges = {
+            os.path.basename(out_path): [(item["kind"], item["start"]["value"], item["end"]["value"])
+                                         for item in iter_graph_items(out_path, "edges")]
+            for out_path, _ in results
+        }
+        return [stats for _, stats in results], edges
+
+    def test_dangling_and_duplicate_edges_are_dropped(self):
+        (mitre, sigma), edges = self.validate()
+        self.assertEqual((mitre["dangling"], mitre["duplicate"], mitre["redundant"]), (1, 0, 0))
+        self.assertEqual((sigma["dangling"], sigma["duplicate"], sigma["redundant"]), (1, 2, 0))
+        self.assertEqual(edges["mitrehound_graph.json"], [("PartOf", "T1", "TA1"), ("HasTTP", "TA1", "T1")])
+        self.assertEqual(edges["sigmahound_graph.json"], [("DetectedBy", "T1", "R1"), ("Handles", "PB1", "T1")])
+
+    def test_single_direction_drops_mirrored_edges(self):
+        (mitre, _), edges = self.validate(single_direction=True)
+        self.assertEqual(mitre["redundant"], 1)
+        self.assertEqual(edges["mitrehound_graph.json"], [("PartOf", "T1", "TA1")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+MitreHound download cache against a local stand-in for GitHub: full download, 304
+revalidation and re-download of a cached bundle whose checksum no longer matches.
+
+    python3 -m unittest discover tests
+"""
+
+import http.server
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import MitreHound  # noqa: E402
+
+BUNDLE = json.dumps({"type": "bundle", "objects": [{"type": "x-mitre-tactic", "id": "x"}]}).encode("utf-8")
+ETAG = '"bundle-v1"'
+
+
+class BundleHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/commits":
+            body = json.dumps([{"commit": {"message": "ATT&CK v1.0"}}]).encode("utf-8")
+        elif self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        else:
+            body = BUNDLE
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MitreDownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), BundleHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        self.commits_url = base + "/commits"
+        self.stix_url = base + "/enterprise-attack.json"
+        self.cache = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.cache.name, "enterprise-attack-1.0.json")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache.cleanup()
+
+    def download(self):
+        return MitreHound.download_file(commits_url=self.commits_url, stix_url=self.stix_url, cache_dir=self.cache.name)
+
+    def bundle_requests(self):
+        return [request for request in self.server.requests if request[0] != "/commits"]
+
+    def test_download_writes_bundle_meta_and_mode(self):
+        self.assertEqual(self.download(), self.path)
+        with open(self.path, "rb") as fh:
+            self.assertEqual(fh.read(), BUNDLE)
+        meta = MitreHound.read_cache_meta(self.path)
+        self.assertEqual(meta["etag"], ETAG)
+        self.assertEqual(meta["size"], len(BUNDLE))
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o644)
+        self.assertEqual([name for name in os.listdir(self.cache.name) if name.endswith(".part")], [])
+
+    def test_cached_version_is_not_downloaded_again(self):
+        self.download()
+        self.download()
+        self.assertEqual(len(self.bundle_requests()), 1)
+
+    def test_not_modified_keeps_meta(self):
+        meta = MitreHound.fetch_to_cache(self.stix_url, self.path, {})
+        self.assertIs(MitreHound.fetch_to_cache(self.stix_url, self.path, meta), meta)
+        self.assertEqual(self.bundle_requests()[-1], ("/enterprise-attack.json", ETAG))
+
+    def test_corrupt_cache_is_downloaded_again(self):
+        self.download()
+        with open(self.path, "wb") as fh:
+            fh.write(b"corrupt")
+        self.download()
+        with open(self.path, "rb") as fh:
+            self.assertEqual(fh.read(), BUNDLE)
+        # revalidation answers 304, so the checksum mismatch forces an unconditional fetch
+        self.assertEqual([etag for _, etag in self.bundle_requests()], [None, ETAG, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+StageProfiler: a nested stage does not hide the memory peak of the stage around it, and
+a hound run in a forked worker while BloodSOCer has a profiled stage open still profiles
+its own stages.
+
+    python3 -m unittest discover tests
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Hound import HOUND_REGISTRY, Hound, run_hound_worker  # noqa: E402
+from Profiler import StageProfiler  # noqa: E402
+
+
+class ProfiledHound(Hound):
+    name = "profiled_test"
+
+    def run(self, args):
+        with args.profiler.stage("work"):
+            sum(range(100000))
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.work_dir.cleanup)
+        HOUND_REGISTRY[ProfiledHound.name] = ProfiledHound()
+        self.addCleanup(HOUND_REGISTRY.pop, ProfiledHound.name)
+
+    def test_nested_stage_keeps_outer_peak(self):
+        profiler = StageProfiler(enabled=True)
+        with profiler.stage("outer"):
+            block = bytearray(8 << 20)
+            del block
+            with profiler.stage("inner"):
+                pass
+        profiler.write_report(os.path.join(self.work_dir.name, "profile", "nested.json"))
+
+        peaks = {stage["name"]: stage["tracemalloc_peak_kb"] for stage in profiler.stages}
+        self.assertGreaterEqual(peaks["outer"], 8 << 10)
+        self.assertLess(peaks["inner"], 8 << 10)
+
+    def test_worker_stages_get_their_own_cprofile(self):
+        profiler = StageProfiler(enabled=True, cprofile=True)
+        argv = ["--profile", "--cprofile"]
+        # the worker is forked while the parent's profiled stage is open, as under --all
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as pool:
+            with profiler.stage("hounds"):
+                code = pool.submit(run_hound_worker, ProfiledHound.name, argv, self.work_dir.name).result()
+        profiler.write_report(os.path.join(self.work_dir.name, "profile", "parent.json"))
+
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.work_dir.name, "profile", "profiled_test.work.prof")))
+
+
+if __name__ == "__main__":
+    unittest.main()
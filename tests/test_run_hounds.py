@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+run_hounds_async with stand-in hounds: a hound whose worker process is killed (as by the
+OOM killer) fails on its own while the other hounds still write their graphs.
+
+    python3 -m unittest discover tests
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import BloodSOCer  # noqa: E402
+from GraphWriter import iter_graph_items, write_graph  # noqa: E402
+
+
+class StandInHound:
+    def __init__(self, name):
+        self.graph_file = f"{name}_graph.json"
+
+
+def stand_in_worker(name, argv=None, output_dir=None):
+    """Worker entry point: "killed" dies at once, the others write a graph a bit later."""
+    if name == "killed":
+        os.kill(os.getpid(), signal.SIGKILL)
+    time.sleep(0.5)
+    node = {"id": name, "kinds": ["Rule"], "properties": {"name": name}}
+    write_graph(os.path.join(output_dir, f"{name}_graph.json"), [node], [])
+    return 0
+
+
+class RunHoundsTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.work_dir.cleanup)
+        hounds = {name: StandInHound(name) for name in ("mitre", "killed", "sigma")}
+        for target, value in (
+            ("load_hounds", lambda: hounds),
+            ("run_hound_worker", stand_in_worker),
+            ("OUTPUT_DIR", self.work_dir.name),
+        ):
+            patcher = mock.patch.object(BloodSOCer, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_killed_worker_only_fails_its_hound(self):
+        exit_codes, report = asyncio.run(BloodSOCer.run_hounds_async())
+        self.assertEqual(report, [])
+        self.assertEqual(exit_codes, {"mitre": 0, "killed": 1, "sigma": 0})
+        for name in ("mitre", "sigma"):
+            path = os.path.join(self.work_dir.name, f"{name}_graph.json")
+            self.assertEqual([node["id"] for node in iter_graph_items(path, "nodes")], [name])
+        self.assertFalse(os.path.exists(os.path.join(self.work_dir.name, "killed_graph.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+UL-Cyphers against the mock BloodHound server with signature checks on: new queries are
+imported and changed ones updated concurrently, unchanged ones are left alone.
+
+    python3 -m unittest discover tests
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from helpers import ROOT, TOKEN_KEY, MockBloodHoundTestCase  # noqa: E402
+
+spec = importlib.util.spec_from_file_location("ul_cyphers", os.path.join(ROOT, "UL-Cyphers.py"))
+ul_cyphers = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ul_cyphers)
+
+
+def saved_query(name, query, description=""):
+    return ("test.json", {"name": name, "query": query, "description": description})
+
+
+class SavedQueriesTest(MockBloodHoundTestCase):
+    def sync(self, queries, token_key=TOKEN_KEY):
+        return asyncio.run(ul_cyphers.sync_saved_queries(
+            queries, concurrency=4, retries=0, **self.credentials(token_key)
+        ))
+
+    def server_queries(self):
+        return {saved["name"]: saved["query"] for saved in self.server.stats["saved_queries"]}
+
+    def test_import_then_update(self):
+        first = [saved_query(f"Q{i}", f"MATCH (n) RETURN n LIMIT {i}") for i in range(5)]
+        self.assertEqual(self.sync(first), 0)
+        self.assertEqual(self.server.stats["writes"], 5)
+
+        second = first[:3] + [saved_query("Q3", "MATCH (n:Rule) RETURN n"), saved_query("Q5", "MATCH (n) RETURN n")]
+        self.assertEqual(self.sync(second), 0)
+        # Q3 updated in place, Q5 imported, the rest untouched
+        self.assertEqual(self.server.stats["writes"], 7)
+        self.assertEqual(len(self.server.stats["saved_queries"]), 6)
+        self.assertEqual(self.server_queries()["Q3"], "MATCH (n:Rule) RETURN n")
+
+        self.assertEqual(self.sync(second), 0)
+        self.assertEqual(self.server.stats["writes"], 7)
+
+    def test_wrong_key_is_rejected(self):
+        self.assertIsNone(self.sync([saved_query("Q", "MATCH (n) RETURN n")], token_key="wrong-key"))
+        self.assertEqual(self.server.stats["saved_queries"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
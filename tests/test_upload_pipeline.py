@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+upload_pipeline against the mock BloodHound server: graphs whose producers finish first
+must not have their edges uploaded before the nodes of a later graph, and a failed job
+still waits for every producer.
+
+    python3 -m unittest discover tests
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from GraphWriter import write_graph  # noqa: E402
+from helpers import TOKEN_KEY, MockBloodHoundTestCase, UploadEngine  # noqa: E402
+
+
+def make_graphs(directory):
+    """A Mitre-like graph of techniques and a Sigma-like graph whose edges point into it."""
+    techniques = [{"id": f"T{i}", "kinds": ["Technique", "Mitre"], "properties": {"name": f"T{i}"}} for i in range(50)]
+    rules = [{"id": f"R{i}", "kinds": ["Rule", "Windows"], "properties": {"name": f"R{i}"}} for i in range(50)]
+    part_of = [
+        {"kind": "PartOf", "start": {"value": f"T{i}", "match_by": "id"}, "end": {"value": "T0", "match_by": "id"}}
+        for i in range(1, 50)
+    ]
+    detected_by = [
+        {"kind": "DetectedBy", "start": {"value": f"T{i}", "match_by": "id"}, "end": {"value": f"R{i}", "match_by": "id"}}
+        for i in range(50)
+    ]
+    mitre = os.path.join(directory, "mitrehound_graph.json")
+    sigma = os.path.join(directory, "sigmahound_graph.json")
+    write_graph(mitre, techniques, part_of)
+    write_graph(sigma, rules, detected_by)
+    return mitre, sigma
+
+
+async def produce(path, delay, done):
+    await asyncio.sleep(delay)
+    done.append(path)
+    return path
+
+
+class UploadPipelineTest(MockBloodHoundTestCase):
+    def setUp(self):
+        super().setUp()
+        self.mitre, self.sigma = make_graphs(self.work_dir)
+        self.labels = []
+        upload_one = UploadEngine.upload_one
+
+        async def recording_upload_one(http, job_id, path, semaphore, compress, retries, label=None):
+            self.labels.append(label)
+            return await upload_one(http, job_id, path, semaphore, compress, retries, label)
+
+        UploadEngine.upload_one = recording_upload_one
+        self.addCleanup(setattr, UploadEngine, "upload_one", upload_one)
+
+    def run_pipeline(self, token_key=TOKEN_KEY, **kwargs):
+        done = []
+
+        async def main():
+            # Sigma finishes well before Mitre, whose techniques its edges point to
+            sources = [produce(self.mitre, 0.3, done), produce(self.sigma, 0.0, done)]
+            return await UploadEngine.upload_pipeline(sources, retries=0, **self.credentials(token_key), **kwargs)
+
+        return asyncio.run(main()), done
+
+    def assert_nodes_before_edges(self):
+        kinds = [".nodes-" in label for label in self.labels]
+        self.assertIn(False, kinds)
+        self.assertNotIn(True, kinds[kinds.index(False):], self.labels)
+
+    def test_edges_wait_for_every_graph_nodes(self):
+        report, _ = self.run_pipeline()
+        self.assertEqual({item["status"] for item in report}, {"uploaded"})
+        self.assertEqual(len(report), 4)
+        self.assert_nodes_before_edges()
+
+    def test_sharded_edges_wait_for_every_graph_nodes(self):
+        report, _ = self.run_pipeline(shard_size=1024)
+        self.assertEqual({item["status"] for item in report}, {"uploaded"})
+        self.assertGreater(len(report), 4)
+        self.assert_nodes_before_edges()
+
+    def test_failed_job_waits_for_every_producer(self):
+        report, done = self.run_pipeline(token_key="wrong-key")
+        self.assertIsNone(report)
+        self.assertEqual(sorted(done), sorted([self.mitre, self.sigma]))
+        self.assertEqual(self.labels, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Signed uploads against the mock BloodHound server, which checks the HMAC signature of
+every request including the streamed graph bodies (plain, gzip and zipped on the fly).
+
+    python3 -m unittest discover tests
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from GraphWriter import write_graph  # noqa: E402
+from helpers import TOKEN_KEY, MockBloodHoundTestCase, UploadEngine  # noqa: E402
+
+
+def make_graphs(directory):
+    nodes = [{"id": f"T{i}", "kinds": ["Technique"], "properties": {"name": f"Technique {i}"}} for i in range(2000)]
+    edges = [
+        {"kind": "PartOf", "start": {"value": f"T{i}", "match_by": "id"}, "end": {"value": "T0", "match_by": "id"}}
+        for i in range(1, 2000)
+    ]
+    plain = os.path.join(directory, "plain_graph.json")
+    gzipped = os.path.join(directory, "gzip_graph.json.gz")
+    write_graph(plain, nodes, edges)
+    write_graph(gzipped, nodes, edges, gzip_output=True)
+    return [plain, gzipped]
+
+
+class UploadSigningTest(MockBloodHoundTestCase):
+    def setUp(self):
+        super().setUp()
+        self.paths = make_graphs(self.work_dir)
+
+    def upload(self, token_key=TOKEN_KEY, **kwargs):
+        return asyncio.run(UploadEngine.upload_graphs(self.paths, retries=0, **self.credentials(token_key), **kwargs))
+
+    def test_streamed_uploads_are_signed(self):
+        report = self.upload()
+        self.assertEqual([item["status"] for item in report], ["uploaded", "uploaded"])
+        self.assertEqual(self.server.stats["files"], 2)
+
+    def test_zipped_uploads_are_signed(self):
+        report = self.upload(compress=True)
+        self.assertEqual([item["status"] for item in report], ["uploaded", "uploaded"])
+
+    def test_wrong_key_is_rejected(self):
+        self.assertIsNone(self.upload(token_key="wrong-key"))
+        self.assertEqual(self.server.stats["jobs"], 0)
+
+    def test_json_requests_are_signed(self):
+        failed = asyncio.run(UploadEngine.run_cypher_statements(["MATCH (n) RETURN n"], retries=0, **self.credentials()))
+        self.assertEqual(failed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()